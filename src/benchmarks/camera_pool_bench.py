@@ -0,0 +1,105 @@
+"""
+Compares back-to-back sessions with and without the camera pool on simulated cameras with a
+realistic open time: for every session switch (stop_recording, new_session, setup, start) reports
+the wall time and the camera-timestamp gap between the last frame of one session and the first
+frame of the next. Then unplugs one pooled camera mid-session, plugs it back and reports how long
+the pool took to detect it and have it recording again.
+
+Run from the src directory:
+    python -m benchmarks.camera_pool_bench --cameras 4 --open-latency 3 --sessions 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from recorder.recording_controller import RecordingController
+
+
+def make_controller(args, results_dir: str, pooled: bool) -> RecordingController:
+    return RecordingController(config={
+        "camera_backend": "simulated",
+        "camera_fps": args.fps,
+        "gnss_enabled": False,
+        "results_dir": results_dir,
+        "sim_camera_count": args.cameras,
+        "sim_open_latency": args.open_latency,
+        "disk_admission_policy": "off",
+        "camera_pool": pooled,
+        "camera_lost_timeout": args.lost_timeout,
+        "camera_reopen_interval": 0.5,
+    })
+
+
+def run_sessions(args, results_dir: str, pooled: bool) -> list:
+    """:return: (switch wall time, largest camera-timestamp gap) per session switch."""
+    controller = make_controller(args, results_dir, pooled)
+    controller.discover_and_setup_devices()
+    controller.start_recording()
+    switches = []
+    for _ in range(args.sessions - 1):
+        time.sleep(args.seconds)
+        started = time.monotonic()
+        controller.stop_recording()
+        last_frames = {r.serial_number: (r.session_metrics or r.metrics.snapshot())["last_camera_timestamp_ns"]
+                       for r in controller.camera_recorders}
+        controller.new_session()
+        controller.discover_and_setup_devices()
+        controller.start_recording()
+        switch_time = time.monotonic() - started
+        time.sleep(0.5)
+        gaps = [(r.metrics.first_camera_timestamp_ns - last_frames[r.serial_number]) / 1e9
+                for r in controller.camera_recorders if r.serial_number in last_frames]
+        switches.append((switch_time, max(gaps)))
+    time.sleep(args.seconds)
+    controller.stop_recording()
+    controller.shutdown()
+    return switches
+
+
+def run_unplug(args, results_dir: str) -> tuple:
+    """:return: (seconds until the camera records again after being plugged back, its session files)."""
+    controller = make_controller(args, results_dir, True)
+    controller.discover_and_setup_devices()
+    controller.start_recording()
+    serial = controller.camera_recorders[0].serial_number
+    time.sleep(1.0)
+    controller.camera_backend.disconnect(serial)
+    time.sleep(args.lost_timeout + 1.0)
+    controller.camera_backend.reconnect(serial)
+    plugged_at = time.monotonic()
+    while not controller.camera_pool.reopen_times and time.monotonic() - plugged_at < 30:
+        time.sleep(0.05)
+    back_after = time.monotonic() - plugged_at
+    time.sleep(1.0)
+    controller.stop_recording()
+    controller.shutdown()
+    svo_dir = controller.session_manager.get_svo2_directory()
+    files = sorted(name for name in os.listdir(svo_dir) if name.startswith(f"camera_{serial}"))
+    return back_after, files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--open-latency", type=float, default=3.0, help="Simulated camera open time in seconds.")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Recording time per session.")
+    parser.add_argument("--lost-timeout", type=float, default=1.0, help="camera_lost_timeout of the pool.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        results = {mode: run_sessions(args, results_dir, mode == "pool") for mode in ("reopen", "pool")}
+        back_after, files = run_unplug(args, results_dir)
+
+    print(f"\n{'mode':<8} {'switch':>7} {'wall time':>10} {'frame gap':>10} {'frames lost':>12}")
+    for mode, switches in results.items():
+        for i, (switch_time, gap) in enumerate(switches, 1):
+            lost = max(0, round(gap * args.fps) - 1)
+            print(f"{mode:<8} {i:>7} {switch_time * 1e3:>8.0f}ms {gap * 1e3:>8.0f}ms {lost:>12}")
+    print(f"\nUnplugged camera recording again {back_after:.2f} s after being plugged back in "
+          f"(reopen interval 0.5 s, open time {args.open_latency:.1f} s); files: {', '.join(files)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measures the recorder daemon's control socket: status round-trip latency over a persistent
+connection and with one connection per command (idle and while recording), then the time taken
+by back-to-back start / split / stop commands on simulated cameras, all in one process.
+
+Run from the src directory:
+    python -m benchmarks.control_daemon_bench --cameras 4 --requests 2000 --sessions 3
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from recorder.control_daemon import RecorderDaemon, ControlClient, send_command
+
+
+def status_latencies(socket_path: str, count: int, persistent: bool) -> list:
+    latencies = []
+    if persistent:
+        with ControlClient(socket_path) as client:
+            for _ in range(count):
+                start = time.perf_counter()
+                reply = client.request("status")
+                latencies.append(time.perf_counter() - start)
+                assert reply["ok"], reply
+    else:
+        for _ in range(count):
+            start = time.perf_counter()
+            reply = send_command("status", socket_path)
+            latencies.append(time.perf_counter() - start)
+            assert reply["ok"], reply
+    return latencies
+
+
+def print_latencies(label: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<36} {statistics.median(latencies) * 1e3:>8.3f} {p99 * 1e3:>8.3f} {latencies[-1] * 1e3:>8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000, help="Status requests per measurement.")
+    parser.add_argument("--sessions", type=int, default=3, help="Back-to-back sessions (start, splits, stop).")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Recording time per session.")
+    parser.add_argument("--open-latency", type=float, default=0.5, help="Simulated camera open time.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        config = {
+            "camera_backend": "simulated",
+            "gnss_enabled": False,
+            "results_dir": results_dir,
+            "sim_camera_count": args.cameras,
+            "sim_open_latency": args.open_latency,
+            "disk_admission_policy": "off",
+        }
+        socket_path = os.path.join(results_dir, "control.sock")
+        daemon = RecorderDaemon(config=config, socket_path=socket_path)
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        while daemon.server is None:
+            time.sleep(0.01)
+
+        print(f"\n{'status round-trip (ms)':<36} {'p50':>8} {'p99':>8} {'max':>8}")
+        print_latencies("idle, persistent connection", status_latencies(socket_path, args.requests, True))
+        print_latencies("idle, connection per command", status_latencies(socket_path, args.requests, False))
+
+        session_times = []
+        with ControlClient(socket_path) as client:
+            reply = client.request("start")
+            session_times.append(("start", reply["elapsed"]))
+            time.sleep(args.seconds)
+            print_latencies("recording, persistent connection", status_latencies(socket_path, args.requests, True))
+            for _ in range(args.sessions - 1):
+                reply = client.request("split")
+                session_times.append(("split", reply["elapsed"]))
+                time.sleep(args.seconds)
+            reply = client.request("stop")
+            session_times.append(("stop", reply["elapsed"]))
+            client.request("shutdown")
+        thread.join()
+        sessions = sorted(name for name in os.listdir(results_dir) if name.startswith("recording_"))
+
+    print(f"\n{'command':<8} {'elapsed':>10}")
+    for command, elapsed in session_times:
+        print(f"{command:<8} {elapsed * 1e3:>8.1f}ms")
+    print(f"\n{len(sessions)} session folders: {', '.join(sessions)}")
+
+
+if __name__ == "__main__":
+    main()
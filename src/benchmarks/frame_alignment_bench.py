@@ -0,0 +1,106 @@
+"""
+Benchmark for FrameSets: writes synthetic frame timestamp sidecars for a multi-hour multi-camera
+session (per-camera clock offset and drift, timestamp jitter, dropped frames and failed grabs),
+then times loading them, matching the frame sets, building the report and saving frame_sets.bin,
+and checks the reported skew and drift against the injected ones.
+
+Run from the src directory:
+    python -m benchmarks.frame_alignment_bench --hours 4 --cameras 4 --fps 30
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from recorder.frame_alignment import FrameSets, load_camera_frames, FRAME_SETS_FILENAME
+from recorder.frame_index import FRAME_INDEX_KIND, FRAME_INDEX_VERSION, FRAME_RECORD_FIELDS
+from recorder.record_file import build_header, numpy_dtype
+
+
+def write_synthetic_sidecars(svo_dir: str, args, seed: int = 0) -> dict:
+    """
+    :return: Serial number -> (injected offset in ms, injected drift in ppm) against the first camera.
+    """
+    rng = np.random.default_rng(seed)
+    count = int(args.hours * 3600 * args.fps)
+    period_ns = 1e9 / args.fps
+    start_ns = 1_700_000_000 * 10**9
+    injected = {}
+    for c in range(args.cameras):
+        serial = 40000000 + c
+        offset_ms = 0.0 if c == 0 else rng.uniform(-3, 3)
+        # Camera timestamps are on the host clock; keep the drift small enough for the cameras to stay
+        # within half a frame of each other over the session, as on a real rig.
+        drift_ppm = 0.0 if c == 0 else rng.uniform(-0.5, 0.5)
+        injected[serial] = (offset_ms, drift_ppm)
+        ideal = np.arange(count) * period_ns
+        timestamps = start_ns + (ideal * (1 + drift_ppm * 1e-6) + offset_ms * 1e6
+                                 + rng.normal(0, args.jitter_ms * 1e6, count)).astype(np.int64)
+        # Dropped frames leave no record; failed grabs leave a record with status != 0 and no timestamp.
+        kept = rng.random(count) >= args.drop_ratio
+        records = np.zeros(int(kept.sum()), dtype=numpy_dtype(FRAME_RECORD_FIELDS))
+        records["frame_index"] = np.arange(len(records))
+        records["camera_timestamp_ns"] = timestamps[kept]
+        records["host_monotonic_ns"] = timestamps[kept] - start_ns
+        failed = rng.random(len(records)) < args.drop_ratio / 10
+        records["camera_timestamp_ns"][failed] = 0
+        records["grab_status"][failed] = 1
+        with open(os.path.join(svo_dir, f"camera_{serial}.frames"), "wb") as f:
+            f.write(build_header(FRAME_INDEX_KIND, FRAME_INDEX_VERSION, FRAME_RECORD_FIELDS,
+                                 record_count=len(records)))
+            f.write(records.tobytes())
+    return injected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4.0, help="Duration of the synthetic session.")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--jitter-ms", type=float, default=0.5, help="Standard deviation of timestamp jitter.")
+    parser.add_argument("--drop-ratio", type=float, default=0.002, help="Fraction of frames each camera drops.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as session_dir:
+        start = time.perf_counter()
+        injected = write_synthetic_sidecars(session_dir, args)
+        print(f"Wrote {args.cameras} x {int(args.hours * 3600 * args.fps)} frame records "
+              f"in {time.perf_counter() - start:.2f} s")
+
+        timings = {}
+        start = time.perf_counter()
+        cameras = load_camera_frames(session_dir)
+        timings["load"] = time.perf_counter() - start
+        start = time.perf_counter()
+        frame_sets = FrameSets(cameras)
+        timings["match"] = time.perf_counter() - start
+        start = time.perf_counter()
+        report = frame_sets.report()
+        timings["report"] = time.perf_counter() - start
+        start = time.perf_counter()
+        frame_sets.save(os.path.join(session_dir, FRAME_SETS_FILENAME))
+        timings["save"] = time.perf_counter() - start
+
+    print(f"\n{'step':<8} {'seconds':>8}")
+    for step, seconds in timings.items():
+        print(f"{step:<8} {seconds:>8.3f}")
+    print(f"{'total':<8} {sum(timings.values()):>8.3f}")
+
+    complete = report["complete_sets"] / report["frame_sets"] * 100
+    print(f"\n{report['frame_sets']} frame sets, {complete:.2f} % complete, "
+          f"tolerance {report['tolerance_ms']:.2f} ms")
+    reference = report["reference"]
+    print(f"\n{'pair':<18} {'mean ms':>10} {'measured':>9} {'drift ppm':>10} {'measured':>9}")
+    for pair in report["pairs"]:
+        a, b = pair["cameras"]
+        if a != reference:
+            continue
+        # Mean skew over the session = offset + drift at mid-session.
+        offset_ms, drift_ppm = injected[b]
+        expected_mean = offset_ms + drift_ppm * 1e-6 * report["duration_s"] / 2 * 1e3
+        print(f"{a}-{b:<9} {expected_mean:>10.3f} {pair['mean_ms']:>9.3f} {drift_ppm:>10.2f} "
+              f"{pair['drift_ppm']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-fix cost of turning gpsd TPV lines into queued fixes: the legacy path (strptime datetime
+conversion, if/elif mode and status chains, covariance list per fix) vs. GNSSFix.from_tpv, and
+the cost of the on-demand sl.GNSSData conversion (when the ZED SDK is installed). Costs are
+reported against the 1 ms budget of a 1 kHz receiver.
+
+Run from the src directory:
+    python -m benchmarks.gnss_fix_bench --fixes 100000
+"""
+import argparse
+import json
+import time
+from gpsdclient.client import parse_datetime
+from recorder.gnss_fix import GNSSFix
+from recorder.gpsd_replay_server import synthetic_tpv, format_gpsd_time
+
+
+def tpv_lines(count: int) -> list:
+    start = time.time()
+    lines = []
+    for i, (offset, tpv) in zip(range(count), synthetic_tpv(1000.0)):
+        tpv["time"] = format_gpsd_time(start + offset)
+        lines.append(json.dumps(tpv, separators=(",", ":")))
+    return lines
+
+
+def legacy_parse(line: str) -> dict:
+    """The previous reader path, minus the sl.GNSSData allocation."""
+    gpsd_data = json.loads(line)
+    gpsd_data["time"] = parse_datetime(gpsd_data["time"])
+    gpsd_mode = gpsd_data["mode"]
+    mode = 0
+    if gpsd_mode == 0:
+        mode = 0
+    elif gpsd_mode == 1:
+        mode = 1
+    elif gpsd_mode == 2:
+        mode = 2
+    elif gpsd_mode == 3:
+        mode = 3
+    status = 0
+    if "status" in gpsd_data:
+        gpsd_status = gpsd_data["status"]
+        if gpsd_status == 0:
+            status = 0
+        elif gpsd_status == 1:
+            status = 1
+        elif gpsd_status == 2:
+            status = 2
+        elif gpsd_status == 3:
+            status = 5
+        elif gpsd_status == 4:
+            status = 4
+        elif gpsd_status in (5, 9):
+            status = 1
+        elif gpsd_status == 6:
+            status = 2
+    covariances = [gpsd_data["eph"] * gpsd_data["eph"], 0.0, 0.0, 0.0, gpsd_data["eph"] * gpsd_data["eph"],
+                   0.0, 0.0, 0.0, gpsd_data["epv"] * gpsd_data["epv"]]
+    return {
+        "timestamp_us": int(gpsd_data["time"].timestamp() * 1000000),
+        "coordinates": (gpsd_data["lat"], gpsd_data["lon"], gpsd_data["altMSL"]),
+        "mode": mode, "status": status, "position_covariances": covariances,
+    }
+
+
+def fix_parse(line: str) -> GNSSFix:
+    return GNSSFix.from_tpv(json.loads(line))
+
+
+def best_time(fn, items: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixes", type=int, default=100000, help="TPV reports per run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per path (best time is reported).")
+    args = parser.parse_args()
+
+    lines = tpv_lines(args.fixes)
+    json_only = best_time(json.loads, lines, args.repeat)
+    results = [
+        ("json.loads only", json_only),
+        ("json + legacy parse", best_time(legacy_parse, lines, args.repeat)),
+        ("json + GNSSFix.from_tpv", best_time(fix_parse, lines, args.repeat)),
+    ]
+    fixes = [fix_parse(line) for line in lines]
+    results.append(("GNSSFix.position_covariances", best_time(lambda f: f.position_covariances, fixes, args.repeat)))
+    try:
+        import pyzed.sl  # noqa: F401
+        results.append(("GNSSFix.to_sl_gnss_data", best_time(GNSSFix.to_sl_gnss_data, fixes, args.repeat)))
+    except ImportError:
+        print("(pyzed not installed: sl.GNSSData conversion not measured)")
+
+    print(f"{'path':<30} {'us/fix':>8} {'% of 1 kHz budget':>18}")
+    for label, seconds in results:
+        print(f"{label:<30} {seconds * 1e6:>8.2f} {seconds / 1e-3 * 100:>17.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Drives GPSDReader from the local GPSD replay server at accelerated rates and reports GNSS
+throughput, fix loss and recovery latency after scripted outages. No receiver is needed.
+
+Run from the src directory:
+    python -m benchmarks.gnss_replay_bench --rates 100 500 1000 --seconds 10
+"""
+import argparse
+import time
+from recorder.gpsd_reader import GPSDReader
+from recorder.gpsd_replay_server import GPSDReplayServer, synthetic_tpv
+
+
+def recovery_latencies(event_log: list, receive_times: list, action: str) -> list:
+    """
+    :return: For each end of `action`, seconds until the reader queued its next fix.
+    """
+    latencies = []
+    for wall_time, name in event_log:
+        if name != f"{action} end":
+            continue
+        later = [t for t in receive_times if t >= wall_time]
+        latencies.append(later[0] - wall_time if later else float("inf"))
+    return latencies
+
+
+def run_once(rate: float, seconds: float, events: list) -> dict:
+    server = GPSDReplayServer(lambda: synthetic_tpv(rate), port=0, events=events)
+    server.start()
+    reader = GPSDReader(port=server.port, queue_size=4096)
+    receive_times = []
+    try:
+        if reader.initialize() == -1:
+            raise RuntimeError("reader failed to initialize")
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for received_at, _ in reader.grab_batch(timeout=0.1):
+                receive_times.append(received_at)
+    finally:
+        reader.stop_thread()
+        server.stop()
+    stats = reader.get_queue_stats()
+    status = reader.get_status()
+    return {
+        "sent": server.fixes_sent,
+        "received": len(receive_times),
+        "dropped": stats["dropped"],
+        "throughput": len(receive_times) / seconds,
+        "connects": status["connect_attempts"],
+        "outages": status["outages"],
+        "recovery": recovery_latencies(server.event_log, receive_times, "fix_loss")
+                    + recovery_latencies(server.event_log, receive_times, "disconnect"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 500, 1000], help="TPV rates in Hz.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measurement time per rate.")
+    parser.add_argument("--no-outages", action="store_true", help="Do not script fix loss / disconnects.")
+    args = parser.parse_args()
+
+    events = [] if args.no_outages else [
+        {"action": "fix_loss", "at": args.seconds * 0.3, "duration": 1.0},
+        {"action": "disconnect", "at": args.seconds * 0.6, "duration": 1.0},
+    ]
+    print(f"{'rate Hz':>8} {'sent':>8} {'received':>9} {'dropped':>8} {'fix/s':>9} {'connects':>9} {'outages':>8}  recovery (s)")
+    for rate in args.rates:
+        result = run_once(rate, args.seconds, events)
+        recovery = ", ".join(f"{latency:.3f}" for latency in result["recovery"]) or "-"
+        print(f"{rate:>8.0f} {result['sent']:>8} {result['received']:>9} {result['dropped']:>8} "
+              f"{result['throughput']:>9.1f} {result['connects']:>9} {result['outages']:>8}  {recovery}")
+
+
+if __name__ == "__main__":
+    main()
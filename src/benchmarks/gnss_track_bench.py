@@ -0,0 +1,59 @@
+"""
+Microbenchmark for GNSSTrack.interpolate: bulk GNSS positions for camera frame timestamps.
+
+Run from the src directory:
+    python -m benchmarks.gnss_track_bench --hours 2 --queries 100000 1000000
+"""
+import argparse
+import time
+import numpy as np
+from recorder.gnss_track import GNSSTrack
+
+
+def synthetic_track(hours: float, rate_hz: float, seed: int = 0) -> GNSSTrack:
+    """
+    Random-walk track with a few receiver outages, sampled at rate_hz.
+    """
+    rng = np.random.default_rng(seed)
+    count = int(hours * 3600 * rate_hz)
+    timestamps = 1.7e9 + np.arange(count) / rate_hz + rng.normal(0, 1e-3, count)
+    # Drop a few seconds of fixes here and there to exercise the gap flags.
+    keep = np.ones(count, dtype=bool)
+    for start in rng.integers(0, count, size=10):
+        keep[start:start + int(5 * rate_hz)] = False
+    latitude = 48.85 + np.cumsum(rng.normal(0, 1e-6, count))
+    longitude = 2.35 + np.cumsum(rng.normal(0, 1e-6, count))
+    altitude = 35.0 + np.cumsum(rng.normal(0, 1e-3, count))
+    return GNSSTrack(timestamps[keep], latitude[keep], longitude[keep], altitude[keep])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=2.0, help="Duration of the synthetic track.")
+    parser.add_argument("--rate", type=float, default=20.0, help="GNSS fix rate in Hz.")
+    parser.add_argument("--queries", type=int, nargs="+", default=[100000, 1000000],
+                        help="Numbers of frame timestamps to look up per call.")
+    parser.add_argument("--repeat", type=int, default=5, help="Calls per query size (best time is reported).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    track = synthetic_track(args.hours, args.rate)
+    print(f"track: {len(track):,} fixes built in {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(1)
+    t0, t1 = track.timestamps[0], track.timestamps[-1]
+    for count in args.queries:
+        # Frame timestamps at 30 fps are sorted in practice; shuffle a copy to show order does not matter.
+        frames = np.sort(rng.uniform(t0 - 1.0, t1 + 1.0, count))
+        for label, queries in (("sorted", frames), ("shuffled", rng.permutation(frames))):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                positions = track.interpolate(queries)
+                best = min(best, time.perf_counter() - start)
+            print(f"{count:>10,} {label:<8} queries: {best * 1e3:8.2f} ms  {count / best / 1e6:7.2f} M lookups/s  "
+                  f"({np.count_nonzero(positions.valid):,} valid)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares the legacy per-record GNSS logging path (json.dumps + write + flush per fix) with the
+group-commit BatchedRecordWriter, using a synthetic fix source.
+
+Run from the src directory:
+    python -m benchmarks.gnss_writer_bench --records 200000
+"""
+import argparse
+import io
+import json
+import math
+import os
+import tempfile
+import time
+from recorder.batched_writer import BatchedRecordWriter, FSYNC_POLICIES
+
+
+class CountingFileIO(io.FileIO):
+    """FileIO that counts the write() calls reaching the OS."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_calls = 0
+
+    def write(self, b):
+        self.write_calls += 1
+        return super().write(b)
+
+
+def synthetic_fixes(count: int, rate_hz: float = 20.0):
+    """
+    Yields GNSS records shaped like the ones GNSSRecorder writes, following a slow circle.
+    """
+    start = time.time()
+    for i in range(count):
+        angle = i * 1e-4
+        yield {
+            "timestamp": start + i / rate_hz,
+            "latitude": round(48.8566 + 0.01 * math.sin(angle), 6),
+            "longitude": round(2.3522 + 0.01 * math.cos(angle), 6),
+            "altitude": round(35.0 + math.sin(angle * 7), 2)
+        }
+
+
+def bench_legacy(path: str, records: list) -> dict:
+    raw = CountingFileIO(path, "w")
+    file = io.TextIOWrapper(io.BufferedWriter(raw))
+    start = time.perf_counter()
+    for record in records:
+        file.write(json.dumps(record) + "\n")
+        file.flush()
+    file.close()
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "syscalls": raw.write_calls}
+
+
+def bench_batched(path: str, records: list, fsync_policy: str, batch_records: int) -> dict:
+    writer = BatchedRecordWriter(path, max_batch_records=batch_records, fsync_policy=fsync_policy,
+                                 fsync_interval_ms=100)
+    start = time.perf_counter()
+    for record in records:
+        writer.append(json.dumps(record).encode() + b"\n")
+    writer.close()
+    elapsed = time.perf_counter() - start
+    stats = writer.get_stats()
+    return {"elapsed": elapsed, "syscalls": stats["write_calls"] + stats["fsync_calls"]}
+
+
+def report(name: str, result: dict, count: int) -> None:
+    print(f"{name:<28} {count / result['elapsed']:>12,.0f} rec/s   "
+          f"{result['syscalls'] / count:>8.4f} syscalls/rec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000, help="Number of synthetic fixes to write.")
+    parser.add_argument("--batch-records", type=int, default=64, help="Records per group commit.")
+    parser.add_argument("--dir", default=None, help="Directory for the output files (default: a temp dir).")
+    args = parser.parse_args()
+
+    records = list(synthetic_fixes(args.records))
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "gnss_data.json")
+        report("legacy write+flush", bench_legacy(path, records), args.records)
+        for policy in FSYNC_POLICIES:
+            # fsync-per-batch is slow on real disks; cap the record count so the run stays short.
+            count = args.records if policy != "batch" else min(args.records, 20000)
+            result = bench_batched(path, records[:count], policy, args.batch_records)
+            report(f"batched fsync={policy}", result, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Cold import cost of the recorder entry points, measured with `python -X importtime` in a fresh
+interpreter per module. Fails (exit status 1) if a GNSS-only / tooling module pulls in pyzed or
+exceeds its time budget, so regressions in the lazy-import layout are caught.
+
+Run from the src directory:
+    python -m benchmarks.import_time_bench --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Module -> import budget in milliseconds (cumulative, best of --repeat runs). None: measured only.
+# The first group must never load the ZED SDK.
+PYZED_FREE_MODULES = {
+    "recorder": 20.0,
+    "recorder.gnss_recorder": 150.0,
+    "recorder.recording_controller": 200.0,
+    "recorder.gnss_binary_log": 50.0,
+    "recorder.gpsd_replay_server": 50.0,
+}
+OTHER_MODULES = {
+    "recorder.frame_alignment": None,     # NumPy.
+    "recorder.gnss_track": None,          # NumPy.
+    "recorder.metrics_server": None,      # http.server.
+    "recorder.session_catalog": None,     # NumPy (via gnss_track).
+    "recorder.svo_export": None,          # NumPy; the ZED SDK only once the zed reader is created.
+    "recorder.zed_camera_recorder": None,  # ZED SDK.
+    "recorder.zed_svo_reader": None,      # ZED SDK.
+}
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module: str) -> tuple:
+    """
+    Imports `module` in a fresh interpreter.
+    :return: (cumulative import time of `module` in ms, set of every top-level package imported).
+    """
+    code = f"import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=SRC_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    cumulative_us = None
+    packages = set()
+    # Lines look like "import time:       self [us] |  cumulative | imported package".
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        packages.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000.0, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module (best time is kept).")
+    parser.add_argument("--no-budget", action="store_true", help="Report times without enforcing the budgets.")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<34} {'import ms':>10} {'budget':>8}  pyzed")
+    for module, budget in {**PYZED_FREE_MODULES, **OTHER_MODULES}.items():
+        try:
+            runs = [measure_import(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<34} {'-':>10} {'-':>8}  ({e})")
+            if module in PYZED_FREE_MODULES:
+                failures.append(f"{module} failed to import")
+            continue
+        best = min(ms for ms, _ in runs)
+        loads_pyzed = "pyzed" in runs[0][1]
+        print(f"{module:<34} {best:>10.1f} {budget or '-':>8}  {'yes' if loads_pyzed else 'no'}")
+        if module in PYZED_FREE_MODULES:
+            if loads_pyzed:
+                failures.append(f"{module} imports pyzed")
+            elif budget is not None and best > budget and not args.no_budget:
+                failures.append(f"{module} took {best:.1f} ms (budget {budget:.0f} ms)")
+    if failures:
+        print("❌ Import regressions: " + "; ".join(failures))
+        sys.exit(1)
+    print("✅ GNSS and session tooling import without pyzed, within budget.")
+
+
+if __name__ == "__main__":
+    main()
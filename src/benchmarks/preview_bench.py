@@ -0,0 +1,92 @@
+"""
+Checks that the live preview cannot slow recording: runs simulated cameras with the preview off,
+on with an idle viewer, and on with a viewer thread that takes and converts every preview frame as
+fast as it can (a stand-in for a busy GUI competing for the GIL). Reports per-camera fps, drops,
+grab p99 and the grab-thread time spent on previews.
+
+Run from the src directory:
+    python -m benchmarks.preview_bench --cameras 4 --seconds 10
+"""
+import argparse
+import tempfile
+import threading
+import time
+from recorder.recording_controller import RecordingController
+
+
+def hammer_previews(controller: RecordingController, stop: threading.Event, counters: dict) -> None:
+    while not stop.is_set():
+        for recorder in controller.camera_recorders:
+            image = recorder.preview.latest()
+            if image is not None:
+                # Roughly what the GUI does per frame: BGRA -> RGB into a new contiguous array.
+                image[:, :, 2::-1].copy()
+                counters["rendered"] += 1
+
+
+def run_once(mode: str, args, results_dir: str) -> tuple:
+    config = {
+        "camera_backend": "simulated",
+        "camera_resolution": args.resolution,
+        "camera_fps": args.fps,
+        "gnss_enabled": False,
+        "results_dir": results_dir,
+        "sim_camera_count": args.cameras,
+        "sim_open_latency": 0.1,
+        "disk_admission_policy": "off",
+        "preview_fps": 0.0 if mode == "off" else args.preview_fps,
+        "preview_width": args.preview_width,
+    }
+    controller = RecordingController(config=config)
+    controller.discover_and_setup_devices()
+    controller.start_recording()
+    stop = threading.Event()
+    counters = {"rendered": 0}
+    viewer = None
+    if mode == "busy viewer":
+        viewer = threading.Thread(target=hammer_previews, args=(controller, stop, counters))
+        viewer.start()
+    time.sleep(args.seconds)
+    stop.set()
+    if viewer is not None:
+        viewer.join()
+    controller.stop_recording()
+    return controller.camera_recorders, counters["rendered"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Recording time per mode.")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--resolution", default="HD1200")
+    parser.add_argument("--preview-fps", type=float, default=2.0)
+    parser.add_argument("--preview-width", type=int, default=320)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as results_dir:
+        for mode in ("off", "idle viewer", "busy viewer"):
+            recorders, rendered = run_once(mode, args, results_dir)
+            metrics = [recorder.metrics for recorder in recorders]
+            previews = [recorder.preview.get_stats() for recorder in recorders if recorder.preview is not None]
+            rows.append((
+                mode,
+                sum(m.frames_grabbed for m in metrics) / args.seconds / max(len(metrics), 1),
+                sum(m.dropped_frames for m in metrics),
+                max((m.grab_latency.quantile(0.99) for m in metrics), default=0.0),
+                sum(p["published"] for p in previews),
+                sum(p["skipped"] for p in previews),
+                max((p["retrieve_ms_max"] for p in previews), default=0.0),
+                rendered,
+            ))
+
+    print(f"\n{'mode':<12} {'fps/camera':>11} {'dropped':>8} {'grab p99':>10} {'previews':>9} {'skipped':>8} "
+          f"{'retrieve max':>13} {'rendered':>9}")
+    for mode, fps, dropped, p99, published, skipped, retrieve_max, rendered in rows:
+        print(f"{mode:<12} {fps:>11.1f} {dropped:>8} {p99 * 1e3:>8.1f}ms {published:>9} {skipped:>8} "
+              f"{retrieve_max:>11.2f}ms {rendered:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Session catalog at scale: builds a results folder of synthetic sessions (short GNSS tracks
+scattered over a region, a few camera serials), then times the first full scan, an incremental
+rescan where nothing changed, a rescan after touching a few sessions, and time range / bounding
+box / serial number queries.
+
+Run from the src directory:
+    python -m benchmarks.session_catalog_bench --sessions 5000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from recorder.session_catalog import SessionCatalog, CATALOG_FILENAME
+
+SERIAL_NUMBERS = (40000001, 40000002, 40000003, 40000004, 40000005, 40000006)
+
+
+def make_sessions(results_dir: str, count: int, fixes: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    start = time.time() - 365 * 86400
+    for i in range(count):
+        session_dir = os.path.join(results_dir, f"recording_{i:06d}")
+        os.makedirs(os.path.join(session_dir, "gnss"))
+        os.makedirs(os.path.join(session_dir, "svo2"))
+        for serial in rng.sample(SERIAL_NUMBERS, 2):
+            open(os.path.join(session_dir, "svo2", f"camera_{serial}.svo"), "wb").close()
+        t = start + i * 3600
+        lat, lon = rng.uniform(45.0, 47.0), rng.uniform(4.0, 7.0)
+        with open(os.path.join(session_dir, "gnss", "gnss_data.json"), "w") as f:
+            for _ in range(fixes):
+                # ~30 m/s drive in a random-walk direction, one fix per second.
+                lat += rng.uniform(-0.0003, 0.0003)
+                lon += rng.uniform(-0.0004, 0.0004)
+                f.write(json.dumps({"timestamp": t, "latitude": lat, "longitude": lon, "altitude": 200.0}) + "\n")
+                t += 1.0
+
+
+def time_query(catalog: SessionCatalog, repeat: int, **filters) -> tuple:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sessions = catalog.query(**filters)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, len(sessions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--fixes", type=int, default=300, help="GNSS fixes per session.")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query (median is reported).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        start = time.monotonic()
+        make_sessions(results_dir, args.sessions, args.fixes)
+        print(f"Generated {args.sessions} sessions x {args.fixes} fixes in {time.monotonic() - start:.1f} s")
+
+        with SessionCatalog(os.path.join(results_dir, CATALOG_FILENAME)) as catalog:
+            for label in ("first scan", "rescan (unchanged)"):
+                start = time.monotonic()
+                counts = catalog.scan(results_dir)
+                print(f"{label:<24} {time.monotonic() - start:7.2f} s  {counts}")
+            for i in range(0, args.sessions, max(1, args.sessions // 10)):
+                with open(os.path.join(results_dir, f"recording_{i:06d}", "gnss", "gnss_data.json"), "a") as f:
+                    f.write(json.dumps({"timestamp": 0.0, "latitude": 46.0, "longitude": 5.0, "altitude": 0.0}) + "\n")
+            start = time.monotonic()
+            counts = catalog.scan(results_dir)
+            print(f"{'rescan (10 touched)':<24} {time.monotonic() - start:7.2f} s  {counts}")
+
+            sessions = catalog.query()
+            middle = sessions[len(sessions) // 2]["start_time"]
+            queries = {
+                "time (one day)": {"start": middle, "end": middle + 86400},
+                "bbox (~2 x 2 km)": {"bbox": (46.0, 5.5, 46.02, 5.53)},
+                "bbox (~20 x 20 km)": {"bbox": (45.9, 5.4, 46.1, 5.65)},
+                "serial": {"serial_number": SERIAL_NUMBERS[0]},
+                "bbox + time + serial": {"bbox": (45.9, 5.4, 46.1, 5.65), "start": middle - 30 * 86400,
+                                         "end": middle + 30 * 86400, "serial_number": SERIAL_NUMBERS[0]},
+            }
+            print(f"{'query':<24} {'median ms':>10} {'matches':>8}")
+            for label, filters in queries.items():
+                ms, matches = time_query(catalog, args.repeat, **filters)
+                print(f"{label:<24} {ms:10.2f} {matches:8d}")
+
+
+if __name__ == "__main__":
+    main()
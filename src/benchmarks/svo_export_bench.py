@@ -0,0 +1,98 @@
+"""
+Throughput of the chunked SVO export on a synthetic session, with the synthetic SVO reader (no
+ZED SDK needed): export fps for several worker counts, then an interrupted export (half of the
+chunk markers removed) resumed, checking that only the missing chunks are redone and that the
+GNSS-tagged indexes list every frame.
+
+Run from the src directory:
+    python -m benchmarks.svo_export_bench --cameras 2 --minutes 1 --workers 1 2 4
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from recorder.frame_index import FRAME_INDEX_KIND, FRAME_INDEX_VERSION, FRAME_RECORD_FIELDS
+from recorder.record_file import build_header, numpy_dtype
+from recorder.svo_export import SVOExport, CHUNK_MARKER_DIRNAME
+
+
+def write_synthetic_session(session_dir: str, cameras: int, minutes: float, fps: int) -> int:
+    """
+    Writes frame sidecars, empty SVO files and a 10 Hz GNSS track.
+    :return: Frames per camera.
+    """
+    svo_dir = os.path.join(session_dir, "svo2")
+    gnss_dir = os.path.join(session_dir, "gnss")
+    os.makedirs(svo_dir)
+    os.makedirs(gnss_dir)
+    count = int(minutes * 60 * fps)
+    start_ns = 1_700_000_000 * 10**9
+    for c in range(cameras):
+        serial = 40000000 + c
+        records = np.zeros(count, dtype=numpy_dtype(FRAME_RECORD_FIELDS))
+        records["frame_index"] = np.arange(count)
+        records["camera_timestamp_ns"] = start_ns + (np.arange(count) * 1e9 / fps).astype(np.int64) + c * 1000
+        with open(os.path.join(svo_dir, f"camera_{serial}.frames"), "wb") as f:
+            f.write(build_header(FRAME_INDEX_KIND, FRAME_INDEX_VERSION, FRAME_RECORD_FIELDS, record_count=count))
+            f.write(records.tobytes())
+        open(os.path.join(svo_dir, f"camera_{serial}.svo"), "wb").close()
+    with open(os.path.join(gnss_dir, "gnss_data.json"), "w") as f:
+        for i in range(int(minutes * 60 * 10) + 20):
+            f.write(json.dumps({"timestamp": start_ns / 1e9 - 1 + i / 10, "latitude": 48.85 + i * 1e-6,
+                                "longitude": 2.35 + i * 1e-6, "altitude": 35.0}) + "\n")
+    return count
+
+
+def run_export(session_dir: str, output_dir: str, args, workers: int) -> dict:
+    export = SVOExport(session_dir, output_dir, views=tuple(args.views), image_format="npy",
+                       chunk_frames=args.chunk_frames, workers=workers, reader="synthetic",
+                       reader_options={"width": args.width, "height": args.height})
+    return export.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cameras", type=int, default=2)
+    parser.add_argument("--minutes", type=float, default=1.0, help="Duration of the synthetic session.")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=672, help="Width of the synthetic frames.")
+    parser.add_argument("--height", type=int, default=376)
+    parser.add_argument("--views", nargs="+", default=["left", "depth"])
+    parser.add_argument("--chunk-frames", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        session_dir = os.path.join(root, "session")
+        frames = write_synthetic_session(session_dir, args.cameras, args.minutes, args.fps)
+        print(f"Synthetic session: {args.cameras} cameras x {frames} frames, {args.width}x{args.height}, "
+              f"views {', '.join(args.views)} ({os.cpu_count()} CPUs)")
+
+        print(f"\n{'workers':>7} {'chunks':>7} {'seconds':>8} {'fps':>8} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            output_dir = os.path.join(root, f"export_{workers}")
+            summary = run_export(session_dir, output_dir, args, workers)
+            baseline = baseline or summary["seconds"]
+            print(f"{workers:>7} {summary['exported']:>7} {summary['seconds']:>8.2f} "
+                  f"{summary['frames_per_second']:>8.0f} {baseline / summary['seconds']:>7.2f}x")
+
+        # Interrupted export: drop the markers of every other chunk and resume.
+        markers_dir = os.path.join(output_dir, CHUNK_MARKER_DIRNAME)
+        markers = sorted(os.listdir(markers_dir))
+        for name in markers[1::2]:
+            os.remove(os.path.join(markers_dir, name))
+        summary = run_export(session_dir, output_dir, args, args.workers[-1])
+        rows = 0
+        for c in range(args.cameras):
+            with open(os.path.join(output_dir, f"camera_{40000000 + c}.csv"), newline="") as f:
+                rows += sum(1 for row in csv.DictReader(f) if row["gnss_flags"] == "0")
+        print(f"\nResumed: {summary['resumed']} chunks kept, {summary['exported']} redone in "
+              f"{summary['seconds']:.2f} s; {rows}/{args.cameras * frames} index rows with a GNSS position")
+
+
+if __name__ == "__main__":
+    main()
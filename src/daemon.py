@@ -0,0 +1,19 @@
+from recorder.control_daemon import RecorderDaemon
+from recorder.logging_setup import configure_logging
+
+def main():
+    configure_logging("INFO")
+    # Same configuration as main.py; sessions are started and stopped over the control socket:
+    #   python -m recorder.control_daemon start | stop | split | status | shutdown
+    config = {
+        "camera_resolution": "HD1200",  # Name of a valid sl.RESOLUTION member.
+        "camera_fps": 30,
+        "gnss_port": "COM3",
+        "gnss_baudrate": 9600,
+        "camera_pool": True  # Keep the cameras open between sessions.
+    }
+    daemon = RecorderDaemon(config=config)
+    daemon.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,112 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import queue
+import logging
 import sys
 import threading
 import time
+from collections import deque
 from datetime import timedelta
 from PIL import Image, ImageTk
-from pyzed.sl import RESOLUTION
 from recorder.recording_controller import RecordingController
+from recorder.logging_setup import configure_logging, RECORDER_LOGGER
+from recorder.device_startup import STATUS_OK
 import os
 
-class GuiLogger:
-    """Custom logger that redirects output to Tkinter text widget"""
-    def __init__(self, text_widget):
+GUI_LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+PREVIEW_REFRESH_MS = 250
+TELEMETRY_REFRESH_MS = 1000
+
+# Outcomes of the device setup done by the recording thread.
+SETUP_RECORDING = "recording"
+SETUP_FAILED = "failed"
+
+
+def _format_bytes(value):
+    if value < 1000:
+        return f"{value} B"
+    for unit in ("KB", "MB", "GB"):
+        value /= 1000
+        if value < 1000:
+            return f"{value:.1f} {unit}"
+    return f"{value / 1000:.1f} TB"
+
+
+def _format_rate(value, template, scale=1.0):
+    return "-" if value is None else template.format(value / scale)
+
+class GuiLogger(logging.Handler):
+    """
+    Log handler showing the recorder log (and stray stdout output) in a Tkinter text widget.
+    Lines are buffered from any thread and inserted by the Tk thread once per poll, in a single
+    insert; the widget keeps the last `max_lines` lines, and a burst of more than `max_pending`
+    lines between two polls keeps the newest ones and reports how many were dropped.
+    """
+    def __init__(self, text_widget, max_lines=5000, max_pending=500, poll_ms=100):
+        super().__init__()
         self.text_widget = text_widget
+        self.max_lines = max_lines
+        self.poll_ms = poll_ms
         self.original_stdout = sys.stdout
-        self.queue = queue.Queue()
+        self.pending = deque(maxlen=max_pending)
+        self.dropped = 0
+        self.partial_line = ""
         self.running = True
 
+    def _append(self, line):
+        # Called with self.lock held.
+        if len(self.pending) == self.pending.maxlen:
+            self.dropped += 1
+        self.pending.append(line)
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._append(line)
+
     def write(self, message):
-        self.queue.put(message)
-        
+        # print() writes the text and the line ending separately; only queue complete lines.
+        with self.lock:
+            lines = (self.partial_line + message).split("\n")
+            self.partial_line = lines.pop()
+            for line in lines:
+                self._append(line)
+
     def flush(self):
         pass
 
     def start_redirect(self):
         sys.stdout = self
+        configure_logging("INFO", handler=self, log_format=GUI_LOG_FORMAT)
         self.poll_queue()
 
     def stop_redirect(self):
         self.running = False
         sys.stdout = self.original_stdout
+        logging.getLogger(RECORDER_LOGGER).removeHandler(self)
 
     def poll_queue(self):
-        while not self.queue.empty():
-            message = self.queue.get_nowait()
-            self.text_widget.configure(state='normal')
-            self.text_widget.insert(tk.END, message)
-            self.text_widget.see(tk.END)
-            self.text_widget.configure(state='disabled')
+        with self.lock:
+            lines = list(self.pending)
+            self.pending.clear()
+            dropped, self.dropped = self.dropped, 0
+        if lines:
+            if dropped:
+                lines.insert(0, f"⚠️ {dropped} log lines dropped (too many messages)")
+            widget = self.text_widget
+            follow = widget.yview()[1] >= 1.0  # Only auto-scroll if the user has not scrolled up.
+            widget.configure(state='normal')
+            widget.insert(tk.END, "\n".join(lines) + "\n")
+            excess = int(widget.index('end-1c').split('.')[0]) - 1 - self.max_lines
+            if excess > 0:
+                widget.delete('1.0', f'{excess + 1}.0')
+            widget.configure(state='disabled')
+            if follow:
+                widget.see(tk.END)
         if self.running:
-            self.text_widget.after(100, self.poll_queue)
+            self.text_widget.after(self.poll_ms, self.poll_queue)
 
 class RecordingGUI(tk.Tk):
     def __init__(self):
@@ -56,6 +122,9 @@ class RecordingGUI(tk.Tk):
         self.start_time = None
         self.logger = None
         self.logo_image = None
+        self.setup_result = None    # SETUP_RECORDING / SETUP_FAILED once the recording thread set up the devices
+        self.setup_error = None
+        self.setup_cancelled = False  # Set when the window closes; the recording thread then does not start recording
 
         # Create GUI elements
         self.create_widgets()
@@ -116,6 +185,24 @@ class RecordingGUI(tk.Tk):
         self.timer_label = ttk.Label(timer_frame, text="00:00:00", style='Timer.TLabel')
         self.timer_label.pack()
 
+        # Telemetry panel, refreshed from the controller's telemetry snapshot (see update_telemetry)
+        telemetry_frame = ttk.Frame(main_frame)
+        telemetry_frame.pack(fill=tk.X, pady=10)
+        columns = ("camera", "fps", "errors", "dropped", "svo", "write", "state")
+        self.telemetry_table = ttk.Treeview(telemetry_frame, columns=columns, show='headings', height=4)
+        for column, heading, width in zip(columns, ("Camera", "FPS", "Grab errors", "Dropped", "SVO", "Write rate", "State"),
+                                          (110, 90, 90, 80, 90, 100, 120)):
+            self.telemetry_table.heading(column, text=heading)
+            self.telemetry_table.column(column, width=width, anchor=tk.CENTER)
+        self.telemetry_table.pack(fill=tk.X)
+        self.telemetry_label = ttk.Label(telemetry_frame, text="", style='Status.TLabel')
+        self.telemetry_label.pack(anchor=tk.W, pady=5)
+
+        # Camera previews, one thumbnail per camera (filled in by update_previews)
+        self.preview_frame = ttk.Frame(main_frame)
+        self.preview_frame.pack(fill=tk.X, pady=10)
+        self.preview_widgets = {}  # Serial number -> (image label, caption label)
+
         # Log Display
         log_frame = ttk.Frame(main_frame)
         log_frame.pack(fill=tk.BOTH, expand=True)
@@ -143,6 +230,9 @@ class RecordingGUI(tk.Tk):
     def start_recording(self):
         """Start recording in a separate thread"""
         self.is_recording = True
+        self.setup_result = None
+        self.setup_error = None
+        self.setup_cancelled = False
         self.record_btn.config(text="⏹ STOP RECORDING")
         self.status_indicator.config(text="Initializing cameras...", foreground='orange')
         self.record_btn.state(['disabled'])
@@ -156,16 +246,30 @@ class RecordingGUI(tk.Tk):
         
         # Start initialization check
         self.check_initialization_status()
+        self.update_previews()
 
     def check_initialization_status(self):
-        """Check if cameras have been initialized and update status accordingly"""
-        if self.is_recording and self.recording_controller is None:
+        """Wait for device setup to finish, then report how many devices actually started"""
+        if not self.is_recording:
+            return
+        if self.setup_result is None:
             self.after(100, self.check_initialization_status)
+            return
+        if self.setup_result == SETUP_FAILED:
+            self.stop_recording()
+            self.status_indicator.config(text="Failed: no device started", foreground='red')
+            messagebox.showerror("Error", f"Recording failed: {self.setup_error or 'no camera or GNSS sensor started'}")
+            return
+        report = self.recording_controller.startup_report
+        started = sum(1 for startup in report if startup.status == STATUS_OK)
+        if started < len(report):
+            self.status_indicator.config(text=f"Recording ({started} of {len(report)} devices)", foreground='orange')
         else:
             self.status_indicator.config(text="Recording", foreground='green')
-            self.start_time = time.time()
-            self.update_timer()
-            self.record_btn.state(['!disabled'])  # Re-enable the record button
+        self.start_time = time.time()
+        self.update_timer()
+        self.update_telemetry()
+        self.record_btn.state(['!disabled'])  # Re-enable the record button
 
     def stop_recording(self):
         """Stop recording and clean up resources"""
@@ -175,27 +279,110 @@ class RecordingGUI(tk.Tk):
         self.record_btn.state(['!disabled'])
         
         if self.recording_controller:
-            self.recording_controller.stop_recording()
+            if self.setup_result == SETUP_RECORDING:
+                self.recording_controller.stop_recording()
             self.recording_controller = None
 
     def run_recording_controller(self):
-        """Thread target for running recording controller"""
+        """Thread target: set up the devices and start recording; the GUI stops it with stop_recording()"""
         try:
             config = {
-                "camera_resolution": RESOLUTION.HD1200,
+                "camera_resolution": "HD1200",
                 "camera_fps": 30,
+                "preview_fps": 2.0,
                 "gnss_port": "COM3",
                 "gnss_baudrate": 9600
             }
             self.recording_controller = RecordingController(config=config)
             print("Starting recording session...")
-            self.recording_controller.run()
-            
+            self.recording_controller.discover_and_setup_devices()
+            if not self.recording_controller.camera_recorders and not self.recording_controller.gnss_recorder:
+                self.setup_result = SETUP_FAILED
+                return
+            if self.setup_cancelled:
+                self.recording_controller.stop_recording()  # Releases the devices that were set up
+                self.setup_result = SETUP_FAILED
+                return
+            self.recording_controller.start_recording()
+            self.setup_result = SETUP_RECORDING
         except Exception as e:
-            messagebox.showerror("Error", f"Recording failed: {str(e)}")
             print(f"Recording error: {str(e)}")
-        finally:
-            self.stop_recording()
+            self.setup_error = str(e)
+            self.setup_result = SETUP_FAILED
+
+    def update_telemetry(self):
+        """Refresh the telemetry panel from the controller's latest snapshot (built on the telemetry thread)"""
+        controller = self.recording_controller
+        if not self.is_recording or controller is None or controller.telemetry is None:
+            return
+        snapshot = controller.telemetry.latest
+        if snapshot is not None:
+            self.telemetry_table.delete(*self.telemetry_table.get_children())
+            for camera in snapshot["cameras"]:
+                if camera["frame_age"] is None or camera["frame_age"] > 2.0:
+                    state = "⚠️ no frames"
+                elif not camera["recording_enabled"]:
+                    state = "preview only"
+                else:
+                    state = "ok"
+                self.telemetry_table.insert('', tk.END, values=(
+                    camera["serial_number"],
+                    _format_rate(camera["fps"], "{:.1f}") + f" / {camera['camera_fps']}",
+                    camera["grab_errors"],
+                    camera["dropped_frames"],
+                    _format_bytes(camera["svo_bytes"]),
+                    _format_rate(camera["write_bps"], "{:.1f} MB/s", 1e6),
+                    state
+                ))
+            for device in snapshot["devices"]:
+                if device["kind"] == "camera" and device["status"] != STATUS_OK:
+                    self.telemetry_table.insert('', tk.END, values=(device["name"], "-", "-", "-", "-", "-",
+                                                                     f"❌ {device['status']}"))
+            gnss = snapshot["gnss"]
+            if gnss is None:
+                gnss_text = "GNSS: not recording"
+            else:
+                gnss_text = (f"GNSS: {gnss['state']}, {_format_rate(gnss['fix_rate'], '{:.1f}')} fix/s, "
+                             f"mode {gnss['mode'] or '-'}, status {gnss['status'] or '-'}, "
+                             f"{gnss['fixes_written']} written")
+            disk = snapshot["disk"]
+            disk_text = "Disk: unknown" if disk["free_bytes"] is None else f"Disk: {_format_bytes(disk['free_bytes'])} free"
+            if disk["seconds_left"] is not None:
+                disk_text += f" (~{disk['seconds_left'] / 60:.0f} min left)"
+            self.telemetry_label.config(text=f"{gnss_text}    {disk_text}")
+        self.after(TELEMETRY_REFRESH_MS, self.update_telemetry)
+
+    def update_previews(self):
+        """Show the latest preview frame of every camera; runs on the Tk thread, never on a grab thread"""
+        controller = self.recording_controller
+        if controller is not None:
+            for recorder in list(controller.camera_recorders):
+                slot = recorder.preview
+                if slot is None:
+                    continue
+                if slot.serial_number not in self.preview_widgets:
+                    cell = ttk.Frame(self.preview_frame)
+                    cell.pack(side=tk.LEFT, padx=5)
+                    image_label = ttk.Label(cell)
+                    image_label.pack()
+                    caption = ttk.Label(cell, text=str(slot.serial_number), style='Status.TLabel')
+                    caption.pack()
+                    self.preview_widgets[slot.serial_number] = (image_label, caption)
+                image_label, caption = self.preview_widgets[slot.serial_number]
+                image = slot.latest()
+                if image is not None:
+                    # BGRA -> RGB; the slot keeps this buffer untouched until the next latest() call.
+                    photo = ImageTk.PhotoImage(Image.fromarray(image[:, :, 2::-1]))
+                    image_label.configure(image=photo)
+                    image_label.image = photo  # Keep a reference, Tk does not.
+                stale = slot.published_at is None or time.monotonic() - slot.published_at > 3 * slot.interval_ns / 1e9
+                caption.configure(text=f"{slot.serial_number}" + (" ⚠️ no frames" if stale else ""))
+        if self.is_recording:
+            self.after(PREVIEW_REFRESH_MS, self.update_previews)
+        else:
+            for child in self.preview_frame.winfo_children():
+                child.destroy()
+            self.preview_widgets = {}
 
     def update_timer(self):
         """Update the elapsed time display"""
@@ -208,7 +395,11 @@ class RecordingGUI(tk.Tk):
     def on_close(self):
         """Clean up when window is closed"""
         self.logger.stop_redirect()
-        if self.recording_controller:
+        # A setup still running would start the devices after the window is gone: cancel it and wait.
+        self.setup_cancelled = True
+        if self.recording_thread is not None:
+            self.recording_thread.join()
+        if self.recording_controller and self.setup_result == SETUP_RECORDING:
             self.recording_controller.stop_recording()
         self.destroy()
 
@@ -1,11 +1,11 @@
 from recorder.recording_controller import RecordingController
-
-from pyzed.sl import RESOLUTION
+from recorder.logging_setup import configure_logging
 
 def main():
-    # Provide a valid resolution type from the ZED SDK.
+    configure_logging("INFO")
+    # Resolutions are given by sl.RESOLUTION name; the ZED SDK is only loaded by the camera backend.
     config = {
-        "camera_resolution": RESOLUTION.HD1200,  # Use a valid RESOLUTION enum.
+        "camera_resolution": "HD1200",  # Name of a valid sl.RESOLUTION member.
         "camera_fps": 30,
         "gnss_port": "COM3",
         "gnss_baudrate": 9600
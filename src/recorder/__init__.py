@@ -1,5 +1,29 @@
-from .icamera_recorder import ICameraRecorder
-from .zed_camera_recorder import ZEDCameraRecorder
-from .gnss_recorder import GNSSRecorder
-from .recording_session_manager import RecordingSessionManager
-from .recording_controller import RecordingController
+"""
+Recorder package. Public classes are imported on first access (PEP 562), so that
+`import recorder` and GNSS-only or offline tooling never load the ZED SDK; only the
+ZED camera backend imports pyzed.
+"""
+import importlib
+
+# Public name -> defining module.
+_EXPORTS = {
+    "ICameraRecorder": ".icamera_recorder",
+    "ZEDCameraRecorder": ".zed_camera_recorder",
+    "GNSSRecorder": ".gnss_recorder",
+    "RecordingSessionManager": ".recording_session_manager",
+    "RecordingController": ".recording_controller",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
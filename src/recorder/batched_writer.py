@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+import time
+
+# Durability policies for BatchedRecordWriter.
+FSYNC_NONE = "none"          # Leave flushing to disk entirely to the OS page cache.
+FSYNC_INTERVAL = "interval"  # fsync after a commit once at least fsync_interval_ms have elapsed.
+FSYNC_BATCH = "batch"        # fsync after every committed batch.
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_INTERVAL, FSYNC_BATCH)
+
+
+class BatchedRecordWriter:
+    def __init__(self, file_path: str, max_batch_records: int = 64, max_batch_bytes: int = 64 * 1024,
+                 max_batch_delay: float = 0.5, fsync_policy: str = FSYNC_NONE, fsync_interval_ms: int = 1000,
+                 mode: str = "wb", header: bytes = None, checksum: bool = False):
+        """
+        Group-commit writer: records are accumulated in memory and committed with a single write() call
+        once a size or time threshold is reached.
+        :param file_path: Output file.
+        :param max_batch_records: Commit once this many records are pending.
+        :param max_batch_bytes: Commit once this many bytes are pending.
+        :param max_batch_delay: Commit once the oldest pending record is this many seconds old.
+        :param fsync_policy: One of FSYNC_NONE, FSYNC_INTERVAL or FSYNC_BATCH.
+        :param fsync_interval_ms: Minimum spacing between fsyncs with FSYNC_INTERVAL.
+        :param mode: "wb" to truncate, "ab" to append to an existing file.
+        :param header: Bytes written once, immediately, if the file starts out empty (not counted as a record).
+        :param checksum: Keep a running SHA-256 of everything this writer commits (see get_checksum).
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync_policy!r}, expected one of {FSYNC_POLICIES}")
+        self.file_path = file_path
+        self.max_batch_records = max_batch_records
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_delay = max_batch_delay
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval_ms / 1000.0
+        # Unbuffered: every commit is exactly one write() syscall.
+        self.file = open(file_path, mode, buffering=0)
+        self._pending = bytearray()
+        self._pending_records = 0
+        self._oldest_pending = None
+        self._last_fsync = time.monotonic()
+        self.records_written = 0
+        self.bytes_written = 0
+        self.write_calls = 0
+        self.fsync_calls = 0
+        # Hashing data as it is committed avoids re-reading the file to checksum it. Only meaningful
+        # when the writer produces the whole file, so appends to an existing file are not hashed.
+        self._sha256 = hashlib.sha256() if checksum and self.file.tell() == 0 else None
+        self._checksum_lock = threading.Lock()
+        if header and self.file.tell() == 0:
+            self.file.write(header)
+            self.write_calls += 1
+            self._account(header)
+
+    def append(self, data: bytes) -> None:
+        """
+        Queues one encoded record and commits if a threshold has been reached.
+        """
+        if self._pending_records == 0:
+            self._oldest_pending = time.monotonic()
+        self._pending += data
+        self._pending_records += 1
+        if (self._pending_records >= self.max_batch_records
+                or len(self._pending) >= self.max_batch_bytes
+                or time.monotonic() - self._oldest_pending >= self.max_batch_delay):
+            self.commit()
+
+    def poll(self) -> None:
+        """
+        Commits pending records whose time threshold has expired. Call this periodically when the
+        record source is idle so a slow trickle of records still reaches the disk on time.
+        """
+        if self._pending_records and time.monotonic() - self._oldest_pending >= self.max_batch_delay:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Writes every pending record in one call and applies the durability policy.
+        """
+        if self._pending_records:
+            view = memoryview(self._pending)
+            while view:
+                written = self.file.write(view)
+                self.write_calls += 1
+                view = view[written:]
+            view.release()
+            self.records_written += self._pending_records
+            self._account(self._pending)
+            self._pending.clear()
+            self._pending_records = 0
+            self._oldest_pending = None
+            if self.fsync_policy == FSYNC_BATCH:
+                self._fsync()
+            elif self.fsync_policy == FSYNC_INTERVAL and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._fsync()
+
+    def _account(self, data) -> None:
+        if self._sha256 is None:
+            self.bytes_written += len(data)
+            return
+        with self._checksum_lock:
+            self._sha256.update(data)
+            self.bytes_written += len(data)
+
+    def get_checksum(self) -> tuple:
+        """
+        Safe to call from another thread.
+        :return: (bytes committed, SHA-256 hex digest of those bytes), or (bytes committed, None)
+                 if checksumming is off.
+        """
+        if self._sha256 is None:
+            return self.bytes_written, None
+        with self._checksum_lock:
+            return self.bytes_written, self._sha256.hexdigest()
+
+    def _fsync(self) -> None:
+        os.fsync(self.file.fileno())
+        self.fsync_calls += 1
+        self._last_fsync = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Commits anything pending, fsyncs unless the policy is FSYNC_NONE, and closes the file.
+        """
+        if self.file.closed:
+            return
+        self.commit()
+        if self.fsync_policy != FSYNC_NONE:
+            self._fsync()
+        self.file.close()
+
+    def get_stats(self) -> dict:
+        """
+        :return: Snapshot of the writer counters.
+        """
+        return {
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "pending_records": self._pending_records,
+            "write_calls": self.write_calls,
+            "fsync_calls": self.fsync_calls,
+        }
@@ -0,0 +1,21 @@
+import importlib
+
+# Backend name -> (module, class). Modules are imported on first use, so selecting the
+# simulated backend never loads the ZED SDK.
+CAMERA_BACKENDS = {
+    "zed": (".zed_camera_recorder", "ZEDCameraBackend"),
+    "simulated": (".simulated_camera", "SimulatedCameraBackend"),
+}
+
+
+def create_camera_backend(name: str, config: dict):
+    """
+    :param name: Key of CAMERA_BACKENDS.
+    :param config: RecordingController configuration handed to the backend.
+    :return: Backend object providing list_devices() and create_recorder(device, session_dir).
+    """
+    if name not in CAMERA_BACKENDS:
+        raise ValueError(f"Unknown camera backend {name!r}, expected one of {tuple(CAMERA_BACKENDS)}")
+    module_name, class_name = CAMERA_BACKENDS[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)(config)
@@ -0,0 +1,218 @@
+import logging
+import threading
+import time
+from .camera_profiles import resolve_camera_profile, resolution_name
+
+logger = logging.getLogger(__name__)
+
+
+class CameraPool:
+    def __init__(self, camera_backend, config: dict, on_camera_added=None):
+        """
+        Keeps cameras open and grabbing between sessions, so a new session only switches their SVO
+        output (GrabbingCameraRecorder.attach_session / detach_session) instead of reopening them.
+        A monitor thread treats a camera whose grab thread died or that produced no frame for
+        `camera_lost_timeout` seconds as unplugged, and reopens it in the background; if a session
+        is recording, the reopened camera joins it as camera_<serial>_part<N> files.
+        :param camera_backend: Backend creating the recorders (see camera_backends.py).
+        :param config: RecordingController configuration.
+        :param on_camera_added: Called with a recorder reopened into the running session.
+        """
+        self.camera_backend = camera_backend
+        self.config = config
+        self.on_camera_added = on_camera_added
+        self.recorders = {}         # Serial number -> open, grabbing recorder.
+        self.reopening = set()      # Serial numbers being reopened in the background.
+        self.session_manager = None  # Session the cameras record into, None between sessions.
+        self.overrides = {}         # Session settings overrides (see RecordingController.session_overrides).
+        self.switch_gaps = []       # Seconds the cameras recorded nothing between consecutive sessions.
+        self.last_switch_gap = None  # Gap before the current session, None if there was no previous one.
+        self.reopen_times = []      # Seconds from losing a camera to having it grabbing again.
+        self._parts = {}            # Serial number -> files started in the current session.
+        self._stopped_ns = None     # time.monotonic_ns() when the previous session's outputs were closed.
+        self._watched_since = {}    # Serial number -> time.monotonic_ns() of the last start or attach.
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._monitor = None
+
+    def _start(self, recorder) -> None:
+        if self.config["preview_fps"] > 0:
+            recorder.enable_preview(self.config["preview_width"], self.config["preview_fps"])
+        self._watched_since[recorder.serial_number] = time.monotonic_ns()
+        recorder.start_grabbing()
+
+    def _attach(self, recorder) -> bool:
+        serial = recorder.serial_number
+        part = self._parts.get(serial, 0)
+        self._parts[serial] = part + 1
+        file_prefix = f"camera_{serial}" if part == 0 else f"camera_{serial}_part{part}"
+        # Attaching restarts the metrics: until the next grab, a stall is measured from here.
+        self._watched_since[serial] = time.monotonic_ns()
+        return recorder.attach_session(self.session_manager.get_svo2_directory(),
+                                       self.session_manager.get_segment_index(serial), file_prefix)
+
+    def begin_session(self, session_manager, overrides: dict = None) -> None:
+        """
+        Sets the session that prepare()d cameras, and cameras reopened from now on, record into.
+        :param overrides: Settings replacing the configured defaults for this session (e.g. a disk
+                          admission downgrade); pooled cameras open with other settings are reopened.
+        """
+        with self._lock:
+            self.session_manager = session_manager
+            self.overrides = dict(overrides or {})
+            self._parts = {}
+        if self._monitor is None:
+            self._monitor = threading.Thread(target=self._monitor_run, name="camera-pool", daemon=True)
+            self._monitor.start()
+
+    def prepare(self, cam_info) -> tuple:
+        """
+        :return: (recorder, open_fn) for a DeviceStartup: open_fn attaches a pooled camera to the
+                 session, or opens a new one, starts it grabbing and attaches it. (None, None) if
+                 the camera is being reopened; it joins the session once it is back.
+        """
+        serial = cam_info.serial_number
+        profile = resolve_camera_profile(self.config, serial, self.overrides)
+        wanted = (resolution_name(profile["camera_resolution"]), profile["camera_fps"])
+        with self._lock:
+            if serial in self.reopening:
+                return None, None
+            recorder = self.recorders.get(serial)
+            if recorder is not None and self._settings(recorder) != wanted:
+                del self.recorders[serial]
+            elif recorder is not None:
+                return recorder, lambda: self._attach(recorder)
+        if recorder is not None:
+            # An open camera cannot change resolution or fps; close it and open it with the session's settings.
+            resolution, fps = self._settings(recorder)
+            logger.info(f"🔁 Camera {serial} reopens at {wanted[0]}@{wanted[1]} (open at {resolution}@{fps}).")
+            recorder.stop()
+            recorder.join()
+        recorder = self.camera_backend.create_recorder(
+            cam_info, self.session_manager.get_svo2_directory(),
+            segment_index=self.session_manager.get_segment_index(serial), overrides=self.overrides)
+
+        def open_fn() -> bool:
+            if not recorder.open_camera():
+                return False
+            self._start(recorder)
+            with self._lock:
+                self.recorders[serial] = recorder
+            return self._attach(recorder)
+        return recorder, open_fn
+
+    @staticmethod
+    def _settings(recorder) -> tuple:
+        return resolution_name(recorder.init_params.camera_resolution), recorder.init_params.camera_fps
+
+    def release(self, recorder) -> None:
+        """
+        Drops a camera that opened past its startup timeout.
+        """
+        with self._lock:
+            if self.recorders.get(recorder.serial_number) is recorder:
+                del self.recorders[recorder.serial_number]
+        recorder.stop()
+        recorder.join()
+
+    def record_switch_gap(self) -> float:
+        """
+        Call once the session's cameras are set up.
+        :return: Seconds from the first camera closing the previous session's SVO to the last camera
+                 opening this session's, i.e. the recording gap (None for the first session).
+        """
+        with self._lock:
+            started = [recorder.recording_started_ns for recorder in self.recorders.values()
+                       if recorder.recording_started_ns is not None]
+            self.last_switch_gap = None
+            if self._stopped_ns is None or not started:
+                return None
+            gap = (max(started) - self._stopped_ns) / 1e9
+            self._stopped_ns = None
+        self.last_switch_gap = gap
+        self.switch_gaps.append(gap)
+        logger.info(f"⏱️ Cameras switched sessions without reopening: {gap * 1e3:.0f} ms without recording.")
+        return gap
+
+    def end_session(self) -> None:
+        """
+        Closes every pooled camera's SVO output; the cameras keep grabbing until the next session.
+        """
+        with self._lock:
+            self.session_manager = None
+            recorders = list(self.recorders.values())
+            waiters = []
+            for recorder in recorders:
+                waiter = threading.Thread(target=recorder.detach_session, name=f"detach-{recorder.serial_number}")
+                waiter.start()
+                waiters.append(waiter)
+            for waiter in waiters:
+                waiter.join()
+            stopped = [recorder.recording_stopped_ns for recorder in recorders
+                       if recorder.recording_stopped_ns is not None]
+            self._stopped_ns = min(stopped) if stopped else None
+
+    def _monitor_run(self) -> None:
+        timeout_ns = self.config["camera_lost_timeout"] * 1e9
+        while not self._closed.wait(min(0.5, self.config["camera_lost_timeout"] / 2)):
+            now_ns = time.monotonic_ns()
+            with self._lock:
+                for serial, recorder in list(self.recorders.items()):
+                    metrics = recorder.metrics
+                    last_ns = metrics.last_frame_at or metrics.started_at or self._watched_since.get(serial)
+                    alive = recorder.thread is not None and recorder.thread.is_alive()
+                    if alive and (last_ns is None or now_ns - last_ns < timeout_ns):
+                        continue
+                    del self.recorders[serial]
+                    self.reopening.add(serial)
+                    silent = (now_ns - (last_ns or now_ns)) / 1e9
+                    logger.warning(f"⚠️ Camera {serial} lost (no frame for {silent:.1f} s); "
+                                   f"reopening it in the background.")
+                    recorder.stop()
+                    threading.Thread(target=self._reopen, args=(recorder,), name=f"reopen-camera-{serial}",
+                                     daemon=True).start()
+
+    def _reopen(self, lost) -> None:
+        serial = lost.serial_number
+        lost_at = time.monotonic()
+        # Closes the lost camera's output and handle; the SDK's grab() returns once the device is gone.
+        lost.join()
+        while not self._closed.wait(self.config["camera_reopen_interval"]):
+            if not any(info.serial_number == serial for info in self.camera_backend.list_devices()):
+                continue
+            recorder = self.camera_backend.create_recorder(lost.camera_info, lost.session_dir,
+                                                           overrides=self.overrides)
+            if not recorder.open_camera():
+                continue
+            self._start(recorder)
+            with self._lock:
+                self.reopening.discard(serial)
+                if self._closed.is_set():
+                    recorder.stop()
+                    recorder.join()
+                    return
+                self.recorders[serial] = recorder
+                attached = self.session_manager is not None and self._attach(recorder)
+                if attached and self.on_camera_added is not None:
+                    self.on_camera_added(recorder)
+            reopen_time = time.monotonic() - lost_at
+            self.reopen_times.append(reopen_time)
+            logger.info(f"✅ Camera {serial} reopened after {reopen_time:.1f} s"
+                        f"{' and rejoined the session' if attached else ''}.")
+            return
+
+    def close(self) -> None:
+        """
+        Stops and closes every pooled camera.
+        """
+        self._closed.set()
+        with self._lock:
+            recorders = list(self.recorders.values())
+            self.recorders = {}
+            self.session_manager = None
+        for recorder in recorders:
+            recorder.stop()
+        for recorder in recorders:
+            recorder.join()
+        if self._monitor is not None:
+            self._monitor.join()
@@ -0,0 +1,51 @@
+from .disk_admission import SVO_BITS_PER_PIXEL
+
+# Controller config keys a per-camera profile may override.
+PROFILE_KEYS = (
+    "camera_resolution",   # sl.RESOLUTION member or its name.
+    "camera_fps",
+    "svo_compression",     # sl.SVO_COMPRESSION_MODE name: H264, H265, H264_LOSSLESS, H265_LOSSLESS, LOSSLESS.
+    "svo_bitrate_kbps",    # Encoder bitrate, 0 lets the SDK choose.
+    "recording_enabled",   # False: open and grab (preview-only) without writing an SVO.
+)
+
+
+def validate_camera_profiles(config: dict) -> None:
+    """
+    Checks the "camera_profiles" section of the controller config: a mapping from camera serial
+    number (int or string) to a dict overriding any of PROFILE_KEYS.
+    """
+    for serial, profile in config["camera_profiles"].items():
+        unknown = set(profile) - set(PROFILE_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown keys {sorted(unknown)} in camera profile {serial}, expected {PROFILE_KEYS}")
+    compressions = [config["svo_compression"]] + [profile["svo_compression"]
+                                                  for profile in config["camera_profiles"].values()
+                                                  if "svo_compression" in profile]
+    for compression in compressions:
+        if compression not in SVO_BITS_PER_PIXEL:
+            raise ValueError(f"Unknown SVO compression {compression!r}, expected one of {tuple(SVO_BITS_PER_PIXEL)}")
+
+
+def has_camera_profile(config: dict, serial_number: int) -> bool:
+    profiles = config["camera_profiles"]
+    return serial_number in profiles or str(serial_number) in profiles
+
+
+def resolve_camera_profile(config: dict, serial_number: int, overrides: dict = None) -> dict:
+    """
+    :param overrides: Session-wide replacements of the controller defaults (e.g. a disk admission
+                      downgrade); the base config is left untouched.
+    :return: The PROFILE_KEYS settings of one camera: the controller defaults and overrides,
+             overridden by the camera's entry in "camera_profiles" if it has one. Always a new dict.
+    """
+    profile = {key: config[key] for key in PROFILE_KEYS}
+    profile.update(overrides or {})
+    profiles = config["camera_profiles"]
+    profile.update(profiles.get(serial_number, profiles.get(str(serial_number), {})))
+    return profile
+
+
+def resolution_name(resolution) -> str:
+    """:return: Name of a resolution given as an sl.RESOLUTION member or a name."""
+    return resolution if isinstance(resolution, str) else resolution.name
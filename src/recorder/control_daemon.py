@@ -0,0 +1,292 @@
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from .recording_controller import RecordingController
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), "zed_recorder.sock")
+MAX_REQUEST_BYTES = 64 * 1024
+
+# Control commands: one JSON object per line, e.g. {"command": "status"}; one JSON reply per line.
+COMMAND_START = "start"
+COMMAND_STOP = "stop"
+COMMAND_SPLIT = "split"
+COMMAND_STATUS = "status"
+COMMAND_SHUTDOWN = "shutdown"
+COMMANDS = (COMMAND_START, COMMAND_STOP, COMMAND_SPLIT, COMMAND_STATUS, COMMAND_SHUTDOWN)
+
+STATE_IDLE = "idle"
+STATE_STARTING = "starting"
+STATE_RECORDING = "recording"
+STATE_STOPPING = "stopping"
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # A client may keep its connection open and send any number of commands.
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                response = {"ok": False, "error": f"Request larger than {MAX_REQUEST_BYTES} bytes"}
+            else:
+                response = self.server.recorder_daemon.handle_request(line)
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+            if len(line) > MAX_REQUEST_BYTES:
+                return
+
+
+class _ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class RecorderDaemon:
+    def __init__(self, config: dict = None, socket_path: str = DEFAULT_SOCKET_PATH):
+        """
+        Long-running recorder controlled over a Unix domain socket instead of input(): starts, stops
+        and splits sessions on request, so back-to-back sessions do not restart the process.
+        Session commands run one at a time (a second one gets a "busy" reply); status never waits
+        for them and only reads the state and the latest telemetry snapshot.
+        :param config: RecordingController configuration, shared by every session.
+        :param socket_path: Path of the control socket (owner-only permissions).
+        """
+        self.config = config
+        self.socket_path = socket_path
+        self.controller = None  # Created by the first start, then reused for every session.
+        self.state = STATE_IDLE
+        self.sessions_recorded = 0
+        self.session_started_at = None  # time.time() when the current session started recording.
+        self.started_at = time.time()
+        self.server = None
+        self._command_lock = threading.Lock()
+        self._shutdown = threading.Event()
+
+    def _bind(self) -> None:
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # Left behind by a daemon that did not exit cleanly.
+            else:
+                raise RuntimeError(f"A recorder daemon is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+        self.server = _ControlServer(self.socket_path, _ControlHandler)
+        os.chmod(self.socket_path, 0o600)
+        self.server.recorder_daemon = self
+
+    def serve_forever(self) -> None:
+        """
+        Serves control commands until a shutdown command, SIGINT or SIGTERM, then stops any running
+        session.
+        """
+        self._bind()
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda signum, frame: self._shutdown.set())
+        thread = threading.Thread(target=self.server.serve_forever, name="control-socket", daemon=True)
+        thread.start()
+        logger.info(f"🛰️ Recorder daemon listening on {self.socket_path}")
+        while not self._shutdown.wait(0.5):
+            pass
+        with self._command_lock:
+            if self.state == STATE_RECORDING:
+                self._stop_session()
+        self.server.shutdown()
+        self.server.server_close()
+        thread.join()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        if self.controller is not None:
+            self.controller.shutdown()
+        logger.info(f"🛑 Recorder daemon stopped ({self.sessions_recorded} sessions recorded).")
+
+    def shutdown(self) -> None:
+        """
+        Makes serve_forever() return (from any thread).
+        """
+        self._shutdown.set()
+
+    def handle_request(self, line: bytes) -> dict:
+        """
+        :param line: JSON request, {"command": <one of COMMANDS>}.
+        :return: JSON-serializable reply, {"ok": True, ...} or {"ok": False, "error": <message>}.
+        """
+        try:
+            request = json.loads(line)
+            command = request["command"]
+        except (ValueError, TypeError, KeyError):
+            return {"ok": False, "error": 'Expected a JSON object with a "command" key'}
+        if command not in COMMANDS:
+            return {"ok": False, "error": f"Unknown command {command!r}, expected one of {', '.join(COMMANDS)}"}
+        if command == COMMAND_STATUS:
+            return self.get_status()
+        if command == COMMAND_SHUTDOWN:
+            self.shutdown()
+            return {"ok": True, "state": self.state}
+        if not self._command_lock.acquire(blocking=False):
+            return {"ok": False, "error": f"Busy ({self.state})", "state": self.state}
+        try:
+            if command == COMMAND_START:
+                if self.state == STATE_RECORDING:
+                    return {"ok": False, "error": "A session is already recording", "state": self.state}
+                return self._start_session()
+            if self.state != STATE_RECORDING:
+                return {"ok": False, "error": "No session is recording", "state": self.state}
+            if command == COMMAND_STOP:
+                return self._stop_session()
+            started = time.monotonic()
+            stopped = self._stop_session()
+            reply = self._start_session()
+            reply["previous_session_dir"] = stopped["session_dir"]
+            reply["elapsed"] = time.monotonic() - started
+            return reply
+        except Exception as e:
+            logger.exception(f"❌ Command {command!r} failed: {e}")
+            return {"ok": False, "error": str(e), "state": self.state}
+        finally:
+            self._command_lock.release()
+
+    def _start_session(self) -> dict:
+        started = time.monotonic()
+        self.state = STATE_STARTING
+        try:
+            if self.controller is None:
+                self.controller = RecordingController(config=self.config)
+            else:
+                self.controller.new_session()
+            controller = self.controller
+            controller.discover_and_setup_devices()
+            session_dir = controller.session_manager.get_session_directory()
+            devices = [{"kind": s.kind, "name": s.name, "status": s.status} for s in controller.startup_report]
+            if not controller.camera_recorders and not controller.gnss_recorder:
+                self.state = STATE_IDLE
+                return {"ok": False, "error": "No device started", "state": self.state,
+                        "session_dir": session_dir, "devices": devices}
+            controller.start_recording()
+        except BaseException:
+            self.state = STATE_IDLE
+            self._abort_session()
+            raise
+        self.state = STATE_RECORDING
+        self.session_started_at = time.time()
+        pool = controller.camera_pool
+        return {"ok": True, "state": self.state, "session_dir": session_dir, "devices": devices,
+                "elapsed": time.monotonic() - started,
+                "recording_gap": None if pool is None else pool.last_switch_gap}
+
+    def _abort_session(self) -> None:
+        # A start that failed part-way leaves devices set up or already recording; release them
+        # before the failure is reported.
+        controller = self.controller
+        if controller is None or not (controller.camera_recorders or controller.gnss_recorder
+                                      or controller.manifest is not None):
+            return
+        try:
+            controller.stop_recording()
+        except Exception as e:
+            logger.exception(f"❌ Cleaning up the failed session start failed: {e}")
+
+    def _stop_session(self) -> dict:
+        started = time.monotonic()
+        self.state = STATE_STOPPING
+        try:
+            self.controller.stop_recording()
+        finally:
+            self.state = STATE_IDLE
+            self.session_started_at = None
+            self.sessions_recorded += 1
+        return {"ok": True, "state": self.state,
+                "session_dir": self.controller.session_manager.get_session_directory(),
+                "elapsed": time.monotonic() - started}
+
+    def get_status(self) -> dict:
+        controller = self.controller
+        recording = self.state == STATE_RECORDING and controller is not None
+        return {
+            "ok": True,
+            "state": self.state,
+            "session_dir": controller.session_manager.get_session_directory() if recording else None,
+            "session_seconds": time.time() - self.session_started_at if self.session_started_at else None,
+            "sessions_recorded": self.sessions_recorded,
+            "uptime": time.time() - self.started_at,
+            "telemetry": None if controller is None else controller.get_telemetry_snapshot(),
+        }
+
+
+class ControlClient:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 120.0):
+        """
+        Connection to a RecorderDaemon; keep it open to send several commands.
+        :param socket_path: Control socket of the daemon.
+        :param timeout: Seconds to wait for a reply (starting a session opens every device).
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(socket_path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.file = self.sock.makefile("rb")
+
+    def request(self, command: str, **args) -> dict:
+        """
+        :return: The daemon's reply (check reply["ok"]).
+        """
+        self.sock.sendall(json.dumps({"command": command, **args}).encode() + b"\n")
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("The recorder daemon closed the connection")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def send_command(command: str, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 120.0) -> dict:
+    """
+    Sends one command over a new connection.
+    :return: The daemon's reply.
+    """
+    with ControlClient(socket_path, timeout) as client:
+        return client.request(command)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a command to a running recorder daemon (src/daemon.py).")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Control socket of the daemon.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for the reply.")
+    args = parser.parse_args()
+    try:
+        reply = send_command(args.command, args.socket, args.timeout)
+    except OSError as e:
+        print(f"❌ Cannot reach the recorder daemon on {args.socket}: {e}")
+        sys.exit(2)
+    print(json.dumps(reply, indent=2, default=str))
+    sys.exit(0 if reply["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Startup outcomes.
+STATUS_PENDING = "pending"
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"    # open_fn returned False.
+STATUS_ERROR = "error"      # open_fn raised.
+STATUS_TIMEOUT = "timeout"  # open_fn did not return before the device's deadline.
+
+
+class DeviceStartup:
+    def __init__(self, kind: str, name: str, open_fn, timeout: float, release_fn=None, device=None):
+        """
+        Opens one device on its own daemon thread, so a slow or hung device cannot hold up the others.
+        :param kind: Device kind for the report, e.g. "camera" or "gnss".
+        :param name: Device name for the report, e.g. the camera serial number.
+        :param open_fn: Callable doing the whole open sequence; returns True on success.
+        :param timeout: Seconds the controller is willing to wait for this device.
+        :param release_fn: Called if open_fn eventually succeeds after the device was given up on.
+        :param device: The recorder object being opened, handed back to the caller with the result.
+        """
+        self.kind = kind
+        self.name = name
+        self.open_fn = open_fn
+        self.timeout = timeout
+        self.release_fn = release_fn
+        self.device = device
+        self.status = STATUS_PENDING
+        self.latency = None
+        self.error = None
+        self.deadline = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self.deadline = time.monotonic() + self.timeout
+        self._thread = threading.Thread(target=self._run, name=f"open-{self.kind}-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        start = time.monotonic()
+        try:
+            status = STATUS_OK if self.open_fn() else STATUS_FAILED
+        except Exception as e:
+            status = STATUS_ERROR
+            self.error = str(e)
+        latency = time.monotonic() - start
+        with self._lock:
+            self.latency = latency
+            abandoned = self.status == STATUS_TIMEOUT
+            if not abandoned:
+                self.status = status
+        self._done.set()
+        if abandoned and status == STATUS_OK and self.release_fn is not None:
+            logger.warning(f"⚠️ {self.kind} {self.name} opened after {latency:.1f} s, past its timeout; releasing it.")
+            self.release_fn()
+
+    def wait(self) -> str:
+        """
+        Waits until the device is open or its deadline passes.
+        :return: Final status of the device.
+        """
+        self._done.wait(max(0.0, self.deadline - time.monotonic()))
+        with self._lock:
+            if self.status == STATUS_PENDING:
+                self.status = STATUS_TIMEOUT
+            return self.status
+
+
+def start_devices(startups: list) -> list:
+    """
+    Starts every device open concurrently and waits for each one up to its own timeout.
+    :return: The same DeviceStartup objects, all with a final status.
+    """
+    for startup in startups:
+        startup.start()
+    for startup in startups:
+        startup.wait()
+    return startups
+
+
+def format_startup_report(startups: list) -> str:
+    """
+    :return: Human-readable per-device open latency report.
+    """
+    lines = ["📋 Device startup report:"]
+    for startup in startups:
+        if startup.status == STATUS_TIMEOUT:
+            latency = f">{startup.timeout:.1f} s"
+        else:
+            latency = f"{startup.latency:.2f} s"
+        icon = "✅" if startup.status == STATUS_OK else "❌"
+        detail = f" ({startup.error})" if startup.error else ""
+        lines.append(f"   {icon} {startup.kind:<7} {startup.name:<12} {startup.status:<8} {latency}{detail}")
+    return "\n".join(lines)
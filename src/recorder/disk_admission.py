@@ -0,0 +1,212 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# What to do when the disk cannot sustain the requested recording.
+ADMISSION_OFF = "off"                # Skip the preflight entirely.
+ADMISSION_WARN = "warn"              # Report the shortfall and record anyway.
+ADMISSION_REFUSE = "refuse"          # Do not start recording.
+ADMISSION_DOWNGRADE = "downgrade"    # Lower fps, then resolution, until the estimate fits.
+ADMISSION_POLICIES = (ADMISSION_OFF, ADMISSION_WARN, ADMISSION_REFUSE, ADMISSION_DOWNGRADE)
+
+# Approximate SVO bits per pixel of the stereo pair, by sl.SVO_COMPRESSION_MODE name. Deliberately
+# on the high side of what the ZED encoders produce for outdoor scenes.
+SVO_BITS_PER_PIXEL = {
+    "H264": 0.15,
+    "H265": 0.10,
+    "H264_LOSSLESS": 2.0,
+    "H265_LOSSLESS": 1.6,
+    "LOSSLESS": 6.0,  # PNG-compressed frames.
+}
+
+# Steps tried by the downgrade policy: lower frame rates first, then the next smaller resolution
+# of the camera family, largest first. A camera cannot open at a resolution its model lacks, so the
+# ladder is the first one holding the configured resolution (HD1080 is on both; ZED X first).
+DOWNGRADE_FPS = (60, 30, 15)
+DOWNGRADE_RESOLUTIONS = (
+    ("HD1200", "HD1080", "SVGA"),       # ZED X / ZED X Mini.
+    ("HD2K", "HD1080", "HD720", "VGA"),  # ZED 2 / ZED 2i.
+)
+
+# Frame timestamp sidecar record size, see frame_index.FRAME_RECORD_FIELDS.
+FRAME_SIDECAR_BYTES_PER_FRAME = 28
+
+
+def estimate_svo_bandwidth(width: int, height: int, fps: float, compression: str = "H264",
+                           bitrate_kbps: int = 0) -> float:
+    """
+    :param bitrate_kbps: Encoder bitrate if one is configured (0 = derive it from the resolution).
+    :return: Estimated write bandwidth of one camera recording in bytes per second.
+    """
+    if bitrate_kbps and not compression.endswith("LOSSLESS"):
+        video = bitrate_kbps * 1000 / 8
+    else:
+        video = 2 * width * height * fps * SVO_BITS_PER_PIXEL[compression] / 8
+    return video + fps * FRAME_SIDECAR_BYTES_PER_FRAME
+
+
+def measure_write_throughput(directory: str, probe_bytes: int = 64 * 1024 * 1024, max_seconds: float = 3.0,
+                             chunk_bytes: int = 4 * 1024 * 1024) -> float:
+    """
+    Writes a temporary probe file in `directory` and fsyncs it, so the result reflects what the
+    device sustains rather than the page cache. Stops early after `max_seconds`.
+    :return: Sequential write throughput in bytes per second.
+    """
+    probe_path = os.path.join(directory, f".write_probe_{os.getpid()}")
+    chunk = os.urandom(chunk_bytes)  # Incompressible, like encoded video.
+    written = 0
+    fd = os.open(probe_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        start = time.monotonic()
+        deadline = start + max_seconds
+        while written < probe_bytes and time.monotonic() < deadline:
+            written += os.write(fd, chunk)
+        os.fsync(fd)
+        elapsed = time.monotonic() - start
+    finally:
+        os.close(fd)
+        os.remove(probe_path)
+    return written / max(elapsed, 1e-6)
+
+
+class AdmissionResult:
+    def __init__(self, admitted: bool, required_bps: float, measured_bps: float, free_bytes: int,
+                 resolution: str, fps: int, message: str):
+        """
+        Outcome of the disk preflight.
+        :param admitted: Whether recording may start.
+        :param required_bps: Estimated total write bandwidth of the (possibly downgraded) recording.
+        :param measured_bps: Measured sequential write throughput of the results volume.
+        :param free_bytes: Free space on the results volume.
+        :param resolution: Resolution to record with (changed by the downgrade policy).
+        :param fps: Frame rate to record with (changed by the downgrade policy).
+        :param message: Human-readable summary.
+        """
+        self.admitted = admitted
+        self.required_bps = required_bps
+        self.measured_bps = measured_bps
+        self.free_bytes = free_bytes
+        self.resolution = resolution
+        self.fps = fps
+        self.message = message
+
+    @property
+    def recording_seconds(self) -> float:
+        """:return: How long the free space lasts at the required bandwidth."""
+        return self.free_bytes / self.required_bps if self.required_bps else float("inf")
+
+
+def _fits(required_bps: float, measured_bps: float, free_bytes: int, headroom: float, min_seconds: float) -> bool:
+    return required_bps * headroom <= measured_bps and free_bytes >= required_bps * min_seconds
+
+
+def _downgrades(resolution: str, fps: int):
+    """
+    :return: Generator of (resolution, fps) candidates, least degraded first.
+    """
+    ladder = next((ladder for ladder in DOWNGRADE_RESOLUTIONS if resolution in ladder), (resolution,))
+    for lower_resolution in ladder[ladder.index(resolution):]:
+        for lower_fps in DOWNGRADE_FPS:
+            if lower_fps <= fps:
+                yield lower_resolution, lower_fps
+
+
+def check_disk_admission(directory: str, camera_count: int, resolution: str, fps: int, bandwidth_fn,
+                         policy: str = ADMISSION_WARN, headroom: float = 1.5, min_free_minutes: float = 10.0,
+                         probe_bytes: int = 64 * 1024 * 1024, fixed_bps: float = 0.0) -> AdmissionResult:
+    """
+    Preflight: compares the estimated write bandwidth of `camera_count` cameras with the measured
+    throughput and free space of `directory`, and applies `policy` when it does not fit.
+    :param bandwidth_fn: Callable (resolution name, fps) -> bytes per second for one camera.
+    :param headroom: Required ratio of measured throughput to estimated bandwidth.
+    :param min_free_minutes: Minimum recording time the free space must allow.
+    :param fixed_bps: Bandwidth of other recordings that the downgrade policy must not change
+                      (cameras with their own profile).
+    """
+    if policy not in ADMISSION_POLICIES:
+        raise ValueError(f"Unknown disk admission policy {policy!r}, expected one of {ADMISSION_POLICIES}")
+    free_bytes = shutil.disk_usage(directory).free
+    measured_bps = measure_write_throughput(directory, probe_bytes)
+    min_seconds = min_free_minutes * 60
+    required_bps = camera_count * bandwidth_fn(resolution, fps) + fixed_bps
+    cameras = f"{camera_count} camera(s) at {resolution}@{fps}" + (" plus profiled cameras" if fixed_bps else "")
+    summary = (f"{cameras} need ~{required_bps / 1e6:.1f} MB/s, "
+               f"disk sustains {measured_bps / 1e6:.1f} MB/s with {free_bytes / 1e9:.1f} GB free")
+    if _fits(required_bps, measured_bps, free_bytes, headroom, min_seconds):
+        return AdmissionResult(True, required_bps, measured_bps, free_bytes, resolution, fps, summary)
+
+    if policy == ADMISSION_DOWNGRADE:
+        for candidate_resolution, candidate_fps in _downgrades(resolution, fps):
+            candidate_bps = camera_count * bandwidth_fn(candidate_resolution, candidate_fps) + fixed_bps
+            if _fits(candidate_bps, measured_bps, free_bytes, headroom, min_seconds):
+                return AdmissionResult(True, candidate_bps, measured_bps, free_bytes, candidate_resolution,
+                                       candidate_fps, f"{summary}; downgraded to {candidate_resolution}@{candidate_fps}")
+        return AdmissionResult(False, required_bps, measured_bps, free_bytes, resolution, fps,
+                               f"{summary}; no lower setting fits")
+    return AdmissionResult(policy != ADMISSION_REFUSE, required_bps, measured_bps, free_bytes, resolution, fps,
+                           summary)
+
+
+class DiskMonitor:
+    def __init__(self, directory: str, expected_bps: float, interval: float = 10.0, warn_minutes: float = 15.0,
+                 critical_minutes: float = 2.0):
+        """
+        Re-checks the results volume during recording: free space, the observed write rate and the
+        time left before the disk fills. Warnings are printed once per threshold crossing.
+        :param directory: Directory on the monitored volume.
+        :param expected_bps: Write bandwidth estimated at admission, used until a rate is observed.
+        :param interval: Seconds between checks.
+        :param warn_minutes: Warn when less recording time than this is left.
+        :param critical_minutes: Warn again, louder, below this.
+        """
+        self.directory = directory
+        self.expected_bps = expected_bps
+        self.interval = interval
+        self.warn_seconds = warn_minutes * 60
+        self.critical_seconds = critical_minutes * 60
+        self.free_bytes = None
+        self.write_bps = None
+        self.seconds_left = None
+        self._level = 0  # 0 ok, 1 warned, 2 critical.
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="disk-monitor", daemon=True)
+        self.thread.start()
+
+    def check(self, elapsed: float = None) -> None:
+        free_bytes = shutil.disk_usage(self.directory).free
+        if self.free_bytes is not None and elapsed:
+            # Free space shrinks by what all recorders wrote, plus anything else using the volume.
+            self.write_bps = max(0.0, (self.free_bytes - free_bytes) / elapsed)
+        self.free_bytes = free_bytes
+        rate = self.write_bps or self.expected_bps
+        self.seconds_left = free_bytes / rate if rate else float("inf")
+        if self.seconds_left < self.critical_seconds and self._level < 2:
+            self._level = 2
+            logger.error(f"🛑 Disk almost full: ~{self.seconds_left / 60:.1f} min of recording left "
+                         f"({free_bytes / 1e9:.2f} GB free). Stop recording soon.")
+        elif self.seconds_left < self.warn_seconds and self._level < 1:
+            self._level = 1
+            logger.warning(f"⚠️ Disk filling up: ~{self.seconds_left / 60:.0f} min of recording left "
+                           f"({free_bytes / 1e9:.1f} GB free at {rate / 1e6:.1f} MB/s).")
+        elif self.seconds_left >= self.warn_seconds:
+            self._level = 0
+
+    def _run(self) -> None:
+        last = time.monotonic()
+        self.check()
+        while not self._stop.wait(self.interval):
+            now = time.monotonic()
+            self.check(now - last)
+            last = now
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
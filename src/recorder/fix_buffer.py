@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+
+# Overflow policies for FixRingBuffer.
+DROP_OLDEST = "drop_oldest"  # Evict the oldest queued fix to make room for the new one.
+DROP_NEWEST = "drop_newest"  # Discard the incoming fix, keep what is already queued.
+BLOCK = "block"              # Make the producer wait (up to put_timeout) for free space.
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class FixRingBuffer:
+    def __init__(self, capacity: int = 256, overflow_policy: str = DROP_OLDEST, put_timeout: float = 0.5):
+        """
+        Bounded, thread-safe FIFO used to hand GNSS fixes from the GPSD reader thread to consumers.
+        :param capacity: Maximum number of fixes held before the overflow policy applies.
+        :param overflow_policy: One of DROP_OLDEST, DROP_NEWEST or BLOCK.
+        :param put_timeout: With BLOCK, how long a producer waits for space before dropping the fix.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy!r}, expected one of {OVERFLOW_POLICIES}")
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self.put_timeout = put_timeout
+        self._items = deque()
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._closed = False
+        # Counters are only written under the mutex; reading them without it is fine for reporting.
+        self.pushed = 0
+        self.popped = 0
+        self.overflows = 0
+        self.dropped = 0
+        self.high_watermark = 0
+
+    def put(self, item) -> bool:
+        """
+        Queues a fix, applying the overflow policy when the buffer is full.
+        :return: True if the item was queued, False if it was dropped.
+        """
+        with self._mutex:
+            if self._closed:
+                return False
+            if len(self._items) >= self.capacity:
+                self.overflows += 1
+                if self.overflow_policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.overflow_policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                else:
+                    deadline = time.monotonic() + self.put_timeout
+                    while len(self._items) >= self.capacity and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._not_full.wait(remaining)
+                    if len(self._items) >= self.capacity or self._closed:
+                        self.dropped += 1
+                        return False
+            self._items.append(item)
+            self.pushed += 1
+            if len(self._items) > self.high_watermark:
+                self.high_watermark = len(self._items)
+            self._not_empty.notify()
+            return True
+
+    def get_nowait(self):
+        """
+        :return: The oldest queued fix, or None if the buffer is empty.
+        """
+        with self._mutex:
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self.popped += 1
+            self._not_full.notify()
+            return item
+
+    def get(self, timeout: float = None):
+        """
+        Blocks until a fix is available.
+        :param timeout: Maximum wait in seconds, None to wait indefinitely.
+        :return: The oldest queued fix, or None on timeout or when the buffer is closed and empty.
+        """
+        with self._mutex:
+            if not self._wait_for_items(timeout):
+                return None
+            item = self._items.popleft()
+            self.popped += 1
+            self._not_full.notify()
+            return item
+
+    def drain(self, max_items: int = None, timeout: float = None) -> list:
+        """
+        Blocks until at least one fix is available, then returns every queued fix (up to max_items).
+        :param max_items: Upper bound on the batch size, None for no limit.
+        :param timeout: Maximum wait in seconds for the first fix, None to wait indefinitely, 0 to poll.
+        :return: List of fixes in arrival order; empty on timeout or when closed.
+        """
+        with self._mutex:
+            if not self._wait_for_items(timeout):
+                return []
+            count = len(self._items) if max_items is None else min(max_items, len(self._items))
+            batch = [self._items.popleft() for _ in range(count)]
+            self.popped += count
+            self._not_full.notify_all()
+            return batch
+
+    def _wait_for_items(self, timeout: float) -> bool:
+        # Must be called with the mutex held.
+        if timeout is None:
+            while not self._items and not self._closed:
+                self._not_empty.wait()
+        elif not self._items and timeout > 0:
+            deadline = time.monotonic() + timeout
+            while not self._items and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._not_empty.wait(remaining)
+        return bool(self._items)
+
+    def close(self) -> None:
+        """
+        Wakes every waiting producer and consumer; further puts are rejected.
+        Fixes already queued can still be drained.
+        """
+        with self._mutex:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_stats(self) -> dict:
+        """
+        :return: Snapshot of the queue counters.
+        """
+        return {
+            "capacity": self.capacity,
+            "overflow_policy": self.overflow_policy,
+            "queued": len(self._items),
+            "pushed": self.pushed,
+            "popped": self.popped,
+            "overflows": self.overflows,
+            "dropped": self.dropped,
+            "high_watermark": self.high_watermark,
+        }
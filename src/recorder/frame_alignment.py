@@ -0,0 +1,303 @@
+import argparse
+import json
+import os
+import re
+import sys
+from typing import NamedTuple
+import numpy as np
+from .frame_index import open_frame_index, FRAME_INDEX_SUFFIX
+from .record_file import build_header, numpy_dtype, open_records
+
+FRAME_SETS_KIND = "frame_sets"
+FRAME_SETS_VERSION = 1
+FRAME_SETS_FILENAME = "frame_sets.bin"
+ALIGNMENT_REPORT_FILENAME = "frame_alignment.json"
+
+# camera_<serial>.frames, or camera_<serial>_part<N>.frames for a camera reopened mid-session.
+_SIDECAR_NAME = re.compile(rf"camera_(\d+)(?:_part(\d+))?{re.escape(FRAME_INDEX_SUFFIX)}$")
+_NO_MATCH = -1
+
+
+class CameraFrames(NamedTuple):
+    serial_number: int
+    timestamp_ns: np.ndarray  # Camera image timestamps of the successful grabs, sorted.
+    frame_index: np.ndarray   # SVO frame number of each timestamp.
+    part: np.ndarray          # File part (0 for camera_<serial>.*, N for camera_<serial>_part<N>.*).
+
+
+def load_camera_frames(svo_dir: str) -> list:
+    """
+    Reads the successful grabs of every camera's frame timestamp sidecars in a session's svo2 folder.
+    :return: CameraFrames per camera, by serial number.
+    """
+    files = {}
+    for name in sorted(os.listdir(svo_dir)):
+        match = _SIDECAR_NAME.match(name)
+        if match:
+            files.setdefault(int(match.group(1)), []).append((int(match.group(2) or 0), os.path.join(svo_dir, name)))
+    cameras = []
+    for serial_number in sorted(files):
+        timestamps, frame_indexes, parts = [], [], []
+        for part, file_path in sorted(files[serial_number]):
+            records = open_frame_index(file_path)
+            ok = (records["grab_status"] == 0) & (records["camera_timestamp_ns"] > 0)
+            timestamps.append(records["camera_timestamp_ns"][ok])
+            frame_indexes.append(records["frame_index"][ok].astype(np.int64))
+            parts.append(np.full(np.count_nonzero(ok), part, dtype=np.int16))
+        timestamps = np.concatenate(timestamps)
+        order = np.argsort(timestamps, kind="stable")
+        cameras.append(CameraFrames(serial_number, timestamps[order], np.concatenate(frame_indexes)[order],
+                                    np.concatenate(parts)[order]))
+    return cameras
+
+
+def match_nearest(reference_ns: np.ndarray, target_ns: np.ndarray, tolerance_ns: int) -> np.ndarray:
+    """
+    One-to-one nearest-neighbour matching of two sorted timestamp arrays: every reference timestamp
+    takes the closest target timestamp within the tolerance, and a target timestamp claimed by
+    several reference timestamps stays with the closest one.
+    :return: Index into target_ns for every reference timestamp, -1 where nothing matched.
+    """
+    reference_ns = np.asarray(reference_ns, dtype=np.int64)
+    target_ns = np.asarray(target_ns, dtype=np.int64)
+    n = len(target_ns)
+    if n == 0:
+        return np.full(len(reference_ns), _NO_MATCH, dtype=np.int64)
+    far = np.iinfo(np.int64).max
+    right = np.searchsorted(target_ns, reference_ns)
+    left = right - 1
+    right_clipped = np.minimum(right, n - 1)
+    left_clipped = np.maximum(left, 0)
+    right_distance = np.where(right < n, target_ns[right_clipped] - reference_ns, far)
+    left_distance = np.where(left >= 0, reference_ns - target_ns[left_clipped], far)
+    distance = np.minimum(left_distance, right_distance)
+    matches = np.where(left_distance <= right_distance, left_clipped, right_clipped).astype(np.int64)
+    matches[distance > tolerance_ns] = _NO_MATCH
+
+    matched = np.flatnonzero(matches >= 0)
+    order = matched[np.lexsort((distance[matched], matches[matched]))]  # By target, then distance.
+    duplicate = np.zeros(len(order), dtype=bool)
+    duplicate[1:] = matches[order][1:] == matches[order][:-1]
+    matches[order[duplicate]] = _NO_MATCH
+    return matches
+
+
+def _stats_ms(values_ns: np.ndarray) -> dict:
+    if len(values_ns) == 0:
+        return {"p50": None, "p95": None, "max": None}
+    p50, p95 = np.percentile(values_ns, (50, 95))
+    return {"p50": p50 / 1e6, "p95": p95 / 1e6, "max": float(values_ns.max()) / 1e6}
+
+
+def _spread_ns(matched: np.ndarray, offsets_ns: np.ndarray) -> np.ndarray:
+    latest = np.where(matched, offsets_ns, np.iinfo(np.int64).min).max(axis=1)
+    earliest = np.where(matched, offsets_ns, np.iinfo(np.int64).max).min(axis=1)
+    return latest - earliest
+
+
+class FrameSets:
+    def __init__(self, cameras: list, tolerance_ns: int = None, reference_serial: int = None):
+        """
+        Synchronized frame sets of a multi-camera session: one set per frame of the reference camera,
+        holding the nearest frame of every other camera within `tolerance_ns` (or none).
+        :param cameras: CameraFrames per camera (see load_camera_frames).
+        :param tolerance_ns: Largest timestamp difference to the reference frame; half the
+                             reference camera's median frame interval by default.
+        :param reference_serial: Camera the sets are built around; the one with most frames by default.
+        """
+        if not cameras:
+            raise ValueError("No camera frame timestamps to align")
+        self.cameras = cameras
+        self.serial_numbers = [camera.serial_number for camera in cameras]
+        if reference_serial is None:
+            self.reference = int(np.argmax([len(camera.timestamp_ns) for camera in cameras]))
+        elif reference_serial in self.serial_numbers:
+            self.reference = self.serial_numbers.index(reference_serial)
+        else:
+            raise ValueError(f"Camera {reference_serial} not in session cameras {self.serial_numbers}")
+        self.timestamp_ns = cameras[self.reference].timestamp_ns
+        if tolerance_ns is None:
+            if len(self.timestamp_ns) < 2:
+                raise ValueError("The reference camera needs two frames to derive a tolerance")
+            tolerance_ns = int(np.median(np.diff(self.timestamp_ns)) // 2)
+        self.tolerance_ns = tolerance_ns
+        # matches[s, c]: row of camera c's frame in set s, -1 if the camera has none.
+        self.matches = np.empty((len(self.timestamp_ns), len(cameras)), dtype=np.int64)
+        for c, camera in enumerate(cameras):
+            if c == self.reference:
+                self.matches[:, c] = np.arange(len(self.timestamp_ns))
+            else:
+                self.matches[:, c] = match_nearest(self.timestamp_ns, camera.timestamp_ns, tolerance_ns)
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ns)
+
+    def offsets_ns(self) -> np.ndarray:
+        """:return: (sets, cameras) timestamp of each matched frame minus the reference's, 0 if unmatched."""
+        offsets = np.zeros(self.matches.shape, dtype=np.int64)
+        for c, camera in enumerate(self.cameras):
+            matched = self.matches[:, c] >= 0
+            offsets[matched, c] = camera.timestamp_ns[self.matches[matched, c]] - self.timestamp_ns[matched]
+        return offsets
+
+    def to_records(self) -> np.ndarray:
+        """
+        :return: Structured array with the FRAME_SETS record fields (see fields()).
+        """
+        records = np.zeros(len(self), dtype=numpy_dtype(self.fields()))
+        matched = self.matches >= 0
+        records["timestamp_ns"] = self.timestamp_ns
+        records["cameras_matched"] = matched.sum(axis=1)
+        records["spread_ns"] = _spread_ns(matched, self.offsets_ns())
+        for c, camera in enumerate(self.cameras):
+            rows = self.matches[:, c]
+            if len(camera.timestamp_ns) == 0:
+                records[f"frame_{camera.serial_number}"] = _NO_MATCH
+                records[f"part_{camera.serial_number}"] = _NO_MATCH
+                continue
+            # Unmatched rows (-1) index row 0 and are then masked.
+            safe_rows = np.maximum(rows, 0)
+            records[f"frame_{camera.serial_number}"] = np.where(rows >= 0, camera.frame_index[safe_rows], _NO_MATCH)
+            records[f"part_{camera.serial_number}"] = np.where(rows >= 0, camera.part[safe_rows], _NO_MATCH)
+        return records
+
+    def fields(self) -> list:
+        fields = [
+            ("timestamp_ns", "i8"),     # Reference camera image timestamp.
+            ("cameras_matched", "u1"),  # Cameras with a frame in the set, reference included.
+            ("spread_ns", "i8"),        # Latest minus earliest timestamp of the set's frames.
+        ]
+        for serial_number in self.serial_numbers:
+            fields.append((f"frame_{serial_number}", "i8"))  # SVO frame number, -1 if unmatched.
+            fields.append((f"part_{serial_number}", "i2"))   # File part of that frame, -1 if unmatched.
+        return fields
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the frame sets as a record file (read back with open_frame_sets()).
+        """
+        records = self.to_records()
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(build_header(FRAME_SETS_KIND, FRAME_SETS_VERSION, self.fields(), record_count=len(records)))
+            f.write(records.tobytes())
+        os.replace(temp_path, file_path)
+
+    def report(self, window_seconds: float = 60.0) -> dict:
+        """
+        :param window_seconds: Length of the windows the drift is averaged over.
+        :return: Set completeness, per-camera unmatched frames and per-pair skew statistics, with the
+                 drift as a fitted slope (ppm) and as mean skew per window.
+        """
+        matched = self.matches >= 0
+        offsets = self.offsets_ns()
+        complete = matched.all(axis=1)
+        elapsed_s = (self.timestamp_ns - self.timestamp_ns[0]) / 1e9 if len(self) else np.empty(0)
+        spread = _spread_ns(matched[complete], offsets[complete])
+        report = {
+            "reference": self.serial_numbers[self.reference],
+            "tolerance_ms": self.tolerance_ns / 1e6,
+            "duration_s": float(elapsed_s[-1]) if len(self) else 0.0,
+            "frame_sets": len(self),
+            "complete_sets": int(complete.sum()),
+            "complete_spread_ms": _stats_ms(spread),
+            "cameras": [],
+            "pairs": [],
+        }
+        for c, camera in enumerate(self.cameras):
+            matched_count = int(matched[:, c].sum())
+            report["cameras"].append({
+                "serial_number": camera.serial_number,
+                "frames": len(camera.timestamp_ns),
+                "matched": matched_count,
+                "unmatched": len(camera.timestamp_ns) - matched_count,
+            })
+        for a in range(len(self.cameras)):
+            for b in range(a + 1, len(self.cameras)):
+                both = matched[:, a] & matched[:, b]
+                skew = (offsets[both, b] - offsets[both, a]).astype(np.float64)
+                pair = {"cameras": [self.serial_numbers[a], self.serial_numbers[b]], "count": len(skew),
+                        "mean_ms": None, "std_ms": None, "abs_ms": _stats_ms(np.abs(skew)),
+                        "drift_ppm": None, "windows": []}
+                if len(skew):
+                    pair["mean_ms"] = float(skew.mean()) / 1e6
+                    pair["std_ms"] = float(skew.std()) / 1e6
+                    t = elapsed_s[both]
+                    if len(skew) > 1 and t[-1] > t[0]:
+                        # Skew change in ns per second of recording = parts per billion; / 1e3 for ppm.
+                        pair["drift_ppm"] = float(np.polyfit(t, skew, 1)[0]) / 1e3
+                    window = (t // window_seconds).astype(np.int64)
+                    counts = np.bincount(window)
+                    sums = np.bincount(window, weights=skew)
+                    for w in np.flatnonzero(counts):
+                        pair["windows"].append({"start_s": float(w * window_seconds), "count": int(counts[w]),
+                                                "mean_ms": sums[w] / counts[w] / 1e6})
+                report["pairs"].append(pair)
+        return report
+
+
+def open_frame_sets(file_path: str):
+    """
+    Maps a frame_sets.bin file read-only.
+    :return: np.memmap of records; fields as in FrameSets.fields().
+    """
+    return open_records(file_path, FRAME_SETS_KIND, FRAME_SETS_VERSION)
+
+
+def _svo_directory(session_dir: str) -> str:
+    svo_dir = os.path.join(session_dir, "svo2")
+    return svo_dir if os.path.isdir(svo_dir) else session_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build synchronized multi-camera frame sets for a session "
+                                                 "and report the timestamp skew between cameras.")
+    parser.add_argument("session_dir", help="Session folder (or its svo2 folder) with camera_<serial>.frames sidecars.")
+    parser.add_argument("--tolerance-ms", type=float, default=None,
+                        help="Largest distance to the reference frame (default: half a frame interval).")
+    parser.add_argument("--reference", type=int, default=None, help="Serial number of the reference camera.")
+    parser.add_argument("--window", type=float, default=60.0, help="Drift window in seconds.")
+    parser.add_argument("--no-write", action="store_true",
+                        help=f"Only print the report, do not write {FRAME_SETS_FILENAME} and {ALIGNMENT_REPORT_FILENAME}.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.session_dir):
+        print(f"❌ Session folder not found: {args.session_dir}")
+        sys.exit(1)
+    cameras = load_camera_frames(_svo_directory(args.session_dir))
+    if not cameras:
+        print(f"❌ No frame timestamp sidecars found in {args.session_dir}.")
+        sys.exit(1)
+    tolerance_ns = None if args.tolerance_ms is None else int(args.tolerance_ms * 1e6)
+    frame_sets = FrameSets(cameras, tolerance_ns, args.reference)
+    report = frame_sets.report(args.window)
+
+    complete = report["complete_sets"] / max(1, report["frame_sets"]) * 100
+    print(f"📷 {len(cameras)} cameras, reference {report['reference']}: {report['frame_sets']} frame sets over "
+          f"{report['duration_s']:.1f} s, {complete:.2f} % complete (tolerance {report['tolerance_ms']:.2f} ms)")
+    print(f"\n{'camera':<12} {'frames':>9} {'matched':>9} {'unmatched':>10}")
+    for camera in report["cameras"]:
+        print(f"{camera['serial_number']:<12} {camera['frames']:>9} {camera['matched']:>9} {camera['unmatched']:>10}")
+    print(f"\n{'pair':<24} {'sets':>9} {'mean ms':>9} {'std ms':>8} {'p95 |ms|':>9} {'max |ms|':>9} "
+          f"{'drift ppm':>10} {'first→last window ms':>22}")
+    for pair in report["pairs"]:
+        if not pair["count"]:
+            print(f"{pair['cameras'][0]}-{pair['cameras'][1]:<15} {0:>9}")
+            continue
+        drift = "-" if pair["drift_ppm"] is None else f"{pair['drift_ppm']:.2f}"
+        windows = f"{pair['windows'][0]['mean_ms']:.3f} → {pair['windows'][-1]['mean_ms']:.3f}"
+        print(f"{str(pair['cameras'][0]) + '-' + str(pair['cameras'][1]):<24} {pair['count']:>9} "
+              f"{pair['mean_ms']:>9.3f} {pair['std_ms']:>8.3f} {pair['abs_ms']['p95']:>9.3f} "
+              f"{pair['abs_ms']['max']:>9.3f} {drift:>10} {windows:>22}")
+
+    if not args.no_write:
+        frame_sets.save(os.path.join(args.session_dir, FRAME_SETS_FILENAME))
+        report_path = os.path.join(args.session_dir, ALIGNMENT_REPORT_FILENAME)
+        with open(report_path + ".tmp", "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(report_path + ".tmp", report_path)
+        print(f"\n💾 Frame sets written to {os.path.join(args.session_dir, FRAME_SETS_FILENAME)}")
+
+
+if __name__ == "__main__":
+    main()
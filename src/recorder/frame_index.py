@@ -0,0 +1,87 @@
+import os
+import struct
+import numpy as np
+from .record_file import build_header, numpy_dtype, open_records, RECORD_COUNT_OFFSET
+
+FRAME_INDEX_KIND = "frames"
+FRAME_INDEX_VERSION = 1
+FRAME_INDEX_SUFFIX = ".frames"
+
+# One record per grab() call. frame_index is the SVO frame number the grab produced (or would have
+# produced, for failed grabs); grab_status is the sl.ERROR_CODE value, 0 for success.
+FRAME_RECORD_FIELDS = [
+    ("frame_index", "u8"),
+    ("camera_timestamp_ns", "i8"),  # Image timestamp reported by the camera, 0 if the grab failed.
+    ("host_monotonic_ns", "i8"),    # time.monotonic_ns() right after grab() returned.
+    ("grab_status", "i4"),
+]
+_COUNT = struct.Struct("<q")
+
+
+class FrameTimestampSidecar:
+    def __init__(self, file_path: str, initial_capacity: int = 18000, sync_every: int = 300):
+        """
+        Per-camera frame timestamp index written next to the SVO file.
+        Records live in a preallocated np.memmap that doubles in size when full, so appending
+        is a single array store; the header's record count is refreshed every `sync_every` frames,
+        so an interrupted recording still leaves a readable index.
+        :param file_path: Output file (conventionally camera_<serial>.frames).
+        :param initial_capacity: Records preallocated up front (18000 = 10 min at 30 fps).
+        :param sync_every: Frames between header record-count updates.
+        """
+        self.file_path = file_path
+        self.sync_every = sync_every
+        self.dtype = numpy_dtype(FRAME_RECORD_FIELDS)
+        header = build_header(FRAME_INDEX_KIND, FRAME_INDEX_VERSION, FRAME_RECORD_FIELDS, record_count=0)
+        self.header_size = len(header)
+        with open(file_path, "wb") as f:
+            f.write(header)
+        self._fd = os.open(file_path, os.O_RDWR)
+        self.capacity = 0
+        self.count = 0
+        self._records = None
+        self._map(max(1, initial_capacity))
+
+    def _map(self, capacity: int) -> None:
+        if self._records is not None:
+            self._records.flush()
+            self._records = None
+        os.ftruncate(self._fd, self.header_size + capacity * self.dtype.itemsize)
+        self._records = np.memmap(self.file_path, dtype=self.dtype, mode="r+",
+                                  offset=self.header_size, shape=(capacity,))
+        self.capacity = capacity
+
+    def append(self, frame_index: int, camera_timestamp_ns: int, host_monotonic_ns: int, grab_status: int) -> None:
+        """
+        Records one grab. Called from the grab thread; amortised O(1).
+        """
+        if self.count == self.capacity:
+            self._map(self.capacity * 2)
+            self._sync_count()
+        self._records[self.count] = (frame_index, camera_timestamp_ns, host_monotonic_ns, grab_status)
+        self.count += 1
+        if self.count % self.sync_every == 0:
+            self._sync_count()
+
+    def _sync_count(self) -> None:
+        os.pwrite(self._fd, _COUNT.pack(self.count), RECORD_COUNT_OFFSET)
+
+    def close(self) -> None:
+        """
+        Flushes the records, trims the preallocated tail and closes the file.
+        """
+        if self._records is None:
+            return
+        self._records.flush()
+        self._records = None
+        self._sync_count()
+        os.ftruncate(self._fd, self.header_size + self.count * self.dtype.itemsize)
+        os.close(self._fd)
+
+
+def open_frame_index(file_path: str):
+    """
+    Maps a frame timestamp sidecar read-only (zero-copy). Works on files still being written.
+    :return: np.memmap of records with the fields of FRAME_RECORD_FIELDS.
+    """
+    return open_records(file_path, FRAME_INDEX_KIND, FRAME_INDEX_VERSION)
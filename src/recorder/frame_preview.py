@@ -0,0 +1,74 @@
+import threading
+import time
+
+
+class PreviewSlot:
+    def __init__(self, serial_number: int, buffers: list, fps: float = 2.0):
+        """
+        Latest-frame handoff from a camera grab thread to a viewer, triple-buffered: the grab thread
+        fills the buffer it owns and publishes it by swapping it with the shared "latest" slot, the
+        viewer takes the latest frame by swapping it with the buffer it owns. Neither side ever
+        touches the other's buffer, frames are never copied between buffers, and the grab thread
+        never waits: if the viewer holds the swap lock, that preview frame is skipped.
+        :param serial_number: Camera the previews come from.
+        :param buffers: Three (buffer, image) pairs preallocated by the camera backend: `buffer` is
+                        what the backend retrieves into, `image` the BGRA array view of its memory.
+        :param fps: Maximum preview frames per second taken from the grab thread.
+        """
+        if len(buffers) != 3:
+            raise ValueError(f"PreviewSlot needs 3 buffers, got {len(buffers)}")
+        self.serial_number = serial_number
+        self.buffers = buffers
+        self.interval_ns = int(1e9 / fps)
+        self._writing = 0
+        self._latest = 1
+        self._reading = 2
+        self._fresh = False
+        self._lock = threading.Lock()
+        # Statistics, updated by the grab thread only.
+        self.published = 0
+        self.skipped = 0
+        self.retrieve_ns_total = 0
+        self.retrieve_ns_max = 0
+        self.published_at = None  # time.monotonic() of the last published frame.
+
+    def write_buffer(self):
+        """:return: The backend buffer the grab thread may fill (grab thread only)."""
+        return self.buffers[self._writing][0]
+
+    def publish(self, retrieve_ns: int) -> None:
+        """
+        Makes the filled write buffer the latest frame (grab thread only, never blocks).
+        :param retrieve_ns: Time the grab thread spent filling it, for the statistics.
+        """
+        self.retrieve_ns_total += retrieve_ns
+        self.retrieve_ns_max = max(self.retrieve_ns_max, retrieve_ns)
+        if not self._lock.acquire(blocking=False):
+            self.skipped += 1
+            return
+        self._writing, self._latest = self._latest, self._writing
+        self._fresh = True
+        self._lock.release()
+        self.published += 1
+        self.published_at = time.monotonic()
+
+    def latest(self):
+        """
+        Takes the most recent frame (viewer side). The returned array stays valid and unchanged
+        until the next call.
+        :return: BGRA image array, or None if no frame was published since the last call.
+        """
+        with self._lock:
+            if not self._fresh:
+                return None
+            self._reading, self._latest = self._latest, self._reading
+            self._fresh = False
+        return self.buffers[self._reading][1]
+
+    def get_stats(self) -> dict:
+        return {
+            "published": self.published,
+            "skipped": self.skipped,
+            "retrieve_ms_mean": self.retrieve_ns_total / max(1, self.published + self.skipped) / 1e6,
+            "retrieve_ms_max": self.retrieve_ns_max / 1e6,
+        }
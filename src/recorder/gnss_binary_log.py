@@ -0,0 +1,161 @@
+import argparse
+import json
+import math
+import struct
+from .batched_writer import BatchedRecordWriter
+from .record_file import build_header, struct_format, open_records, iter_records
+
+GNSS_LOG_KIND = "gnss"
+GNSS_LOG_VERSION = 1
+GNSS_LOG_FILENAME = "gnss_data.bin"
+GNSS_JSON_FILENAME = "gnss_data.json"
+
+# One fixed-width record per fix. mode/status hold the sl.GNSS_MODE / sl.GNSS_STATUS values.
+GNSS_RECORD_FIELDS = [
+    ("timestamp", "f8"),            # Host time (seconds since epoch) the fix was received.
+    ("fix_timestamp_us", "i8"),     # GNSS time of the fix in microseconds, 0 if unknown.
+    ("latitude", "f8"),
+    ("longitude", "f8"),
+    ("altitude", "f8"),
+    ("mode", "u1"),
+    ("status", "u1"),
+    ("position_covariances", "f8", 9),  # Row-major 3x3, NaN if unknown.
+]
+GNSS_RECORD_STRUCT = struct.Struct(struct_format(GNSS_RECORD_FIELDS))
+_UNKNOWN_COVARIANCES = (math.nan,) * 9
+
+
+def pack_gnss_record(timestamp: float, fix_timestamp_us: int, latitude: float, longitude: float,
+                     altitude: float, mode: int = 0, status: int = 0, position_covariances=None) -> bytes:
+    """
+    :return: One encoded GNSS record.
+    """
+    if position_covariances is None:
+        position_covariances = _UNKNOWN_COVARIANCES
+    return GNSS_RECORD_STRUCT.pack(timestamp, fix_timestamp_us, latitude, longitude, altitude,
+                                   mode, status, *position_covariances)
+
+
+class GNSSBinaryWriter:
+    def __init__(self, file_path: str, **writer_options):
+        """
+        Append-only writer for the binary GNSS log.
+        :param file_path: Output file (conventionally gnss_data.bin).
+        :param writer_options: Forwarded to BatchedRecordWriter (batching and fsync policy).
+        """
+        self.file_path = file_path
+        header = build_header(GNSS_LOG_KIND, GNSS_LOG_VERSION, GNSS_RECORD_FIELDS)
+        self.writer = BatchedRecordWriter(file_path, header=header, **writer_options)
+
+    def append(self, *record) -> None:
+        """
+        Queues one fix; arguments as for pack_gnss_record.
+        """
+        self.writer.append(pack_gnss_record(*record))
+
+    def poll(self) -> None:
+        self.writer.poll()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def open_gnss_log(file_path: str):
+    """
+    Maps a binary GNSS log read-only (zero-copy).
+    :return: np.memmap of records with the fields of GNSS_RECORD_FIELDS.
+    """
+    return open_records(file_path, GNSS_LOG_KIND, GNSS_LOG_VERSION)
+
+
+def iter_gnss_log(file_path: str):
+    """
+    Streams a binary GNSS log as JSON-style dicts, without NumPy.
+    """
+    for values in iter_records(file_path, GNSS_LOG_KIND, GNSS_LOG_VERSION):
+        covariances = list(values[7:16])
+        yield {
+            "timestamp": values[0],
+            "latitude": values[2],
+            "longitude": values[3],
+            "altitude": values[4],
+            "fix_timestamp_us": values[1],
+            "mode": values[5],
+            "status": values[6],
+            "position_covariances": None if all(math.isnan(c) for c in covariances) else covariances,
+        }
+
+
+def _json_float(value):
+    return None if value is None or math.isnan(value) else value
+
+
+def jsonl_to_binary(src_path: str, dst_path: str) -> int:
+    """
+    Converts a gnss_data.json (JSON lines) file into the binary log format, streaming line by line.
+    Fields missing from older sessions are stored as unknown (0 / NaN).
+    :return: Number of records converted.
+    """
+    count = 0
+    writer = GNSSBinaryWriter(dst_path, max_batch_records=4096, max_batch_delay=math.inf)
+    try:
+        with open(src_path, "r") as src:
+            for line in src:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                writer.append(
+                    record["timestamp"],
+                    record.get("fix_timestamp_us") or 0,
+                    math.nan if record.get("latitude") is None else record["latitude"],
+                    math.nan if record.get("longitude") is None else record["longitude"],
+                    math.nan if record.get("altitude") is None else record["altitude"],
+                    record.get("mode") or 0,
+                    record.get("status") or 0,
+                    record.get("position_covariances")
+                )
+                count += 1
+    finally:
+        writer.close()
+    return count
+
+
+def binary_to_jsonl(src_path: str, dst_path: str) -> int:
+    """
+    Converts a binary GNSS log back to JSON lines, keeping full float precision.
+    :return: Number of records converted.
+    """
+    count = 0
+    writer = BatchedRecordWriter(dst_path, max_batch_records=4096, max_batch_delay=math.inf)
+    try:
+        for record in iter_gnss_log(src_path):
+            for key in ("latitude", "longitude", "altitude"):
+                record[key] = _json_float(record[key])
+            writer.append(json.dumps(record).encode() + b"\n")
+            count += 1
+    finally:
+        writer.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert GNSS logs between JSON lines and the binary format.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_binary = subparsers.add_parser("to-binary", help="gnss_data.json -> gnss_data.bin")
+    to_binary.add_argument("src")
+    to_binary.add_argument("dst")
+    to_jsonl = subparsers.add_parser("to-jsonl", help="gnss_data.bin -> gnss_data.json")
+    to_jsonl.add_argument("src")
+    to_jsonl.add_argument("dst")
+    args = parser.parse_args()
+
+    if args.command == "to-binary":
+        count = jsonl_to_binary(args.src, args.dst)
+    else:
+        count = binary_to_jsonl(args.src, args.dst)
+    print(f"✅ Converted {count} GNSS records to {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
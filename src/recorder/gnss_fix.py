@@ -0,0 +1,124 @@
+from datetime import datetime
+
+# gpsd TPV mode -> sl.GNSS_MODE value (UNKNOWN 0, NO_FIX 1, FIX_2D 2, FIX_3D 3), indexed by gpsd mode.
+GPSD_MODE_TO_SL = (
+    0,  # MODE_NOT_SEEN -> UNKNOWN
+    1,  # MODE_NO_FIX -> NO_FIX
+    2,  # MODE_2D -> FIX_2D
+    3,  # MODE_3D -> FIX_3D
+)
+
+# gpsd TPV status -> sl.GNSS_STATUS value (UNKNOWN 0, SINGLE 1, DGNSS 2, PPS 3, RTK_FLOAT 4, RTK_FIX 5),
+# indexed by gpsd status.
+GPSD_STATUS_TO_SL = (
+    0,  # STATUS_UNK -> UNKNOWN
+    1,  # STATUS_GPS -> SINGLE
+    2,  # STATUS_DGPS -> DGNSS
+    5,  # STATUS_RTK_FIX -> RTK_FIX
+    4,  # STATUS_RTK_FLT -> RTK_FLOAT
+    1,  # STATUS_DR -> SINGLE
+    2,  # STATUS_GNSSDR -> DGNSS
+    0,  # STATUS_TIME -> UNKNOWN
+    0,  # STATUS_SIM -> UNKNOWN
+    1,  # STATUS_PPS_FIX -> SINGLE
+)
+
+# sl.GNSS_MODE / sl.GNSS_STATUS member names, indexed by value (for display without the ZED SDK).
+SL_GNSS_MODE_NAMES = ("UNKNOWN", "NO_FIX", "FIX_2D", "FIX_3D")
+SL_GNSS_STATUS_NAMES = ("UNKNOWN", "SINGLE", "DGNSS", "PPS", "RTK_FLOAT", "RTK_FIX")
+
+
+def parse_gpsd_time(value) -> int:
+    """
+    :param value: gpsd "time" field, an ISO 8601 UTC string (e.g. 2024-05-01T12:00:00.000Z) or
+                  seconds since the epoch in older protocol versions.
+    :return: Microseconds since the epoch.
+    """
+    if isinstance(value, str):
+        # fromisoformat is much cheaper than strptime, but only accepts the trailing "Z" from
+        # Python 3.11 (JetPack ships 3.8 / 3.10), and before that only 3 or 6 fraction digits.
+        try:
+            return int(datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+                       .timestamp() * 1000000)
+        except ValueError:
+            # Other fraction lengths; %z takes "Z" too.
+            return int(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z").timestamp() * 1000000)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000000)
+    return int(value * 1000000)
+
+
+class GNSSFix:
+    __slots__ = ("timestamp_us", "latitude", "longitude", "altitude", "mode", "status", "eph", "epv")
+
+    def __init__(self, timestamp_us: int, latitude: float, longitude: float, altitude: float,
+                 mode: int = 0, status: int = 0, eph: float = 0.0, epv: float = 0.0):
+        """
+        Compact GNSS fix as queued by GPSDReader; converted to sl.GNSSData only on demand.
+        :param timestamp_us: GNSS fix time in microseconds since the epoch.
+        :param latitude: Latitude in degrees.
+        :param longitude: Longitude in degrees.
+        :param altitude: Altitude above mean sea level in meters.
+        :param mode: sl.GNSS_MODE value.
+        :param status: sl.GNSS_STATUS value.
+        :param eph: Estimated horizontal position error in meters.
+        :param epv: Estimated vertical position error in meters.
+        """
+        self.timestamp_us = timestamp_us
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.mode = mode
+        self.status = status
+        self.eph = eph
+        self.epv = epv
+
+    @classmethod
+    def from_tpv(cls, tpv: dict) -> "GNSSFix":
+        """
+        Builds a fix from a gpsd TPV report (raw "time" string, see parse_gpsd_time).
+        Raises KeyError / TypeError / ValueError on reports without a usable position.
+        """
+        mode = tpv["mode"]
+        status = tpv.get("status", 0)
+        return cls(
+            parse_gpsd_time(tpv["time"]),
+            tpv["lat"],
+            tpv["lon"],
+            tpv["altMSL"],
+            GPSD_MODE_TO_SL[mode] if 0 <= mode < len(GPSD_MODE_TO_SL) else 0,
+            GPSD_STATUS_TO_SL[status] if 0 <= status < len(GPSD_STATUS_TO_SL) else 0,
+            tpv["eph"],
+            tpv["epv"],
+        )
+
+    @property
+    def position_covariances(self) -> list:
+        """
+        :return: Row-major 3x3 position covariance, from the horizontal / vertical error estimates.
+        """
+        horizontal = self.eph * self.eph
+        return [horizontal, 0.0, 0.0, 0.0, horizontal, 0.0, 0.0, 0.0, self.epv * self.epv]
+
+    def to_sl_gnss_data(self):
+        """
+        Converts the fix to sl.GNSSData, e.g. to feed the ZED positional tracking fusion.
+        The ZED SDK is only imported here, so GNSS-only logging never loads it.
+        """
+        import pyzed.sl as sl
+        gnss_data = sl.GNSSData()
+        gnss_data.set_coordinates(self.latitude, self.longitude, self.altitude, False)
+        gnss_data.longitude_std = 0.001
+        gnss_data.latitude_std = 0.001
+        gnss_data.altitude_std = 1.0
+        gnss_data.gnss_mode = self.mode
+        gnss_data.gnss_status = self.status
+        gnss_data.position_covariances = self.position_covariances
+        ts = sl.Timestamp()
+        ts.set_microseconds(self.timestamp_us)
+        gnss_data.ts = ts
+        return gnss_data
+
+    def __repr__(self) -> str:
+        return (f"GNSSFix(timestamp_us={self.timestamp_us}, latitude={self.latitude}, longitude={self.longitude}, "
+                f"altitude={self.altitude}, mode={self.mode}, status={self.status})")
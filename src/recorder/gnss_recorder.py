@@ -1,79 +1,162 @@
+import logging
 import os
-import time
+import math
 import threading
 import json
-import pyzed.sl as sl
 from .gpsd_reader import GPSDReader
+from .batched_writer import BatchedRecordWriter, FSYNC_NONE
+from .gnss_binary_log import GNSSBinaryWriter, GNSS_LOG_FILENAME, GNSS_JSON_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# Output formats for GNSSRecorder.
+LOG_FORMAT_JSON = "json"      # gnss_data.json, one rounded JSON record per line (historical format).
+LOG_FORMAT_BINARY = "binary"  # gnss_data.bin, fixed-width full-precision records (see gnss_binary_log).
+LOG_FORMAT_BOTH = "both"
+LOG_FORMATS = (LOG_FORMAT_JSON, LOG_FORMAT_BINARY, LOG_FORMAT_BOTH)
 
 class GNSSRecorder:
-    def __init__(self, session_dir: str, port: str = "COM3", baudrate: int = 9600):
+    def __init__(self, session_dir: str, port: str = "COM3", baudrate: int = 9600,
+                 gpsd_host: str = "127.0.0.1", gpsd_port: int = 2947,
+                 queue_size: int = 256, overflow_policy: str = "drop_oldest", poll_timeout: float = 1.0,
+                 batch_records: int = 64, batch_delay: float = 0.5, fsync_policy: str = FSYNC_NONE,
+                 fsync_interval_ms: int = 1000, log_format: str = LOG_FORMAT_JSON):
         """
         Initializes the GNSS sensor recorder.
         :param session_dir: Directory to store GNSS JSON data (should be the gnss folder).
         :param port: Port for the GNSS sensor.
         :param baudrate: Baud rate for the GNSS sensor.
+        :param gpsd_host: Host of the GPSD daemon (or replay server) serving the sensor.
+        :param gpsd_port: Port of the GPSD daemon.
+        :param queue_size: Capacity of the reader's fix queue.
+        :param overflow_policy: Fix queue overflow policy (see fix_buffer.OVERFLOW_POLICIES).
+        :param poll_timeout: Longest time the logging thread sleeps waiting for a fix before re-checking stop.
+        :param batch_records: Records buffered in memory before they are committed to disk in one write.
+        :param batch_delay: Maximum age in seconds of a buffered record before it is committed.
+        :param fsync_policy: Durability policy (see batched_writer.FSYNC_POLICIES).
+        :param fsync_interval_ms: Minimum spacing between fsyncs with the "interval" policy.
+        :param log_format: "json", "binary" or "both".
         """
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unknown GNSS log format {log_format!r}, expected one of {LOG_FORMATS}")
         self.session_dir = session_dir
         self.port = port
         self.baudrate = baudrate
         self._stop = False
         self.thread = None
-        self.file_path = os.path.join(session_dir, "gnss_data.json")
+        self.log_format = log_format
+        self.file_path = os.path.join(session_dir, GNSS_JSON_FILENAME)
+        self.binary_file_path = os.path.join(session_dir, GNSS_LOG_FILENAME)
         self.file = None
+        self.binary_log = None
+        self.poll_timeout = poll_timeout
+        self.writer_options = {
+            "max_batch_records": batch_records,
+            "max_batch_delay": batch_delay,
+            "fsync_policy": fsync_policy,
+            "fsync_interval_ms": fsync_interval_ms,
+            "checksum": True,  # Running SHA-256 for the session manifest.
+        }
+        self.records_written = 0
+        self.first_fix_time = None  # Host receive times of the first and last written fixes.
+        self.last_fix_time = None
         # Create an instance of GPSDReader to interface with the GNSS sensor.
-        self.gpsd_reader = GPSDReader()
+        self.gpsd_reader = GPSDReader(gpsd_host, gpsd_port, queue_size=queue_size, overflow_policy=overflow_policy)
 
     def open_sensor(self) -> bool:
         """
         Opens and initializes the GNSS sensor via the GPSDReader.
         :return: True if successful, False otherwise.
         """
-        print(f"🔧 Opening GNSS sensor on port {self.port} at {self.baudrate} baud.")
+        logger.info(f"🔧 Opening GNSS sensor on port {self.port} at {self.baudrate} baud.")
         if self.gpsd_reader.initialize() == -1:
-            print("❌ Failed to initialize GPSDReader.")
+            logger.error("❌ Failed to initialize GPSDReader.")
             return False
         return True
 
     def start_recording(self) -> bool:
         """
-        Opens the output file for GNSS data.
-        :return: True if the file was opened successfully, False otherwise.
+        Opens the output file(s) for GNSS data.
+        :return: True if the files were opened successfully, False otherwise.
         """
         try:
-            self.file = open(self.file_path, "w")
+            if self.log_format != LOG_FORMAT_BINARY:
+                self.file = BatchedRecordWriter(self.file_path, **self.writer_options)
+                logger.info(f"✅ GNSS sensor recording to {self.file_path}")
+            if self.log_format != LOG_FORMAT_JSON:
+                self.binary_log = GNSSBinaryWriter(self.binary_file_path, **self.writer_options)
+                logger.info(f"✅ GNSS sensor recording to {self.binary_file_path}")
         except Exception as e:
-            print(f"❌ Failed to open GNSS data file: {e}")
+            logger.error(f"❌ Failed to open GNSS data file: {e}")
+            self._close_outputs()
             return False
-        print(f"✅ GNSS sensor recording to {self.file_path}")
         return True
 
+    def _close_outputs(self) -> None:
+        for output in (self.file, self.binary_log):
+            if output is not None:
+                output.close()
+
     def _log_data(self):
         """
-        Continuously grabs GNSS data using GPSDReader and writes each record in JSON format.
+        Waits on the GPSDReader fix queue and writes every queued record in JSON format.
+        The thread wakes as soon as fixes arrive, so receivers faster than 1 Hz are logged in full;
+        records are group-committed by the BatchedRecordWriter rather than flushed one by one.
         """
+        # Wake at least as often as the writer's commit deadline so idle periods still get flushed.
+        timeout = min(self.poll_timeout, self.writer_options["max_batch_delay"])
         while not self._stop:
-            status, input_gnss = self.gpsd_reader.grab()
-            if status == sl.ERROR_CODE.SUCCESS:
+            self._write_batch(self.gpsd_reader.grab_batch(timeout=timeout))
+            for output in (self.file, self.binary_log):
+                if output is not None:
+                    output.poll()
+        # Flush whatever arrived between the last wake-up and the stop request.
+        self._write_batch(self.gpsd_reader.grab_batch(timeout=0))
+        self._close_outputs()
+        stats = self.gpsd_reader.get_queue_stats()
+        logger.info(f"🛑 GNSS sensor recording stopped ({self.records_written} fixes written, "
+                    f"{stats['dropped']} dropped on queue overflow).")
+
+    def _write_batch(self, batch: list) -> None:
+        if batch:
+            if self.first_fix_time is None:
+                self.first_fix_time = batch[0][0]
+            self.last_fix_time = batch[-1][0]
+        for received_at, fix in batch:
+            latitude, longitude, altitude = fix.latitude, fix.longitude, fix.altitude
+            if self.file is not None:
                 record = {
-                    "timestamp": time.time(),
-                    "latitude": None,
-                    "longitude": None,
-                    "altitude": None
+                    "timestamp": received_at,
+                    "latitude": None if latitude is None else round(latitude, 6),
+                    "longitude": None if longitude is None else round(longitude, 6),
+                    "altitude": None if altitude is None else round(altitude, 2)
                 }
-                try:
-                    # Retrieve coordinates; adjust the 'False' parameter as needed.
-                    latitude, longitude, altitude = input_gnss.get_coordinates(False)
-                    record["latitude"] = round(latitude, 6)
-                    record["longitude"] = round(longitude, 6)
-                    record["altitude"] = round(altitude, 2)
-                except Exception as e:
-                    print("⚠️ Error reading GNSS coordinates:", e)
                 json_record = json.dumps(record)
-                self.file.write(json_record + "\n")
-                self.file.flush()
-            time.sleep(1)  # Adjust this delay to match the GNSS sensor's update rate if necessary.
-        self.file.close()
-        print("🛑 GNSS sensor recording stopped.")
+                self.file.append(json_record.encode() + b"\n")
+            if self.binary_log is not None:
+                self.binary_log.append(
+                    received_at,
+                    fix.timestamp_us,
+                    math.nan if latitude is None else latitude,
+                    math.nan if longitude is None else longitude,
+                    math.nan if altitude is None else altitude,
+                    fix.mode,
+                    fix.status,
+                    fix.position_covariances
+                )
+            self.records_written += 1
+
+    def get_output_checksums(self) -> list:
+        """
+        Safe to call while logging.
+        :return: (file path, bytes committed, SHA-256 of those bytes) for each open output file.
+        """
+        checksums = []
+        if self.file is not None:
+            checksums.append((self.file_path, *self.file.get_checksum()))
+        if self.binary_log is not None:
+            checksums.append((self.binary_file_path, *self.binary_log.writer.get_checksum()))
+        return checksums
 
     def start_logging(self) -> None:
         """
@@ -84,9 +167,17 @@ class GNSSRecorder:
 
     def stop(self) -> None:
         """
-        Signals the logging thread to stop.
+        Signals the logging thread to stop and shuts down the GPSD reader thread.
         """
         self._stop = True
+        self.gpsd_reader.stop_thread()
+
+    def close(self) -> None:
+        """
+        Releases a sensor that was opened but never started logging.
+        """
+        self.gpsd_reader.stop_thread()
+        self._close_outputs()
 
     def join(self) -> None:
         """
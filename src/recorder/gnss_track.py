@@ -0,0 +1,126 @@
+import json
+import os
+from typing import NamedTuple
+import numpy as np
+from .gnss_binary_log import open_gnss_log, GNSS_LOG_FILENAME, GNSS_JSON_FILENAME
+
+# Bit flags returned with every interpolated position.
+FLAG_OK = 0
+FLAG_OUT_OF_RANGE = 1  # Query time is before the first or after the last fix; position is NaN.
+FLAG_GAP = 2           # The bracketing fixes are further apart than max_gap; position is interpolated anyway.
+FLAG_NO_DATA = 4       # The track is empty; position is NaN.
+
+
+class TrackPositions(NamedTuple):
+    latitude: np.ndarray
+    longitude: np.ndarray
+    altitude: np.ndarray
+    flags: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean mask of positions interpolated between two close fixes."""
+        return self.flags == FLAG_OK
+
+
+class GNSSTrack:
+    def __init__(self, timestamps, latitude, longitude, altitude):
+        """
+        In-memory GNSS track answering bulk position queries.
+        :param timestamps: Fix times in seconds (any order; sorted here).
+        :param latitude: Latitudes in degrees, same length as timestamps.
+        :param longitude: Longitudes in degrees.
+        :param altitude: Altitudes in metres.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        columns = [np.asarray(c, dtype=np.float64) for c in (latitude, longitude, altitude)]
+        keep = np.isfinite(timestamps) & np.isfinite(columns[0]) & np.isfinite(columns[1])
+        order = np.argsort(timestamps[keep], kind="stable")
+        self.timestamps = np.ascontiguousarray(timestamps[keep][order])
+        self.latitude, self.longitude, self.altitude = (np.ascontiguousarray(c[keep][order]) for c in columns)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_binary_log(cls, file_path: str, time_field: str = "timestamp") -> "GNSSTrack":
+        """
+        Loads a gnss_data.bin log.
+        :param time_field: "timestamp" (host receive time, seconds) or "fix_timestamp_us" (GNSS time).
+        """
+        records = open_gnss_log(file_path)
+        timestamps = records[time_field].astype(np.float64)
+        if time_field == "fix_timestamp_us":
+            timestamps = np.where(timestamps > 0, timestamps / 1e6, np.nan)
+        return cls(timestamps, records["latitude"], records["longitude"], records["altitude"])
+
+    @classmethod
+    def from_json_log(cls, file_path: str) -> "GNSSTrack":
+        """
+        Loads a gnss_data.json (JSON lines) log; missing coordinates are skipped.
+        """
+        timestamps, latitude, longitude, altitude = [], [], [], []
+        with open(file_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record.get("latitude") is None or record.get("longitude") is None:
+                    continue
+                timestamps.append(record["timestamp"])
+                latitude.append(record["latitude"])
+                longitude.append(record["longitude"])
+                altitude.append(np.nan if record.get("altitude") is None else record["altitude"])
+        return cls(timestamps, latitude, longitude, altitude)
+
+    @classmethod
+    def from_session(cls, gnss_dir: str) -> "GNSSTrack":
+        """
+        Loads a session's gnss folder, preferring the binary log over the JSON one.
+        """
+        binary_path = os.path.join(gnss_dir, GNSS_LOG_FILENAME)
+        if os.path.exists(binary_path):
+            return cls.from_binary_log(binary_path)
+        return cls.from_json_log(os.path.join(gnss_dir, GNSS_JSON_FILENAME))
+
+    def interpolate(self, query_times, max_gap: float = 1.0) -> TrackPositions:
+        """
+        Linearly interpolates positions at many times at once.
+        :param query_times: Times in seconds, in the same time base as the track (any order).
+                            ZED image timestamps in nanoseconds must be divided by 1e9 first.
+        :param max_gap: Fixes further apart than this (seconds) flag the positions between them with FLAG_GAP.
+        :return: TrackPositions with one entry per query time.
+        """
+        query_times = np.asarray(query_times, dtype=np.float64)
+        n = len(self.timestamps)
+        if n == 0:
+            nan = np.full(query_times.shape, np.nan)
+            return TrackPositions(nan, nan.copy(), nan.copy(), np.full(query_times.shape, FLAG_NO_DATA, np.uint8))
+
+        t = self.timestamps
+        if n == 1:
+            lo = hi = np.zeros(query_times.shape, dtype=np.intp)
+        else:
+            # t[lo] <= q <= t[hi] for every in-range query.
+            hi = np.clip(np.searchsorted(t, query_times, side="right"), 1, n - 1)
+            lo = hi - 1
+        t0 = t[lo]
+        dt = t[hi] - t0
+        weight = np.zeros(query_times.shape)
+        np.divide(query_times - t0, dt, out=weight, where=dt > 0)
+
+        # Plain linear interpolation; tracks crossing the antimeridian are not unwrapped.
+        latitude = self.latitude[lo] + weight * (self.latitude[hi] - self.latitude[lo])
+        longitude = self.longitude[lo] + weight * (self.longitude[hi] - self.longitude[lo])
+        altitude = self.altitude[lo] + weight * (self.altitude[hi] - self.altitude[lo])
+
+        # Queries landing exactly on a fix (weight 0 or 1) are exact even next to a gap.
+        gap = (dt > max_gap) & (weight > 0) & (weight < 1)
+        flags = np.where(gap, FLAG_GAP, FLAG_OK).astype(np.uint8)
+        out_of_range = (query_times < t[0]) | (query_times > t[-1]) | np.isnan(query_times)
+        flags[out_of_range] = FLAG_OUT_OF_RANGE
+        latitude[out_of_range] = np.nan
+        longitude[out_of_range] = np.nan
+        altitude[out_of_range] = np.nan
+        return TrackPositions(latitude, longitude, altitude, flags)
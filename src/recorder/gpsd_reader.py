@@ -1,136 +1,220 @@
+import logging
 import threading
 import time
-import pyzed.sl as sl
 from gpsdclient import GPSDClient
-import random
-import datetime
+from .fix_buffer import FixRingBuffer, DROP_OLDEST
+from .gnss_fix import GNSSFix
+
+logger = logging.getLogger(__name__)
+
+# Reader states.
+STATE_IDLE = "idle"                        # initialize() has not been called yet.
+STATE_CONNECTING = "connecting"            # Opening the GPSD connection, no fix acquired yet.
+STATE_WAITING_FOR_FIX = "waiting_for_fix"  # Connected, receiving reports, no fix acquired yet.
+STATE_STREAMING = "streaming"              # Fixes are flowing.
+STATE_DEGRADED = "degraded"                # A fix was acquired before but is currently lost (no-fix
+                                           # reports, silence or a dropped connection being retried).
+STATE_STOPPED = "stopped"
 
 
 class GPSDReader:
-    def __init__(self):
+    def __init__(self, host: str = "127.0.0.1", port: int = 2947, queue_size: int = 256,
+                 overflow_policy: str = DROP_OLDEST, read_timeout: float = 5.0,
+                 backoff_initial: float = 0.5, backoff_max: float = 30.0):
+        """
+        Reads TPV reports from GPSD and queues every fix for consumers.
+        A single reader thread runs a small state machine (connecting, waiting for fix, streaming,
+        degraded) and reconnects with exponential backoff, so fix loss or a flaky link never spawns
+        extra threads or sockets.
+        :param host: GPSD host.
+        :param port: GPSD port.
+        :param queue_size: Number of fixes buffered between the reader thread and consumers.
+        :param overflow_policy: What to do when consumers fall behind (see fix_buffer.OVERFLOW_POLICIES).
+        :param read_timeout: Seconds without any report before the connection is considered dead.
+        :param backoff_initial: First reconnection delay in seconds.
+        :param backoff_max: Upper bound of the reconnection delay.
+        """
+        self.host = host
+        self.port = port
+        self.read_timeout = read_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
         self.continue_to_grab = True
-        self.new_data = False
-        self.is_initialized = False
-        self.current_gnss_data = None
-        self.is_initialized_mtx = threading.Lock()
+        # Every fix is queued as a (host receive time, GNSSFix) pair so none are lost between polls.
+        # GNSSFix needs no ZED SDK; sl.GNSSData is only built for consumers that ask for it.
+        self.fix_queue = FixRingBuffer(queue_size, overflow_policy)
         self.client = None
-        self.gnss_getter = None
-        self.grab_gnss_data = None
-
-    def initialize(self):
-        try:
-            self.client = GPSDClient(host="127.0.0.1")
-        except:
-            print("No GPSD running .. exit")
-            return -1
-
-        self.grab_gnss_data = threading.Thread(target=self.grabGNSSData)
-        self.grab_gnss_data.start()
-        print("Successfully connected to GPSD")
-        print("Waiting for GNSS fix")
-        received_fix = False
-
-        self.gnss_getter = self.client.dict_stream(convert_datetime=True, filter=["TPV"])
-        while not received_fix:
-            gpsd_data = next(self.gnss_getter)
-            if "class" in gpsd_data and gpsd_data["class"] == "TPV" and "mode" in gpsd_data and gpsd_data["mode"] >= 2:
-                received_fix = True
-        print("Fix found !!!")
-        with self.is_initialized_mtx:
-            self.is_initialized = True
+        self.thread = None
+        self.state = STATE_IDLE
+        self._state_changed = threading.Condition()
+        self._wake = threading.Event()
+        # Metrics.
+        self.started_at = None
+        self.time_to_first_fix = None
+        self.connect_attempts = 0
+        self.connection_losses = 0
+        self.parse_errors = 0
+        self.outages = 0
+        self.last_outage_duration = None
+        self.longest_outage = 0.0
+        self.total_outage_time = 0.0
+        self.last_fix_at = None
+        self.last_fix = None        # Most recent GNSSFix, for status displays.
+        self.fixes_received = 0
+        self._outage_started = None
+
+    def initialize(self, timeout: float = None) -> int:
+        """
+        Starts the reader thread (once) and waits for the first fix.
+        :param timeout: Maximum wait in seconds, None to wait indefinitely.
+        :return: 0 once a fix is streaming, -1 on timeout or if the reader was stopped.
+        """
+        if self.thread is None:
+            self.started_at = time.monotonic()
+            self.thread = threading.Thread(target=self._run, name="gpsd-reader", daemon=True)
+            self.thread.start()
+            logger.info(f"Connecting to GPSD at {self.host}:{self.port}")
+            logger.info("Waiting for GNSS fix")
+        with self._state_changed:
+            self._state_changed.wait_for(lambda: self.state in (STATE_STREAMING, STATE_STOPPED), timeout)
+            if self.state != STATE_STREAMING:
+                return -1
+        logger.info(f"Fix found !!! (after {self.time_to_first_fix:.1f} s)")
         return 0
 
-    def getNextGNSSValue(self):
-        gpsd_data = None
-        while gpsd_data is None:
-            gpsd_data = next(self.gnss_getter)
-
-        if "class" in gpsd_data and gpsd_data["class"] == "TPV" and "mode" in gpsd_data and gpsd_data["mode"] >= 2:
-            current_gnss_data = sl.GNSSData()
-            current_gnss_data.set_coordinates(gpsd_data["lat"], gpsd_data["lon"], gpsd_data["altMSL"], False)
-            current_gnss_data.longitude_std = 0.001
-            current_gnss_data.latitude_std = 0.001
-            current_gnss_data.altitude_std = 1.0
-
-            gpsd_mode = gpsd_data["mode"]
-            sl_mode = sl.GNSS_MODE.UNKNOWN
-
-            if gpsd_mode == 0:  # MODE_NOT_SEEN
-                sl_mode = sl.GNSS_MODE.UNKNOWN
-            elif gpsd_mode == 1:  # MODE_NO_FIX
-                sl_mode = sl.GNSS_MODE.NO_FIX
-            elif gpsd_mode == 2:  # MODE_2D
-                sl_mode = sl.GNSS_MODE.FIX_2D
-            elif gpsd_mode == 3:  # MODE_3D
-                sl_mode = sl.GNSS_MODE.FIX_3D
-
-            sl_status = sl.GNSS_STATUS.UNKNOWN
-            if 'status' in gpsd_data:
-                gpsd_status = gpsd_data["status"]
-                if gpsd_status == 0:  # STATUS_UNK
-                    sl_status = sl.GNSS_STATUS.UNKNOWN
-                elif gpsd_status == 1:  # STATUS_GPS
-                    sl_status = sl.GNSS_STATUS.SINGLE
-                elif gpsd_status == 2:  # STATUS_DGPS
-                    sl_status = sl.GNSS_STATUS.DGNSS
-                elif gpsd_status == 3:  # STATUS_RTK_FIX
-                    sl_status = sl.GNSS_STATUS.RTK_FIX
-                elif gpsd_status == 4:  # STATUS_RTK_FLT
-                    sl_status = sl.GNSS_STATUS.RTK_FLOAT
-                elif gpsd_status == 5:  # STATUS_DR
-                    sl_status = sl.GNSS_STATUS.SINGLE
-                elif gpsd_status == 6:  # STATUS_GNSSDR
-                    sl_status = sl.GNSS_STATUS.DGNSS
-                elif gpsd_status == 7:  # STATUS_TIME
-                    sl_status = sl.GNSS_STATUS.UNKNOWN
-                elif gpsd_status == 8:  # STATUS_SIM
-                    sl_status = sl.GNSS_STATUS.UNKNOWN
-                elif gpsd_status == 9:  # STATUS_PPS_FIX
-                    sl_status = sl.GNSS_STATUS.SINGLE
-
-
-            current_gnss_data.gnss_mode = sl_mode.value
-            current_gnss_data.gnss_status = sl_status.value
-                
-            position_covariance = [
-                gpsd_data["eph"] * gpsd_data["eph"],
-                0.0,
-                0.0,
-                0.0,
-                gpsd_data["eph"] * gpsd_data["eph"],
-                0.0,
-                0.0,
-                0.0,
-                gpsd_data["epv"] * gpsd_data["epv"]
-            ]
-            current_gnss_data.position_covariances = position_covariance
-            timestamp_microseconds = int(gpsd_data["time"].timestamp() * 1000000)
-            ts = sl.Timestamp()
-            ts.set_microseconds(timestamp_microseconds)
-            current_gnss_data.ts = ts
-            return current_gnss_data
-        else:
-            print("Fix lost : GNSS reinitialization")
-            self.initialize()
-            return None
-
-    def grab(self):
-        if self.new_data:
-            self.new_data = False
-            return sl.ERROR_CODE.SUCCESS, self.current_gnss_data
-        return sl.ERROR_CODE.FAILURE, None
-
-    def grabGNSSData(self):
+    def _set_state(self, state: str) -> None:
+        with self._state_changed:
+            if state == self.state:
+                return
+            now = time.monotonic()
+            if state == STATE_DEGRADED and self.state == STATE_STREAMING:
+                self._outage_started = now
+                self.outages += 1
+            elif state == STATE_STREAMING and self._outage_started is not None:
+                duration = now - self._outage_started
+                self._outage_started = None
+                self.last_outage_duration = duration
+                self.longest_outage = max(self.longest_outage, duration)
+                self.total_outage_time += duration
+                logger.info(f"GNSS fix recovered after {duration:.1f} s")
+            elif state == STATE_STREAMING and self.time_to_first_fix is None:
+                self.time_to_first_fix = now - self.started_at
+            self.state = state
+            self._state_changed.notify_all()
+
+    def _has_had_fix(self) -> bool:
+        return self.time_to_first_fix is not None
+
+    def _run(self) -> None:
+        backoff = self.backoff_initial
         while self.continue_to_grab:
-            with self.is_initialized_mtx:
-                if self.is_initialized:
-                    break
-            time.sleep(0.001)
+            self._set_state(STATE_DEGRADED if self._has_had_fix() else STATE_CONNECTING)
+            self.connect_attempts += 1
+            self.client = GPSDClient(host=self.host, port=self.port, timeout=self.read_timeout)
+            try:
+                for gpsd_data in self.client.dict_stream(convert_datetime=False, filter=["TPV"]):
+                    if not self.continue_to_grab:
+                        break
+                    # Any report proves the link is healthy again.
+                    backoff = self.backoff_initial
+                    self._handle_report(gpsd_data)
+            except (OSError, ValueError) as e:
+                # Refused or dropped connections, read timeouts and garbage all end up here.
+                if self.continue_to_grab:
+                    logger.warning(f"GPSD connection problem: {e}")
+            finally:
+                self.client.close()
+            if not self.continue_to_grab:
+                break
+            self.connection_losses += 1
+            if self.state == STATE_STREAMING:
+                logger.warning("Fix lost : GPSD connection dropped, reconnecting")
+            self._set_state(STATE_DEGRADED if self._has_had_fix() else STATE_CONNECTING)
+            self._wake.wait(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+        self._set_state(STATE_STOPPED)
+
+    def _handle_report(self, gpsd_data: dict) -> None:
+        if gpsd_data.get("class") != "TPV" or gpsd_data.get("mode", 0) < 2:
+            if self.state == STATE_STREAMING:
+                logger.warning("Fix lost : waiting for GNSS fix")
+                self._set_state(STATE_DEGRADED)
+            elif self.state == STATE_CONNECTING:
+                self._set_state(STATE_WAITING_FOR_FIX)
+            return
+        try:
+            fix = GNSSFix.from_tpv(gpsd_data)
+        except (KeyError, TypeError, ValueError):
+            # Malformed report (e.g. a fix without eph/epv); skip it rather than kill the reader.
+            self.parse_errors += 1
+            return
+        self.last_fix_at = time.monotonic()
+        self.last_fix = fix
+        self.fixes_received += 1
+        self.fix_queue.put((time.time(), fix))
+        self._set_state(STATE_STREAMING)
 
-        while self.continue_to_grab:
-            self.current_gnss_data = self.getNextGNSSValue()
-            if self.current_gnss_data is not None:
-                self.new_data = True
+    def grab(self):
+        """
+        Non-blocking: pops the oldest queued fix as sl.GNSSData (imports the ZED SDK).
+        :return: (sl.ERROR_CODE.SUCCESS, sl.GNSSData) or (sl.ERROR_CODE.FAILURE, None) if nothing is queued.
+        """
+        import pyzed.sl as sl
+        entry = self.fix_queue.get_nowait()
+        if entry is None:
+            return sl.ERROR_CODE.FAILURE, None
+        return sl.ERROR_CODE.SUCCESS, entry[1].to_sl_gnss_data()
+
+    def grab_blocking(self, timeout: float = None):
+        """
+        Same as grab(), but waits up to `timeout` seconds for a fix to arrive.
+        """
+        import pyzed.sl as sl
+        entry = self.fix_queue.get(timeout)
+        if entry is None:
+            return sl.ERROR_CODE.FAILURE, None
+        return sl.ERROR_CODE.SUCCESS, entry[1].to_sl_gnss_data()
+
+    def grab_batch(self, max_items: int = None, timeout: float = None) -> list:
+        """
+        Waits up to `timeout` seconds for at least one fix, then drains everything queued.
+        :return: List of (host receive time, GNSSFix) pairs in arrival order.
+        """
+        return self.fix_queue.drain(max_items, timeout)
+
+    def get_queue_stats(self) -> dict:
+        """
+        :return: Fix queue counters (pushed, popped, overflows, dropped, ...).
+        """
+        return self.fix_queue.get_stats()
+
+    def get_status(self) -> dict:
+        """
+        :return: Reader state and reconnection metrics.
+        """
+        outage = None
+        if self._outage_started is not None:
+            outage = time.monotonic() - self._outage_started
+        return {
+            "state": self.state,
+            "time_to_first_fix": self.time_to_first_fix,
+            "connect_attempts": self.connect_attempts,
+            "connection_losses": self.connection_losses,
+            "parse_errors": self.parse_errors,
+            "outages": self.outages,
+            "current_outage": outage,
+            "last_outage_duration": self.last_outage_duration,
+            "longest_outage": self.longest_outage,
+            "total_outage_time": self.total_outage_time,
+            "fix_age": None if self.last_fix_at is None else time.monotonic() - self.last_fix_at,
+        }
 
     def stop_thread(self):
         self.continue_to_grab = False
+        self._wake.set()
+        # Closing the socket unblocks a read in progress.
+        if self.client is not None:
+            self.client.close()
+        self.fix_queue.close()
+        if self.thread is None:
+            self._set_state(STATE_STOPPED)
@@ -0,0 +1,270 @@
+import argparse
+import json
+import logging
+import math
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from .logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+VERSION_MESSAGE = {"class": "VERSION", "release": "3.25", "rev": "replay", "proto_major": 3, "proto_minor": 15}
+
+# Scripted event actions, each active for `duration` seconds from `at` (seconds after the stream starts).
+EVENT_FIX_LOSS = "fix_loss"      # TPVs keep flowing with mode 1 (no fix) and no position.
+EVENT_MODE = "mode"              # TPVs report `mode` (e.g. 2 for a 2D fix) instead of the source mode.
+EVENT_STALL = "stall"            # Nothing is sent, connections stay open.
+EVENT_DISCONNECT = "disconnect"  # Clients are dropped; new connections are refused until the window ends.
+EVENT_ACTIONS = (EVENT_FIX_LOSS, EVENT_MODE, EVENT_STALL, EVENT_DISCONNECT)
+
+
+def format_gpsd_time(timestamp: float) -> str:
+    """
+    :return: Time in the ISO 8601 form gpsd uses, e.g. 2024-05-01T12:00:00.000Z.
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def synthetic_tpv(rate_hz: float, center=(48.8566, 2.3522), radius_deg: float = 0.001):
+    """
+    Endless stream of 3D-fix TPV reports driving a circle around `center`.
+    :return: Generator of (seconds since stream start, TPV dict).
+    """
+    i = 0
+    while True:
+        t = i / rate_hz
+        angle = 2 * math.pi * t / 120.0
+        yield t, {
+            "class": "TPV", "device": "/dev/replay", "mode": 3, "status": 1,
+            "lat": center[0] + radius_deg * math.sin(angle),
+            "lon": center[1] + radius_deg * math.cos(angle),
+            "altMSL": 35.0 + math.sin(angle), "eph": 1.5, "epv": 3.0,
+        }
+        i += 1
+
+
+def recorded_tpv(file_path: str):
+    """
+    Reads a recorded stream: either raw gpsd JSON lines (TPV reports are kept) or a gnss_data.json
+    written by GNSSRecorder (converted to 3D-fix TPVs).
+    :return: Generator of (seconds since the first report, TPV dict).
+    """
+    first = None
+    with open(file_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("class") == "TPV":
+                if "time" not in record:
+                    continue
+                t = datetime.strptime(record["time"], "%Y-%m-%dT%H:%M:%S.%fZ").replace(
+                    tzinfo=timezone.utc).timestamp()
+                tpv = record
+            elif "timestamp" in record and record.get("latitude") is not None:
+                t = record["timestamp"]
+                tpv = {
+                    "class": "TPV", "device": "/dev/replay", "mode": record.get("mode") or 3, "status": 1,
+                    "lat": record["latitude"], "lon": record["longitude"],
+                    "altMSL": record.get("altitude") or 0.0, "eph": 1.5, "epv": 3.0,
+                }
+            else:
+                continue
+            if first is None:
+                first = t
+            yield t - first, tpv
+
+
+class GPSDReplayServer:
+    def __init__(self, source, host: str = "127.0.0.1", port: int = 2947, speed: float = 1.0,
+                 events: list = None, restamp: bool = True, loop: bool = False):
+        """
+        Local stand-in for gpsd speaking its JSON protocol: greets clients with VERSION, answers
+        ?WATCH, then streams TPV reports on the source's schedule.
+        :param source: Callable returning an iterator of (seconds since start, TPV dict), e.g.
+                       lambda: synthetic_tpv(200) or lambda: recorded_tpv("gnss_data.json").
+        :param host: Interface to listen on.
+        :param port: TCP port, 0 to pick a free one (see self.port after start()).
+        :param speed: Replay speed multiplier applied to the source schedule.
+        :param events: Scripted events, dicts with "action", "at" and "duration" (and "mode" for EVENT_MODE).
+        :param restamp: Replace each report's "time" with the current time, so replays look live.
+        :param loop: Restart the source when it is exhausted.
+        """
+        for event in events or []:
+            if event["action"] not in EVENT_ACTIONS:
+                raise ValueError(f"Unknown event action {event['action']!r}, expected one of {EVENT_ACTIONS}")
+        self.source = source
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.events = sorted(events or [], key=lambda e: e["at"])
+        self.restamp = restamp
+        self.loop = loop
+        self.reports_sent = 0
+        self.fixes_sent = 0
+        self.event_log = []  # (wall time, "<action> start" / "<action> end")
+        self._clients = []
+        self._clients_lock = threading.Lock()
+        self._running = False
+        self._server_socket = None
+        self._threads = []
+
+    def start(self) -> None:
+        self._server_socket = socket.create_server((self.host, self.port), reuse_port=False)
+        self._server_socket.settimeout(0.2)
+        self.port = self._server_socket.getsockname()[1]
+        self._running = True
+        self.started_at = time.monotonic()
+        for target in (self._accept_loop, self._stream_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🛰️ GPSD replay server listening on {self.host}:{self.port}")
+
+    def stop(self) -> None:
+        self._running = False
+        for thread in self._threads:
+            thread.join()
+        self._server_socket.close()
+        with self._clients_lock:
+            for client in self._clients:
+                client.close()
+            self._clients = []
+
+    def _active_events(self, elapsed: float) -> set:
+        return {e["action"] for e in self.events if e["at"] <= elapsed < e["at"] + e["duration"]}
+
+    def _mode_override(self, elapsed: float):
+        for event in self.events:
+            if event["action"] == EVENT_MODE and event["at"] <= elapsed < event["at"] + event["duration"]:
+                return event["mode"]
+        return None
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                client, _ = self._server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if EVENT_DISCONNECT in self._active_events(time.monotonic() - self.started_at):
+                client.close()
+                continue
+            try:
+                client.settimeout(2.0)
+                client.sendall(self._encode(VERSION_MESSAGE))
+                # Clients send ?WATCH={...}; acknowledge it the way gpsd does.
+                client.recv(4096)
+                client.sendall(self._encode({"class": "DEVICES", "devices": [{"class": "DEVICE", "path": "/dev/replay"}]}))
+                client.sendall(self._encode({"class": "WATCH", "enable": True, "json": True}))
+                client.settimeout(None)
+            except OSError:
+                client.close()
+                continue
+            with self._clients_lock:
+                self._clients.append(client)
+
+    @staticmethod
+    def _encode(message: dict) -> bytes:
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+    def _broadcast(self, data: bytes) -> None:
+        with self._clients_lock:
+            for client in list(self._clients):
+                try:
+                    client.sendall(data)
+                except OSError:
+                    client.close()
+                    self._clients.remove(client)
+
+    def _drop_clients(self) -> None:
+        with self._clients_lock:
+            for client in self._clients:
+                try:
+                    client.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                client.close()
+            self._clients = []
+
+    def _stream_loop(self) -> None:
+        previous_events = set()
+        while self._running:
+            for offset, tpv in self.source():
+                if not self._running:
+                    return
+                due = self.started_at + offset / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                elapsed = time.monotonic() - self.started_at
+                events = self._active_events(elapsed)
+                for action in events - previous_events:
+                    self.event_log.append((time.time(), f"{action} start"))
+                    if action == EVENT_DISCONNECT:
+                        self._drop_clients()
+                for action in previous_events - events:
+                    self.event_log.append((time.time(), f"{action} end"))
+                previous_events = events
+                if EVENT_STALL in events or EVENT_DISCONNECT in events:
+                    continue
+                report = dict(tpv)
+                if self.restamp:
+                    report["time"] = format_gpsd_time(time.time())
+                if EVENT_FIX_LOSS in events:
+                    report["mode"] = 1
+                    for key in ("lat", "lon", "altMSL", "eph", "epv"):
+                        report.pop(key, None)
+                else:
+                    mode = self._mode_override(elapsed)
+                    if mode is not None:
+                        report["mode"] = mode
+                self._broadcast(self._encode(report))
+                self.reports_sent += 1
+                if report.get("mode", 0) >= 2:
+                    self.fixes_sent += 1
+            if not self.loop:
+                return
+            # Keep the schedule monotonic across loops of the source.
+            self.started_at = time.monotonic()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded or synthetic TPV streams as a local gpsd.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2947)
+    parser.add_argument("--source", default="synthetic",
+                        help="'synthetic' or a recorded file (gpsd JSON log or gnss_data.json).")
+    parser.add_argument("--rate", type=float, default=10.0, help="Report rate of the synthetic source in Hz.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier.")
+    parser.add_argument("--scenario", default=None,
+                        help='JSON file with {"events": [{"action": "fix_loss", "at": 10, "duration": 5}, ...]}.')
+    parser.add_argument("--loop", action="store_true", help="Restart a recorded source when it ends.")
+    args = parser.parse_args()
+    configure_logging("INFO")
+
+    if args.source == "synthetic":
+        source = lambda: synthetic_tpv(args.rate)
+    else:
+        source = lambda: recorded_tpv(args.source)
+    events = []
+    if args.scenario:
+        with open(args.scenario, "r") as f:
+            events = json.load(f)["events"]
+    server = GPSDReplayServer(source, args.host, args.port, speed=args.speed, events=events, loop=args.loop)
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    server.stop()
+    print(f"🛑 Replay server stopped ({server.reports_sent} reports sent).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import logging
+import time
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds; covers grab() calls from sub-millisecond to seconds.
+DEFAULT_LATENCY_BOUNDS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.0167, 0.025, 0.0334, 0.05, 0.075,
+                          0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class LatencyHistogram:
+    def __init__(self, bounds: tuple = DEFAULT_LATENCY_BOUNDS):
+        """
+        Fixed-bucket histogram. A value v lands in the first bucket whose bound is >= v,
+        the last bucket catches everything above the largest bound.
+        :param bounds: Sorted bucket upper bounds in seconds.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        :return: Upper bound of the bucket containing the q-quantile (max for the overflow bucket).
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target and bucket_count:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "bounds": self.bounds,
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+        }
+
+
+class GrabMetrics:
+    def __init__(self, camera_fps: float):
+        """
+        Per-camera grab loop statistics. Written only by the grab thread; other threads read
+        plain attributes or call snapshot() without locking.
+        :param camera_fps: Configured frame rate, used to estimate dropped frames.
+        """
+        self.camera_fps = camera_fps
+        self.frame_period = 1.0 / camera_fps if camera_fps else 0.0
+        self.grab_latency = LatencyHistogram()
+        self.frame_interval = LatencyHistogram()
+        self.frames_grabbed = 0
+        self.grab_errors = {}
+        self.dropped_frames = 0
+        self.started_at = None
+        self.last_frame_at = None
+        self.first_camera_timestamp_ns = None
+        self.last_camera_timestamp_ns = None
+        self._last_frame_ts = None
+
+    def record_grab(self, start_ns: int, end_ns: int, error: str = None, camera_timestamp_ns: int = 0) -> None:
+        """
+        Accounts for one grab() call.
+        :param start_ns: time.monotonic_ns() before grab().
+        :param end_ns: time.monotonic_ns() after grab().
+        :param error: Error code name, None on success.
+        :param camera_timestamp_ns: Image timestamp of a successful grab (host time is used if 0).
+        """
+        if self.started_at is None:
+            self.started_at = start_ns
+        self.grab_latency.observe((end_ns - start_ns) / 1e9)
+        if error is not None:
+            self.grab_errors[error] = self.grab_errors.get(error, 0) + 1
+            return
+        self.frames_grabbed += 1
+        self.last_frame_at = end_ns
+        if camera_timestamp_ns:
+            if self.first_camera_timestamp_ns is None:
+                self.first_camera_timestamp_ns = camera_timestamp_ns
+            self.last_camera_timestamp_ns = camera_timestamp_ns
+        frame_ts = camera_timestamp_ns or end_ns
+        if self._last_frame_ts is not None:
+            interval = (frame_ts - self._last_frame_ts) / 1e9
+            self.frame_interval.observe(interval)
+            # An interval spanning k frame periods means k - 1 frames never reached us.
+            if self.frame_period and interval > 1.5 * self.frame_period:
+                self.dropped_frames += int(round(interval / self.frame_period)) - 1
+        self._last_frame_ts = frame_ts
+
+    def expected_frames(self, now_ns: int = None) -> int:
+        """
+        :return: Frames the configured fps would have produced since the first grab.
+        """
+        if self.started_at is None or not self.camera_fps:
+            return 0
+        now_ns = time.monotonic_ns() if now_ns is None else now_ns
+        return int((now_ns - self.started_at) / 1e9 * self.camera_fps)
+
+    def snapshot(self) -> dict:
+        return {
+            "camera_fps": self.camera_fps,
+            "frames_grabbed": self.frames_grabbed,
+            "expected_frames": self.expected_frames(),
+            "dropped_frames": self.dropped_frames,
+            "grab_errors": dict(self.grab_errors),
+            "grab_latency": self.grab_latency.snapshot(),
+            "frame_interval": self.frame_interval.snapshot(),
+            "last_frame_at": self.last_frame_at,
+            "first_camera_timestamp_ns": self.first_camera_timestamp_ns,
+            "last_camera_timestamp_ns": self.last_camera_timestamp_ns,
+        }
+
+    def summary(self) -> str:
+        errors = sum(self.grab_errors.values())
+        return (f"{self.frames_grabbed} frames, {errors} grab errors, ~{self.dropped_frames} dropped, "
+                f"grab p50/p99 {self.grab_latency.quantile(0.5) * 1e3:.1f}/"
+                f"{self.grab_latency.quantile(0.99) * 1e3:.1f} ms")
+
+
+class ErrorRateLimiter:
+    def __init__(self, prefix: str, interval: float = 10.0):
+        """
+        Prints the first occurrence of an error immediately, then at most one line per `interval`
+        seconds for each error that keeps recurring, with the number of occurrences it stood for.
+        :param prefix: Text printed before the error, e.g. "⚠️ Camera 1234 grab error".
+        :param interval: Seconds between lines for the same error.
+        """
+        self.prefix = prefix
+        self.interval = interval
+        self._errors = {}  # error -> [time of last printed line, occurrences not printed since]
+
+    def report(self, error: str) -> None:
+        now = time.monotonic()
+        state = self._errors.get(error)
+        if state is None:
+            self._errors[error] = [now, 0]
+            logger.warning(f"{self.prefix}: {error}")
+            return
+        state[1] += 1
+        if now - state[0] >= self.interval:
+            self._print_repeats(error, state, now)
+
+    def _print_repeats(self, error: str, state: list, now: float) -> None:
+        logger.warning(f"{self.prefix}: {error} (repeated {state[1]} times in {now - state[0]:.0f} s)")
+        state[0] = now
+        state[1] = 0
+
+    def flush(self) -> None:
+        """
+        Prints the pending repeat counts, e.g. when the grab loop stops.
+        """
+        now = time.monotonic()
+        for error, state in self._errors.items():
+            if state[1]:
+                self._print_repeats(error, state, now)
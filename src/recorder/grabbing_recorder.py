@@ -0,0 +1,366 @@
+import logging
+import os
+import time
+import threading
+from abc import abstractmethod
+from collections import deque
+from .icamera_recorder import ICameraRecorder
+from .frame_index import FrameTimestampSidecar, FRAME_INDEX_SUFFIX
+from .grab_metrics import GrabMetrics, ErrorRateLimiter
+from .frame_preview import PreviewSlot
+
+logger = logging.getLogger(__name__)
+
+
+class _GrabThreadRequest:
+    def __init__(self, fn):
+        # A function the grab thread runs between two grabs (see _run_in_grab_thread).
+        self.fn = fn
+        self.done = threading.Event()
+        self.result = False
+        self.started = False  # Set by the grab thread when it takes the request.
+
+
+class GrabbingCameraRecorder(ICameraRecorder):
+    # How often the size of the current segment is checked against segment_bytes.
+    SEGMENT_SIZE_CHECK_INTERVAL_NS = 100_000_000
+
+    def __init__(self, serial_number: int, camera_fps: float, session_dir: str, write_frame_index: bool = True,
+                 segment_seconds: float = 0.0, segment_bytes: int = 0, segment_index=None,
+                 recording_enabled: bool = True):
+        """
+        Shared grab thread, metrics and frame sidecar for camera recorders. Subclasses wrap a
+        concrete camera object through the _grab / _image_timestamp_ns / _enable_recording /
+        _disable_recording / _close_camera hooks.
+        :param serial_number: Camera serial number, used in file names and messages.
+        :param camera_fps: Configured frame rate.
+        :param session_dir: Directory to store the SVO file (should be the svo2 folder).
+        :param write_frame_index: Write a camera_<serial>.frames timestamp sidecar next to the SVO.
+        :param segment_seconds: Start a new SVO segment after this many seconds of video (0 = no limit).
+        :param segment_bytes: Start a new SVO segment once the current one reaches this size (0 = no limit).
+        :param segment_index: SegmentIndex recording the segments (see RecordingSessionManager.get_segment_index).
+        :param recording_enabled: False for a preview-only camera: frames are grabbed but no SVO is written.
+        """
+        self.serial_number = serial_number
+        self.session_dir = session_dir
+        self.write_frame_index = write_frame_index
+        self.frame_index = None
+        self.metrics = GrabMetrics(camera_fps)
+        self.error_reporter = ErrorRateLimiter(f"⚠️ Camera {serial_number} grab error")
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_bytes
+        self.segment_index = segment_index
+        self.recording_enabled = recording_enabled
+        self.file_prefix = f"camera_{serial_number}"  # Base name of the SVO and sidecar files.
+        self.recording_started_ns = None  # time.monotonic_ns() when the current SVO output was opened.
+        self.recording_stopped_ns = None  # time.monotonic_ns() when the last SVO output was closed.
+        self.session_metrics = None  # metrics.snapshot() when the last session was detached (see detach_session).
+        self.segment = 0
+        self._segment_first_frame = 0
+        self._segment_start_ns = None
+        self._segment_end_ns = None
+        self._next_size_check_ns = 0
+        self._segment_open = False
+        self.preview = None         # PreviewSlot, see enable_preview().
+        self._next_preview_ns = 0
+        self.thread = None
+        self._stop = False
+        self._requests = deque()  # _GrabThreadRequest run by the grab thread between two grabs.
+        self._requests_lock = threading.Lock()
+        self._requests_closed = False  # Set once the grab thread stops taking requests.
+
+    @abstractmethod
+    def _grab(self) -> tuple:
+        """
+        Grabs one frame, blocking until it is available.
+        :return: (None, 0) on success, (error code name, error code value) otherwise.
+        """
+        pass
+
+    @abstractmethod
+    def _image_timestamp_ns(self) -> int:
+        """:return: Camera timestamp of the last grabbed image in nanoseconds."""
+        pass
+
+    @abstractmethod
+    def _enable_recording(self, svo_filename: str) -> str:
+        """:return: None on success, an error description otherwise."""
+        pass
+
+    @abstractmethod
+    def _disable_recording(self) -> None:
+        pass
+
+    @abstractmethod
+    def _close_camera(self) -> None:
+        pass
+
+    @abstractmethod
+    def _create_preview_buffer(self, width: int) -> tuple:
+        """
+        Allocates one preview image `width` pixels wide, with the camera's aspect ratio.
+        :return: (buffer passed to _retrieve_preview, BGRA numpy view of the buffer's memory).
+        """
+        pass
+
+    @abstractmethod
+    def _retrieve_preview(self, buffer) -> bool:
+        """
+        Fills `buffer` with the last grabbed left image, downscaled to the buffer's size.
+        Called from the grab thread right after a successful grab.
+        :return: False if the image could not be retrieved.
+        """
+        pass
+
+    def enable_preview(self, width: int = 320, fps: float = 2.0) -> PreviewSlot:
+        """
+        Publishes a downscaled copy of at most `fps` grabbed frames per second to a PreviewSlot.
+        Call after open_camera(), before start_grabbing().
+        """
+        self.preview = PreviewSlot(self.serial_number, [self._create_preview_buffer(width) for _ in range(3)], fps)
+        return self.preview
+
+    def _update_preview(self, now_ns: int) -> None:
+        self._next_preview_ns = now_ns + self.preview.interval_ns
+        if self._retrieve_preview(self.preview.write_buffer()):
+            self.preview.publish(time.monotonic_ns() - now_ns)
+
+    def is_segmented(self) -> bool:
+        return bool(self.segment_seconds or self.segment_bytes)
+
+    def get_svo_filename(self) -> str:
+        # Unsegmented recordings keep the historical single-file name.
+        if not self.is_segmented():
+            return os.path.join(self.session_dir, f"{self.file_prefix}.svo")
+        return os.path.join(self.session_dir, f"{self.file_prefix}_seg{self.segment:04d}.svo")
+
+    def _open_segment(self, rollover_start_ns: int = None) -> str:
+        svo_filename = self.get_svo_filename()
+        err = self._enable_recording(svo_filename)
+        if err is not None:
+            return err
+        self._segment_open = True
+        rollover_ms = None
+        if rollover_start_ns is not None:
+            rollover_ms = (time.monotonic_ns() - rollover_start_ns) / 1e6
+        self._segment_first_frame = self.metrics.frames_grabbed
+        self._segment_start_ns = self._segment_end_ns = None
+        self._next_size_check_ns = time.monotonic_ns() + self.SEGMENT_SIZE_CHECK_INTERVAL_NS
+        if self.segment_index is not None:
+            self.segment_index.open_segment(os.path.basename(svo_filename), self._segment_first_frame, rollover_ms)
+        return None
+
+    def _close_segment(self) -> None:
+        self._disable_recording()
+        if not self._segment_open:
+            return
+        self._segment_open = False
+        if self.segment_index is not None:
+            self.segment_index.close_segment(self.metrics.frames_grabbed - self._segment_first_frame,
+                                             self._segment_start_ns, self._segment_end_ns)
+
+    def _segment_full(self, camera_ns: int, now_ns: int) -> bool:
+        if self.segment_seconds and camera_ns - self._segment_start_ns >= self.segment_seconds * 1e9:
+            return True
+        if self.segment_bytes and now_ns >= self._next_size_check_ns:
+            self._next_size_check_ns = now_ns + self.SEGMENT_SIZE_CHECK_INTERVAL_NS
+            try:
+                return os.path.getsize(self.get_svo_filename()) >= self.segment_bytes
+            except OSError:
+                return False
+        return False
+
+    def _roll_segment(self) -> bool:
+        """
+        Closes the current segment and opens the next one between two grabs, so no grabbed frame
+        is left out of a segment. Any frame the camera produces during the switch shows up in the
+        dropped-frame metric and in the next segment's rollover_ms.
+        :return: False if the next segment could not be opened.
+        """
+        start_ns = time.monotonic_ns()
+        self._close_segment()
+        self.segment += 1
+        err = self._open_segment(start_ns)
+        if err is not None:
+            logger.error(f"❌ Error starting segment {self.segment} on camera {self.serial_number}: {err}")
+            return False
+        return True
+
+    def _start_output(self) -> str:
+        """
+        Opens the first SVO segment and the frame sidecar in session_dir.
+        :return: None on success, an error description otherwise.
+        """
+        err = self._open_segment()
+        if err is not None:
+            return err
+        self.recording_started_ns = time.monotonic_ns()
+        if self.write_frame_index:
+            sidecar_filename = os.path.join(self.session_dir, f"{self.file_prefix}{FRAME_INDEX_SUFFIX}")
+            self.frame_index = FrameTimestampSidecar(sidecar_filename)
+        return None
+
+    def _stop_output(self) -> None:
+        if self._segment_open:
+            self.recording_stopped_ns = time.monotonic_ns()
+        self._close_segment()
+        if self.frame_index is not None:
+            self.frame_index.close()
+            self.frame_index = None
+
+    def start_recording(self) -> bool:
+        if not self.recording_enabled:
+            logger.info(f"✅ Camera {self.serial_number} is open in preview-only mode (not recording).")
+            return True
+        # Define a unique SVO file name and enable recording.
+        svo_filename = self.get_svo_filename()
+        err = self._start_output()
+        if err is not None:
+            logger.error(f"❌ Error starting recording on camera {self.serial_number}: {err}")
+            self._close_camera()
+            return False
+        logger.info(f"✅ Camera {self.serial_number} is recording to {svo_filename}")
+        return True
+
+    def _attach(self, session_dir: str, segment_index, file_prefix: str) -> bool:
+        self._stop_output()
+        self.session_dir = session_dir
+        self.segment_index = segment_index
+        self.file_prefix = file_prefix or f"camera_{self.serial_number}"
+        self.segment = 0
+        # The manifest and the sidecar count frames per session.
+        self.metrics = GrabMetrics(self.metrics.camera_fps)
+        self.session_metrics = None
+        if not self.recording_enabled:
+            return True
+        err = self._start_output()
+        if err is not None:
+            logger.error(f"❌ Error starting recording on camera {self.serial_number}: {err}")
+            return False
+        logger.info(f"✅ Camera {self.serial_number} is recording to {self.get_svo_filename()}")
+        return True
+
+    def _run_in_grab_thread(self, fn, timeout: float) -> bool:
+        """
+        Runs `fn` on the grab thread between two grabs and waits for it.
+        :return: Result of `fn`, False if the grab thread is not running or did not get to it in time.
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return False
+        request = _GrabThreadRequest(fn)
+        with self._requests_lock:
+            if self._requests_closed:
+                return False
+            self._requests.append(request)
+        if request.done.wait(timeout):
+            return request.result
+        with self._requests_lock:
+            if not request.started:
+                # Withdrawn, so a grab() that returns late cannot run a stale session switch.
+                self._requests.remove(request)
+                logger.error(f"❌ Camera {self.serial_number} grab thread did not respond within {timeout:.1f} s.")
+                return False
+        # The grab thread took the request just now; let it finish rather than lose track of it.
+        if not request.done.wait(timeout):
+            logger.error(f"❌ Camera {self.serial_number} session switch did not complete within {timeout:.1f} s.")
+            return False
+        return request.result
+
+    def _run_requests(self) -> None:
+        while True:
+            with self._requests_lock:
+                if not self._requests:
+                    return
+                request = self._requests.popleft()
+                request.started = True
+            try:
+                request.result = request.fn()
+            except Exception as e:
+                logger.error(f"❌ Camera {self.serial_number} session switch failed: {e}")
+            request.done.set()
+
+    def attach_session(self, session_dir: str, segment_index=None, file_prefix: str = None,
+                       timeout: float = 5.0) -> bool:
+        """
+        Starts recording a camera that is already grabbing into another session folder, without
+        reopening it: between two grabs, the current SVO and sidecar (if any) are closed, new ones
+        opened in `session_dir` and the metrics restarted.
+        :param session_dir: Directory of the new SVO files (the session's svo2 folder).
+        :param segment_index: SegmentIndex of this camera in the new session.
+        :param file_prefix: Base file name, camera_<serial> by default.
+        :param timeout: Seconds to wait for the grab thread.
+        :return: False if recording could not start.
+        """
+        return self._run_in_grab_thread(lambda: self._attach(session_dir, segment_index, file_prefix), timeout)
+
+    def detach_session(self, timeout: float = 5.0) -> bool:
+        """
+        Closes the current SVO and sidecar between two grabs; the camera keeps grabbing (and
+        feeding its preview) without recording.
+        The metrics keep counting the frames grabbed after that; session_metrics holds their
+        values for the detached session.
+        :return: False if the grab thread is not running or did not respond in time.
+        """
+        return self._run_in_grab_thread(self._detach, timeout)
+
+    def _detach(self) -> bool:
+        self._stop_output()
+        self.session_metrics = self.metrics.snapshot()
+        return True
+
+    def _grab_run(self):
+        # Continuously grab frames until signaled to stop. grab() blocks until the next frame
+        # is available, so it paces the loop on its own.
+        while not self._stop:
+            if self._requests:
+                self._run_requests()
+            start_ns = time.monotonic_ns()
+            error, error_value = self._grab()
+            end_ns = time.monotonic_ns()
+            if error is not None:
+                self.metrics.record_grab(start_ns, end_ns, error)
+                self.error_reporter.report(error)
+                if self.frame_index is not None:
+                    self.frame_index.append(self.metrics.frames_grabbed, 0, end_ns, error_value)
+            else:
+                camera_ns = self._image_timestamp_ns()
+                if self.frame_index is not None:
+                    self.frame_index.append(self.metrics.frames_grabbed, camera_ns, end_ns, 0)
+                self.metrics.record_grab(start_ns, end_ns, None, camera_ns)
+                if self._segment_start_ns is None:
+                    self._segment_start_ns = camera_ns
+                self._segment_end_ns = camera_ns
+                if self.preview is not None and end_ns >= self._next_preview_ns:
+                    self._update_preview(end_ns)
+                if self._segment_open and self.is_segmented() and self._segment_full(camera_ns, end_ns) \
+                        and not self._roll_segment():
+                    break
+        self._stop_output()
+        self._close_camera()
+        with self._requests_lock:
+            self._requests_closed = True
+            pending = list(self._requests)
+            self._requests.clear()
+        for request in pending:
+            request.done.set()  # Fail pending session switches rather than let them time out.
+        self.error_reporter.flush()
+        logger.info(f"🛑 Camera {self.serial_number} stopped ({self.metrics.summary()}).")
+
+    def close(self) -> None:
+        # Release a camera that was opened (and possibly set recording) but never grabbed.
+        self._stop_output()
+        self._close_camera()
+
+    def start_grabbing(self) -> None:
+        # Start the grabbing thread for this camera.
+        self.thread = threading.Thread(target=self._grab_run)
+        self.thread.start()
+
+    def stop(self) -> None:
+        # Signal the thread to stop.
+        self._stop = True
+
+    def join(self) -> None:
+        # Wait for the thread to finish.
+        if self.thread is not None:
+            self.thread.join()
@@ -25,3 +25,8 @@ class ICameraRecorder(ABC):
     def join(self) -> None:
         """Waits for the grabbing thread to finish."""
         pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases a camera that was opened but never started grabbing."""
+        pass
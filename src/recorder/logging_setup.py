@@ -0,0 +1,26 @@
+import logging
+
+# Every recorder module logs to logging.getLogger(__name__), i.e. below the "recorder" logger.
+RECORDER_LOGGER = "recorder"
+
+LOG_FORMAT = "%(asctime)s.%(msecs)03d %(levelname)-7s %(name)s: %(message)s"
+LOG_DATE_FORMAT = "%H:%M:%S"
+
+
+def configure_logging(level="INFO", handler: logging.Handler = None,
+                      log_format: str = LOG_FORMAT) -> logging.Handler:
+    """
+    Sends the recorder modules' log records to `handler`. Call once per sink from an entry point
+    (main.py, the GUI, a CLI); library modules never configure logging themselves.
+    :param level: Minimum level, as a logging constant or its name ("DEBUG", "INFO", ...).
+    :param handler: Destination; a stderr StreamHandler by default.
+    :param log_format: logging.Formatter format string, applied to `handler`.
+    :return: The installed handler, e.g. to remove it later.
+    """
+    logger = logging.getLogger(RECORDER_LOGGER)
+    logger.setLevel(level)
+    if handler is None:
+        handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(log_format, LOG_DATE_FORMAT))
+    logger.addHandler(handler)
+    return handler
@@ -0,0 +1,171 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "zed_recorder_"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Exposition:
+    def __init__(self):
+        # Prometheus text format: the samples of a metric family follow its HELP/TYPE lines.
+        self.families = {}  # Name -> [help, type, sample lines], in insertion order.
+
+    def add(self, name: str, metric_type: str, help_text: str, value, labels: dict = None,
+            suffix: str = "") -> None:
+        if value is None:
+            return
+        family = self.families.setdefault(name, [help_text, metric_type, []])
+        family[2].append(f"{name}{suffix}{_labels(labels)} {float(value)!r}")
+
+    def add_histogram(self, name: str, help_text: str, histogram: dict, labels: dict) -> None:
+        cumulative = 0
+        for bound, count in zip(histogram["bounds"], histogram["counts"]):
+            cumulative += count
+            self.add(name, "histogram", help_text, cumulative, {**labels, "le": repr(float(bound))}, "_bucket")
+        self.add(name, "histogram", help_text, histogram["count"], {**labels, "le": "+Inf"}, "_bucket")
+        self.add(name, "histogram", help_text, histogram["sum"], labels, "_sum")
+        self.add(name, "histogram", help_text, histogram["count"], labels, "_count")
+
+    def render(self) -> str:
+        lines = []
+        for name, (help_text, metric_type, samples) in self.families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def render_metrics(snapshot: dict) -> str:
+    """
+    Formats a TelemetryCollector snapshot in the Prometheus text exposition format.
+    :param snapshot: TelemetryCollector.latest, or None before the first recording.
+    """
+    out = _Exposition()
+    p = METRIC_PREFIX
+    out.add(p + "recording", "gauge", "1 while a session is recording.",
+            int(snapshot is not None and snapshot["recording"]))
+    if snapshot is None:
+        return out.render()
+    out.add(p + "snapshot_timestamp_seconds", "gauge", "Unix time the telemetry snapshot was taken.",
+            snapshot["time"])
+    out.add(p + "devices_started", "gauge", "Devices that started in this session.", snapshot["devices_ok"])
+    out.add(p + "devices", "gauge", "Devices set up in this session.", len(snapshot["devices"]))
+
+    for camera in snapshot["cameras"]:
+        labels = {"serial": camera["serial_number"]}
+        out.add(p + "camera_frames_total", "counter", "Frames grabbed.", camera["frames"], labels)
+        out.add(p + "camera_dropped_frames_total", "counter", "Frames estimated lost between grabs.",
+                camera["dropped_frames"], labels)
+        for code, count in camera["grab_errors_by_code"].items():
+            out.add(p + "camera_grab_errors_total", "counter", "Failed grab() calls by error code.", count,
+                    {**labels, "code": code})
+        out.add(p + "camera_fps", "gauge", "Achieved frame rate over the last telemetry interval.",
+                camera["fps"], labels)
+        out.add(p + "camera_configured_fps", "gauge", "Configured frame rate.", camera["camera_fps"], labels)
+        out.add(p + "camera_svo_bytes", "gauge", "Size of the camera's SVO files.", camera["svo_bytes"], labels)
+        out.add(p + "camera_frame_age_seconds", "gauge", "Time since the last grabbed frame.",
+                camera["frame_age"], labels)
+        out.add(p + "camera_recording_enabled", "gauge", "0 for a preview-only camera.",
+                int(camera["recording_enabled"]), labels)
+        out.add_histogram(p + "camera_grab_latency_seconds", "Duration of grab() calls.",
+                          camera["grab_latency"], labels)
+
+    gnss = snapshot["gnss"]
+    if gnss is not None:
+        out.add(p + "gnss_fixes_received_total", "counter", "GNSS fixes received from gpsd.", gnss["fixes_received"])
+        out.add(p + "gnss_fixes_written_total", "counter", "GNSS fixes written to the session.",
+                gnss["fixes_written"])
+        out.add(p + "gnss_queue_dropped_total", "counter", "GNSS fixes dropped on queue overflow.",
+                gnss["queue_dropped"])
+        out.add(p + "gnss_outages_total", "counter", "GNSS fix or connection losses.", gnss["outages"])
+        out.add(p + "gnss_fix_age_seconds", "gauge", "Time since the last GNSS fix.", gnss["fix_age"])
+        out.add(p + "gnss_fix_rate", "gauge", "GNSS fixes per second over the last telemetry interval.",
+                gnss["fix_rate"])
+        out.add(p + "gnss_state", "gauge", "GPSD reader state (1 for the current one).", 1, {"state": gnss["state"]})
+        if gnss["mode"] is not None:
+            out.add(p + "gnss_fix_info", "gauge", "Mode and status of the last GNSS fix.", 1,
+                    {"mode": gnss["mode"], "status": gnss["status"]})
+
+    disk = snapshot["disk"]
+    out.add(p + "session_bytes", "gauge", "Bytes written to the session folder.", disk["session_bytes"])
+    out.add(p + "disk_free_bytes", "gauge", "Free space on the results volume.", disk["free_bytes"])
+    out.add(p + "disk_seconds_left", "gauge", "Recording time left at the current write rate.", disk["seconds_left"])
+
+    process = snapshot["process"]
+    out.add("process_cpu_seconds_total", "counter", "User and system CPU time of the recorder process.",
+            process["cpu_seconds"])
+    out.add("process_resident_memory_bytes", "gauge", "Resident memory of the recorder process.",
+            process["rss_bytes"])
+    return out.render()
+
+
+class MetricsServer:
+    def __init__(self, snapshot_fn, host: str = "127.0.0.1", port: int = 9108):
+        """
+        Background HTTP endpoint serving GET /metrics in the Prometheus text format. Scrapes only
+        format the latest precomputed telemetry snapshot (rendered once per snapshot and cached),
+        so they never touch the recorders or any lock their threads use.
+        :param snapshot_fn: Callable returning the latest telemetry snapshot, or None.
+        :param host: Interface to listen on.
+        :param port: TCP port (0 picks a free one, see self.port after start()).
+        """
+        self.snapshot_fn = snapshot_fn
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self.httpd = None
+        self.thread = None
+        self._cached = (None, None)  # (snapshot, rendered text)
+
+    def render(self) -> bytes:
+        snapshot = self.snapshot_fn()
+        cached_snapshot, text = self._cached
+        if text is None or snapshot is not cached_snapshot:
+            text = render_metrics(snapshot).encode()
+            self._cached = (snapshot, text)
+        return text
+
+    def start(self) -> None:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = server.render()
+                server.scrapes += 1
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+        logger.info(f"📈 Metrics served at http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
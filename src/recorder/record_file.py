@@ -0,0 +1,154 @@
+"""
+Fixed-width binary record files shared by the recorder's compact logs.
+
+Layout (little-endian):
+    magic            8s   b"ZXREC\\0\\0\\0"
+    format_version   u16  version of this container layout
+    reserved         u16
+    header_size      u32  offset of the first record (multiple of HEADER_ALIGNMENT)
+    record_size      u32  bytes per record
+    record_count     i64  number of valid records, or UNKNOWN_COUNT for append-only files
+    schema           JSON {"kind", "version", "fields"} padded with spaces up to header_size
+
+Records follow the header back to back, so a file can be mapped with np.memmap and read
+without copying. NumPy is only imported by the reading helpers.
+"""
+import json
+import os
+import struct
+
+MAGIC = b"ZXREC\0\0\0"
+FORMAT_VERSION = 1
+HEADER_ALIGNMENT = 64
+UNKNOWN_COUNT = -1
+_PREFIX = struct.Struct("<8sHHIIq")
+RECORD_COUNT_OFFSET = 20  # Byte offset of record_count inside the prefix.
+
+# NumPy type codes -> struct format characters (both little-endian, no padding).
+_STRUCT_CODES = {
+    "f8": "d", "f4": "f",
+    "i8": "q", "i4": "i", "i2": "h", "i1": "b",
+    "u8": "Q", "u4": "I", "u2": "H", "u1": "B",
+}
+
+
+class RecordFileError(Exception):
+    """Raised when a file is not a valid record file or does not match the expected schema."""
+
+
+def struct_format(fields: list) -> str:
+    """
+    :param fields: Schema as a list of (name, numpy type code) or (name, type code, count) entries.
+    :return: struct format string packing one record with the same layout as numpy_dtype(fields).
+    """
+    parts = ["<"]
+    for field in fields:
+        code = _STRUCT_CODES[field[1].lstrip("<|")]
+        count = field[2] if len(field) > 2 else 1
+        parts.append(f"{count}{code}" if count != 1 else code)
+    return "".join(parts)
+
+
+def numpy_dtype(fields: list):
+    """
+    :return: Packed NumPy structured dtype for the schema.
+    """
+    import numpy as np
+    spec = []
+    for field in fields:
+        code = "<" + field[1].lstrip("<|")
+        spec.append((field[0], code, (field[2],)) if len(field) > 2 else (field[0], code))
+    return np.dtype(spec)
+
+
+def build_header(kind: str, version: int, fields: list, record_count: int = UNKNOWN_COUNT) -> bytes:
+    """
+    Builds the file header for a record file.
+    :param kind: Short identifier of the record type, checked when the file is opened.
+    :param version: Version of the record schema.
+    :param fields: Schema (see struct_format).
+    :param record_count: Number of records, UNKNOWN_COUNT if it is derived from the file size.
+    """
+    schema = json.dumps({"kind": kind, "version": version, "fields": [list(f) for f in fields]}).encode()
+    header_size = _PREFIX.size + len(schema)
+    header_size += -header_size % HEADER_ALIGNMENT
+    record_size = struct.calcsize(struct_format(fields))
+    prefix = _PREFIX.pack(MAGIC, FORMAT_VERSION, 0, header_size, record_size, record_count)
+    return prefix + schema.ljust(header_size - _PREFIX.size, b" ")
+
+
+def read_header(file_path: str) -> dict:
+    """
+    Parses and validates the header of a record file.
+    :return: dict with kind, version, fields, header_size, record_size, record_count (always resolved).
+    """
+    with open(file_path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise RecordFileError(f"{file_path}: file too short for a record header")
+        magic, format_version, _, header_size, record_size, record_count = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise RecordFileError(f"{file_path}: not a record file (bad magic)")
+        if format_version > FORMAT_VERSION:
+            raise RecordFileError(f"{file_path}: unsupported container version {format_version}")
+        schema = json.loads(f.read(header_size - _PREFIX.size).decode())
+    fields = [tuple(field) for field in schema["fields"]]
+    if struct.calcsize(struct_format(fields)) != record_size:
+        raise RecordFileError(f"{file_path}: record size does not match the schema")
+    available = max(0, os.path.getsize(file_path) - header_size) // record_size
+    # A count written by the producer wins, but never trust it beyond what is actually on disk.
+    count = available if record_count == UNKNOWN_COUNT else min(record_count, available)
+    return {
+        "kind": schema["kind"],
+        "version": schema["version"],
+        "fields": fields,
+        "header_size": header_size,
+        "record_size": record_size,
+        "record_count": count,
+    }
+
+
+def check_kind(header: dict, kind: str, max_version: int, file_path: str) -> None:
+    """
+    Raises RecordFileError unless the header describes `kind` records no newer than max_version.
+    """
+    if header["kind"] != kind:
+        raise RecordFileError(f"{file_path}: expected {kind!r} records, found {header['kind']!r}")
+    if header["version"] > max_version:
+        raise RecordFileError(f"{file_path}: {kind} schema version {header['version']} is newer than "
+                              f"supported version {max_version}")
+
+
+def open_records(file_path: str, kind: str, max_version: int):
+    """
+    Maps the records of a file read-only, without copying them into memory.
+    :return: np.memmap (or an empty array for a file without records) with the file's structured dtype.
+    """
+    import numpy as np
+    header = read_header(file_path)
+    check_kind(header, kind, max_version, file_path)
+    dtype = numpy_dtype(header["fields"])
+    if header["record_count"] == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(file_path, dtype=dtype, mode="r", offset=header["header_size"],
+                     shape=(header["record_count"],))
+
+
+def iter_records(file_path: str, kind: str, max_version: int, chunk_records: int = 4096):
+    """
+    Streams records as tuples (struct layout, covariance-style arrays flattened) without NumPy.
+    """
+    header = read_header(file_path)
+    check_kind(header, kind, max_version, file_path)
+    record_struct = struct.Struct(struct_format(header["fields"]))
+    remaining = header["record_count"]
+    with open(file_path, "rb") as f:
+        f.seek(header["header_size"])
+        while remaining > 0:
+            count = min(chunk_records, remaining)
+            chunk = f.read(count * record_struct.size)
+            count = len(chunk) // record_struct.size
+            if count == 0:
+                break
+            yield from record_struct.iter_unpack(chunk[:count * record_struct.size])
+            remaining -= count
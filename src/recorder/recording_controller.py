@@ -1,7 +1,16 @@
-import pyzed.sl as sl
-from .zed_camera_recorder import ZEDCameraRecorder
+import logging
+from .camera_backends import create_camera_backend
 from .gnss_recorder import GNSSRecorder
 from .recording_session_manager import RecordingSessionManager
+from .device_startup import DeviceStartup, start_devices, format_startup_report, STATUS_OK
+from .disk_admission import check_disk_admission, DiskMonitor, ADMISSION_OFF
+from .session_manifest import SessionManifest
+from .telemetry import TelemetryCollector
+from .camera_pool import CameraPool
+from .camera_profiles import validate_camera_profiles, has_camera_profile, resolve_camera_profile, resolution_name
+
+logger = logging.getLogger(__name__)
+
 
 class RecordingController:
     def __init__(self, config: dict = None):
@@ -11,79 +20,348 @@ class RecordingController:
         """
         # Default configuration parameters.
         default_config = {
-            "camera_resolution": sl.RESOLUTION.HD1200,
+            "camera_backend": "zed",         # "zed" or "simulated" (see camera_backends.py).
+            "camera_resolution": "HD1200",   # sl.RESOLUTION member or its name.
             "camera_fps": 30,
+            "frame_sidecar": True,
+            "svo_compression": "H264",       # sl.SVO_COMPRESSION_MODE name.
+            "svo_bitrate_kbps": 0,           # SVO encoder bitrate, 0 lets the SDK choose.
+            "recording_enabled": True,       # False: cameras are opened and grabbed but not recorded.
+            # Per-camera overrides of the keys above, by serial number, e.g.
+            # {12345: {"camera_resolution": "HD1080", "svo_compression": "H265", "svo_bitrate_kbps": 4000}}.
+            "camera_profiles": {},
+            "svo_segment_seconds": 0.0,      # Roll SVO files over after this many seconds (0 = one file per camera).
+            "svo_segment_bytes": 0,          # Roll SVO files over at this size in bytes (0 = no size limit).
+            "preview_fps": 0.0,              # Downscaled preview frames per second per camera (0 = no preview).
+            "preview_width": 320,            # Preview width in pixels; the height follows the camera's aspect ratio.
             "gnss_port": "COM3",
-            "gnss_baudrate": 9600
+            "gnss_baudrate": 9600,
+            "gpsd_host": "127.0.0.1",
+            "gpsd_port": 2947,
+            "gnss_queue_size": 256,
+            "gnss_overflow_policy": "drop_oldest",
+            "gnss_batch_records": 64,
+            "gnss_batch_delay": 0.5,
+            "gnss_fsync_policy": "none",
+            "gnss_fsync_interval_ms": 1000,
+            "gnss_log_format": "json",
+            "camera_open_timeout": 20.0,
+            # Camera pool (see camera_pool.py).
+            "camera_pool": False,            # Keep cameras open and grabbing between sessions (new_session()).
+            "camera_lost_timeout": 3.0,      # A pooled camera without a frame for this long is reopened.
+            "camera_reopen_interval": 2.0,   # Seconds between reopen attempts of a lost camera.
+            "gnss_open_timeout": 60.0,
+            "gnss_enabled": True,
+            "results_dir": None,             # Defaults to ./results.
+            # Disk admission control (see disk_admission.py).
+            "disk_admission_policy": "warn", # "off", "warn", "refuse" or "downgrade".
+            "disk_headroom": 1.5,            # Required ratio of measured disk throughput to estimated bandwidth.
+            "disk_min_free_minutes": 10.0,   # Free space must allow at least this much recording.
+            "disk_probe_mb": 64,             # Size of the write probe.
+            "disk_check_interval": 10.0,     # Seconds between free space checks while recording (any policy).
+            "disk_warn_minutes": 15.0,       # Warn when less recording time than this is left.
+            "manifest_interval": 5.0,        # Seconds between session manifest updates.
+            "telemetry_interval": 1.0,       # Seconds between health snapshots (see telemetry.py).
+            "metrics_port": 0,               # Serve Prometheus metrics on this port (0 = no endpoint).
+            "metrics_host": "127.0.0.1",     # Interface of the metrics endpoint.
+            # Simulated camera backend.
+            "sim_camera_count": 4,
+            "sim_open_latency": 0.5,
+            "sim_grab_latency": 0.002,
+            "sim_latency_jitter": 0.001,
+            "sim_error_rate": 0.0,
+            "sim_error_code": "CORRUPTED_FRAME",
+            "sim_bitrate_mbps": 0.0
         }
         if config is not None:
             default_config.update(config)
         self.config = default_config
+        validate_camera_profiles(self.config)
 
         self.camera_recorders = []  # List to hold camera recorder instances.
         self.gnss_recorder = None   # GNSS sensor recorder.
-        self.session_manager = RecordingSessionManager()
-        self.init_params = self._setup_init_params()
+        self.session_manager = RecordingSessionManager(self.config["results_dir"])
+        self.startup_report = []    # DeviceStartup results of the last discover_and_setup_devices().
+        self.camera_backend = create_camera_backend(self.config["camera_backend"], self.config)
+        self.admission = None       # AdmissionResult of the last disk preflight.
+        # Settings replacing the configured defaults for the current session only (disk admission downgrade).
+        self.session_overrides = {}
+        self.disk_monitor = None
+        self.manifest = None        # SessionManifest of the running session.
+        self.telemetry = None       # TelemetryCollector of the running (or last) session.
+        self.metrics_server = None  # MetricsServer, started with the first recording if metrics_port is set.
+        self.camera_pool = None     # CameraPool, created by the first setup if camera_pool is set.
+
+    def check_disk(self, cameras_info: list) -> bool:
+        """
+        Disk preflight: checks that the results volume can sustain the recording cameras at their
+        configured resolution and fps, applying the disk admission policy if it cannot.
+        A downgrade sets camera_resolution / camera_fps in session_overrides for this session only,
+        leaving the configuration as it is; cameras with their own profile keep their settings.
+        :return: False if recording must not start.
+        """
+        self.session_overrides = {}
+        if self.config["disk_admission_policy"] == ADMISSION_OFF:
+            return True
+        estimate = self.camera_backend.estimate_write_bandwidth
+        default_count = 0
+        fixed_bps = 0.0
+        for cam_info in cameras_info:
+            profile = resolve_camera_profile(self.config, cam_info.serial_number)
+            if not profile["recording_enabled"]:
+                continue
+            if has_camera_profile(self.config, cam_info.serial_number):
+                fixed_bps += estimate(resolution_name(profile["camera_resolution"]), profile["camera_fps"],
+                                      profile["svo_compression"], profile["svo_bitrate_kbps"])
+            else:
+                default_count += 1
+        if default_count == 0 and fixed_bps == 0:
+            return True
+        resolution = resolution_name(self.config["camera_resolution"])
+        self.admission = check_disk_admission(
+            self.session_manager.get_session_directory(),
+            default_count,
+            resolution,
+            self.config["camera_fps"],
+            lambda resolution, fps: estimate(resolution, fps, self.config["svo_compression"],
+                                             self.config["svo_bitrate_kbps"]),
+            policy=self.config["disk_admission_policy"],
+            headroom=self.config["disk_headroom"],
+            min_free_minutes=self.config["disk_min_free_minutes"],
+            probe_bytes=int(self.config["disk_probe_mb"] * 1024 * 1024),
+            fixed_bps=fixed_bps
+        )
+        if not self.admission.admitted:
+            logger.error(f"❌ Disk cannot sustain the recording: {self.admission.message}.")
+            return False
+        if self.admission.resolution != resolution or self.admission.fps != self.config["camera_fps"]:
+            logger.warning(f"⚠️ Disk too slow for the requested settings: {self.admission.message}.")
+            self.session_overrides = {"camera_resolution": self.admission.resolution,
+                                      "camera_fps": self.admission.fps}
+        elif self.admission.required_bps * self.config["disk_headroom"] > self.admission.measured_bps \
+                or self.admission.recording_seconds < self.config["disk_min_free_minutes"] * 60:
+            logger.warning(f"⚠️ Disk may not keep up, recording anyway: {self.admission.message}.")
+        else:
+            logger.info(f"✅ Disk check passed: {self.admission.message} "
+                        f"(~{self.admission.recording_seconds / 3600:.1f} h of recording).")
+        return True
 
-    def _setup_init_params(self) -> sl.InitParameters:
-        init_params = sl.InitParameters()
-        init_params.camera_resolution = self.config["camera_resolution"]
-        init_params.camera_fps = self.config["camera_fps"]
-        # Optionally enable real-time SVO mode if needed:
-        # init_params.svo_real_time_mode = True
-        return init_params
+    def estimate_write_bandwidth(self) -> float:
+        """
+        :return: Estimated write bandwidth of the recording cameras in bytes per second, at their
+                 session settings.
+        """
+        total = 0.0
+        for recorder in self.camera_recorders:
+            profile = resolve_camera_profile(self.config, recorder.serial_number, self.session_overrides)
+            if profile["recording_enabled"]:
+                total += self.camera_backend.estimate_write_bandwidth(
+                    resolution_name(profile["camera_resolution"]), profile["camera_fps"],
+                    profile["svo_compression"], profile["svo_bitrate_kbps"])
+        return total
 
     def discover_and_setup_devices(self):
-        # Discover available ZED cameras.
-        cameras_info = sl.Camera.get_device_list()
+        # Discover available cameras.
+        cameras_info = self.camera_backend.list_devices()
         if len(cameras_info) == 0:
-            print("❌ No ZED cameras detected.")
-        else:
-            for cam_info in cameras_info:
-                recorder = ZEDCameraRecorder(
+            logger.error(f"❌ No {self.camera_backend.name} cameras detected.")
+        if not self.check_disk(cameras_info):
+            return
+
+        # Open every camera and the GNSS sensor concurrently, each with its own timeout,
+        # so time-to-first-frame is the slowest device rather than the sum of all of them.
+        # Pooled cameras that are already open only switch their output to the new session.
+        if self.config["camera_pool"] and self.camera_pool is None:
+            self.camera_pool = CameraPool(self.camera_backend, self.config, on_camera_added=self._add_camera)
+        if self.camera_pool is not None:
+            self.camera_pool.begin_session(self.session_manager, self.session_overrides)
+        startups = []
+        for cam_info in cameras_info:
+            if self.camera_pool is not None:
+                recorder, open_fn = self.camera_pool.prepare(cam_info)
+                if recorder is None:
+                    logger.info(f"ℹ️ Camera {cam_info.serial_number} is being reopened; "
+                                f"it joins the session once it is back.")
+                    continue
+                release_fn = lambda recorder=recorder: self.camera_pool.release(recorder)
+            else:
+                recorder = self.camera_backend.create_recorder(
                     cam_info,
-                    self.init_params,
-                    self.session_manager.get_svo2_directory()  # SVO files go in the svo2 folder.
+                    self.session_manager.get_svo2_directory(),  # SVO files go in the svo2 folder.
+                    segment_index=self.session_manager.get_segment_index(cam_info.serial_number),
+                    overrides=self.session_overrides
                 )
-                if recorder.open_camera() and recorder.start_recording():
-                    self.camera_recorders.append(recorder)
-            if not self.camera_recorders:
-                print("❌ No cameras were successfully opened for recording.")
+                open_fn = lambda recorder=recorder: recorder.open_camera() and recorder.start_recording()
+                release_fn = recorder.close
+            startup = DeviceStartup(
+                "camera", str(cam_info.serial_number),
+                open_fn,
+                self.config["camera_open_timeout"],
+                release_fn=release_fn,
+                device=recorder
+            )
+            startups.append(startup)
 
         # Set up the GNSS sensor recorder.
-        self.gnss_recorder = GNSSRecorder(
-            session_dir=self.session_manager.get_gnss_directory(),  # GNSS JSON data goes in the gnss folder.
-            port=self.config["gnss_port"],
-            baudrate=self.config["gnss_baudrate"]
-        )
-        if self.gnss_recorder.open_sensor() and self.gnss_recorder.start_recording():
-            print("✅ GNSS sensor is set up and recording.")
+        gnss_startup = None
+        if self.config["gnss_enabled"]:
+            gnss_recorder = GNSSRecorder(
+                session_dir=self.session_manager.get_gnss_directory(),  # GNSS JSON data goes in the gnss folder.
+                port=self.config["gnss_port"],
+                baudrate=self.config["gnss_baudrate"],
+                gpsd_host=self.config["gpsd_host"],
+                gpsd_port=self.config["gpsd_port"],
+                queue_size=self.config["gnss_queue_size"],
+                overflow_policy=self.config["gnss_overflow_policy"],
+                batch_records=self.config["gnss_batch_records"],
+                batch_delay=self.config["gnss_batch_delay"],
+                fsync_policy=self.config["gnss_fsync_policy"],
+                fsync_interval_ms=self.config["gnss_fsync_interval_ms"],
+                log_format=self.config["gnss_log_format"]
+            )
+            gnss_startup = DeviceStartup(
+                "gnss", f"{self.config['gpsd_host']}:{self.config['gpsd_port']}",
+                lambda: gnss_recorder.open_sensor() and gnss_recorder.start_recording(),
+                self.config["gnss_open_timeout"],
+                release_fn=gnss_recorder.close,
+                device=gnss_recorder
+            )
+            startups.append(gnss_startup)
+
+        self.startup_report = start_devices(startups)
+        logger.info(format_startup_report(self.startup_report))
+
+        for startup in self.startup_report:
+            if startup.status != STATUS_OK:
+                continue
+            if startup is gnss_startup:
+                self.gnss_recorder = gnss_recorder
+            else:
+                self.camera_recorders.append(startup.device)
+        if cameras_info and not self.camera_recorders:
+            logger.error("❌ No cameras were successfully opened for recording.")
+        if self.camera_pool is not None:
+            self.camera_pool.record_switch_gap()
+        if gnss_startup is None:
+            logger.info("ℹ️ GNSS recording disabled.")
+        elif self.gnss_recorder is not None:
+            logger.info("✅ GNSS sensor is set up and recording.")
         else:
-            print("❌ GNSS sensor failed to start recording.")
+            logger.error("❌ GNSS sensor failed to start recording.")
+            # A timed-out open may still be blocked waiting for a fix; stop its reader thread.
+            gnss_recorder.gpsd_reader.stop_thread()
 
     def start_recording(self):
+        # The manifest records the settings this session recorded with, downgrade included.
+        self.manifest = SessionManifest(self.session_manager.get_session_directory(),
+                                        {**self.config, **self.session_overrides},
+                                        interval=self.config["manifest_interval"])
         for recorder in self.camera_recorders:
-            recorder.start_grabbing()
+            self.manifest.add_camera(recorder)
+        if self.gnss_recorder:
+            self.manifest.set_gnss(self.gnss_recorder)
+        self.manifest.start()
+        if self.camera_pool is None:  # Pooled cameras are already grabbing.
+            for recorder in self.camera_recorders:
+                if self.config["preview_fps"] > 0:
+                    recorder.enable_preview(self.config["preview_width"], self.config["preview_fps"])
+                recorder.start_grabbing()
         if self.gnss_recorder:
             self.gnss_recorder.start_logging()
-        print("🎥 Recording started. Press Enter to stop recording...")
+        # Free space is watched whatever the admission policy; "off" only skips the preflight.
+        self.disk_monitor = DiskMonitor(
+            self.session_manager.get_session_directory(),
+            self.admission.required_bps if self.admission is not None else self.estimate_write_bandwidth(),
+            interval=self.config["disk_check_interval"],
+            warn_minutes=self.config["disk_warn_minutes"]
+        )
+        self.disk_monitor.start()
+        self.telemetry = TelemetryCollector(self, interval=self.config["telemetry_interval"])
+        self.telemetry.start()
+        if self.config["metrics_port"] and self.metrics_server is None:
+            from .metrics_server import MetricsServer  # http.server is only imported when enabled.
+            self.metrics_server = MetricsServer(self.get_telemetry_snapshot, self.config["metrics_host"],
+                                                self.config["metrics_port"])
+            self.metrics_server.start()
+        logger.info("🎥 Recording started.")
+
+    def _add_camera(self, recorder) -> None:
+        # A pooled camera that was lost and reopened rejoins the running session.
+        self.camera_recorders.append(recorder)
+        if self.manifest is not None:
+            self.manifest.add_camera(recorder)
 
     def stop_recording(self):
-        for recorder in self.camera_recorders:
-            recorder.stop()
-        for recorder in self.camera_recorders:
-            recorder.join()
+        """
+        Stops the session's devices. Also releases devices that were set up but never started,
+        after a failed or cancelled start_recording().
+        """
+        if self.camera_pool is not None:
+            self.camera_pool.end_session()  # Cameras keep grabbing for the next session.
+        else:
+            for recorder in self.camera_recorders:
+                recorder.stop()
+            for recorder in self.camera_recorders:
+                if recorder.thread is not None:
+                    recorder.join()
+                else:
+                    recorder.close()
         if self.gnss_recorder:
-            self.gnss_recorder.stop()
-            self.gnss_recorder.join()
-        print("🛑 Recording stopped.")
-        print("💾 SVO files saved in:", self.session_manager.get_svo2_directory())
-        print("💾 GNSS data saved in:", self.session_manager.get_gnss_directory())
+            if self.gnss_recorder.thread is not None:
+                self.gnss_recorder.stop()
+                self.gnss_recorder.join()
+            else:
+                self.gnss_recorder.close()
+        if self.telemetry is not None:
+            self.telemetry.stop()  # Keeps its final snapshot in telemetry.latest.
+        if self.disk_monitor is not None:
+            self.disk_monitor.stop()
+            self.disk_monitor = None
+        if self.manifest is not None:
+            self.manifest.finalize()
+            self.manifest = None
+        logger.info("🛑 Recording stopped.")
+        logger.info(f"💾 SVO files saved in: {self.session_manager.get_svo2_directory()}")
+        logger.info(f"💾 GNSS data saved in: {self.session_manager.get_gnss_directory()}")
+
+    def new_session(self) -> None:
+        """
+        Prepares the next session after stop_recording(): creates a new session folder and forgets the
+        previous session's devices, keeping the configuration, the last telemetry snapshot, the
+        metrics endpoint and the camera pool, so one controller can record back-to-back sessions
+        (see control_daemon.py).
+        """
+        if self.manifest is not None:
+            raise RuntimeError("new_session() called while a session is recording")
+        self.camera_recorders = []
+        self.gnss_recorder = None
+        self.startup_report = []
+        self.admission = None
+        self.session_overrides = {}
+        self.session_manager = RecordingSessionManager(self.config["results_dir"])
+
+    def get_telemetry_snapshot(self) -> dict:
+        """:return: Latest TelemetryCollector snapshot, None before the first recording."""
+        return None if self.telemetry is None else self.telemetry.latest
+
+    def shutdown(self) -> None:
+        """
+        Closes the pooled cameras and stops the metrics endpoint; call once the controller is no
+        longer used.
+        """
+        if self.camera_pool is not None:
+            self.camera_pool.close()
+            self.camera_pool = None
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
 
     def run(self):
         self.discover_and_setup_devices()
         if not self.camera_recorders and not self.gnss_recorder:
             return
         self.start_recording()
+        logger.info("⌨️ Press Enter to stop recording...")
         input()  # Wait for user input to stop.
         self.stop_recording()
+        self.shutdown()
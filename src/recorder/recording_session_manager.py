@@ -1,5 +1,10 @@
+import logging
 import os
 from datetime import datetime
+from .segment_index import SegmentIndex, SEGMENT_INDEX_SUFFIX
+
+logger = logging.getLogger(__name__)
+
 
 class RecordingSessionManager:
     def __init__(self, base_dir: str = None):
@@ -13,6 +18,7 @@ class RecordingSessionManager:
         self.session_dir = self._create_session_directory()
         self.svo2_dir = self._create_subdirectory("svo2")
         self.gnss_dir = self._create_subdirectory("gnss")
+        self.segment_indexes = {}  # Camera serial number -> SegmentIndex.
 
     def _create_session_directory(self) -> str:
         # Ensure the base directory exists, then create a unique session folder.
@@ -20,15 +26,23 @@ class RecordingSessionManager:
             os.mkdir(self.base_dir)
         timestamp_folder = datetime.now().strftime("recording_%Y%m%d_%H%M%S")
         session_dir = os.path.join(self.base_dir, timestamp_folder)
-        os.mkdir(session_dir)
-        print(f"📁 Recording session folder created at: {session_dir}")
+        # Back-to-back sessions (daemon splits) can start within the same second.
+        suffix = 1
+        while True:
+            try:
+                os.mkdir(session_dir)
+                break
+            except FileExistsError:
+                suffix += 1
+                session_dir = os.path.join(self.base_dir, f"{timestamp_folder}-{suffix}")
+        logger.info(f"📁 Recording session folder created at: {session_dir}")
         return session_dir
 
     def _create_subdirectory(self, subdirname: str) -> str:
         subdirectory = os.path.join(self.session_dir, subdirname)
         if not os.path.exists(subdirectory):
             os.mkdir(subdirectory)
-            print(f"📁 Subdirectory '{subdirname}' created at: {subdirectory}")
+            logger.info(f"📁 Subdirectory '{subdirname}' created at: {subdirectory}")
         return subdirectory
 
     def get_session_directory(self) -> str:
@@ -39,3 +53,12 @@ class RecordingSessionManager:
 
     def get_gnss_directory(self) -> str:
         return self.gnss_dir
+
+    def get_segment_index(self, serial_number: int) -> SegmentIndex:
+        """
+        :return: The SVO segment index of a camera (camera_<serial>.segments.json in the svo2 folder).
+        """
+        if serial_number not in self.segment_indexes:
+            file_path = os.path.join(self.svo2_dir, f"camera_{serial_number}{SEGMENT_INDEX_SUFFIX}")
+            self.segment_indexes[serial_number] = SegmentIndex(file_path, serial_number)
+        return self.segment_indexes[serial_number]
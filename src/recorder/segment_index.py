@@ -0,0 +1,82 @@
+import json
+import os
+import time
+
+SEGMENT_INDEX_SUFFIX = ".segments.json"
+SEGMENT_INDEX_VERSION = 1
+
+# Segment states.
+SEGMENT_RECORDING = "recording"  # Still being written; do not process.
+SEGMENT_CLOSED = "closed"        # Finalized; safe to read, copy or offload.
+
+
+class SegmentIndex:
+    def __init__(self, file_path: str, serial_number: int):
+        """
+        Per-camera list of SVO segments, rewritten atomically whenever a segment opens or closes,
+        so downstream tools can pick up closed segments while recording continues.
+        :param file_path: Index file (conventionally camera_<serial>.segments.json, next to the SVOs).
+        :param serial_number: Serial number of the camera the segments belong to.
+        """
+        self.file_path = file_path
+        self.serial_number = serial_number
+        self.segments = []
+
+    def open_segment(self, file_name: str, first_frame: int, rollover_ms: float = None) -> dict:
+        """
+        Records the start of a segment.
+        :param file_name: SVO file name, relative to the index directory.
+        :param first_frame: Frame index (as in the .frames sidecar) of the segment's first frame.
+        :param rollover_ms: Time spent closing the previous segment and opening this one.
+        """
+        segment = {
+            "segment": len(self.segments),
+            "file": file_name,
+            "status": SEGMENT_RECORDING,
+            "opened_at": time.time(),
+            "closed_at": None,
+            "first_frame": first_frame,
+            "frame_count": 0,
+            "start_timestamp_ns": None,
+            "end_timestamp_ns": None,
+            "bytes": None,
+            "rollover_ms": rollover_ms,
+        }
+        self.segments.append(segment)
+        self.save()
+        return segment
+
+    def close_segment(self, frame_count: int, start_timestamp_ns: int, end_timestamp_ns: int) -> dict:
+        """
+        Marks the current segment closed, with its frame count, camera timestamp range and final size.
+        """
+        segment = self.segments[-1]
+        segment["status"] = SEGMENT_CLOSED
+        segment["closed_at"] = time.time()
+        segment["frame_count"] = frame_count
+        segment["start_timestamp_ns"] = start_timestamp_ns
+        segment["end_timestamp_ns"] = end_timestamp_ns
+        file_path = os.path.join(os.path.dirname(self.file_path), segment["file"])
+        segment["bytes"] = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self.save()
+        return segment
+
+    def save(self) -> None:
+        # Write to a temporary file and rename, so readers never see a partial index.
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"version": SEGMENT_INDEX_VERSION, "serial_number": self.serial_number,
+                       "segments": self.segments}, f, indent=2)
+        os.replace(temp_path, self.file_path)
+
+
+def load_segment_index(file_path: str, closed_only: bool = False) -> list:
+    """
+    :param closed_only: Only return finalized segments.
+    :return: Segment dicts of a camera_<serial>.segments.json file, in recording order.
+    """
+    with open(file_path, "r") as f:
+        segments = json.load(f)["segments"]
+    if closed_only:
+        segments = [segment for segment in segments if segment["status"] == SEGMENT_CLOSED]
+    return segments
@@ -0,0 +1,327 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+import numpy as np
+from .gnss_track import GNSSTrack
+from .record_file import RecordFileError
+from .session_manifest import MANIFEST_FILENAME
+
+CATALOG_FILENAME = "session_catalog.sqlite"
+CATALOG_VERSION = 1
+
+# Edge of the coarse spatial tiles, in degrees (0.01 deg is ~1.1 km of latitude).
+DEFAULT_TILE_DEGREES = 0.01
+
+SESSION_FOLDER_FORMAT = "recording_%Y%m%d_%H%M%S"
+_CAMERA_FILE = re.compile(r"camera_(\d+)[._]")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    start_time REAL,
+    end_time REAL,
+    min_lat REAL,
+    min_lon REAL,
+    max_lat REAL,
+    max_lon REAL,
+    fix_count INTEGER NOT NULL,
+    manifest_status TEXT,
+    scanned_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start_time);
+CREATE INDEX IF NOT EXISTS sessions_end ON sessions (end_time);
+CREATE TABLE IF NOT EXISTS session_tiles (
+    tile_lat INTEGER NOT NULL,
+    tile_lon INTEGER NOT NULL,
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    PRIMARY KEY (tile_lat, tile_lon, session_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS session_tiles_session ON session_tiles (session_id);
+CREATE TABLE IF NOT EXISTS session_cameras (
+    serial_number INTEGER NOT NULL,
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    PRIMARY KEY (serial_number, session_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS session_cameras_session ON session_cameras (session_id);
+"""
+
+
+def is_session_directory(path: str) -> bool:
+    """:return: Whether `path` looks like a folder created by RecordingSessionManager."""
+    return (os.path.isdir(os.path.join(path, "gnss")) or os.path.isdir(os.path.join(path, "svo2"))
+            or os.path.isfile(os.path.join(path, MANIFEST_FILENAME)))
+
+
+def session_signature(session_dir: str) -> str:
+    """
+    Cheap change detector: a digest of the name, size and modification time of every file in the
+    session folder and its svo2 / gnss subfolders. Only stat() calls, no file is read.
+    """
+    entries = []
+    for folder in (session_dir, os.path.join(session_dir, "svo2"), os.path.join(session_dir, "gnss")):
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        stat = entry.stat()
+                        entries.append(f"{os.path.relpath(entry.path, session_dir)}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            continue
+    entries.sort()
+    return hashlib.sha1("\n".join(entries).encode()).hexdigest()
+
+
+def _folder_time(session_dir: str):
+    try:
+        # Sessions started within the same second get a "-2", "-3", ... suffix.
+        name = os.path.basename(os.path.normpath(session_dir)).split("-")[0]
+        return datetime.strptime(name, SESSION_FOLDER_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+
+def summarize_session(session_dir: str, tile_degrees: float = DEFAULT_TILE_DEGREES) -> dict:
+    """
+    Reads what the catalog stores about one session: time range and bounding box of the GNSS track,
+    the coarse tiles the track passes through, and the camera serial numbers.
+    The time range falls back to the camera timestamps in the manifest, then to the folder name,
+    when the session has no GNSS fixes.
+    """
+    summary = {"start_time": None, "end_time": None, "bbox": None, "fix_count": 0, "tiles": [],
+               "serial_numbers": set(), "manifest_status": None}
+
+    manifest = None
+    try:
+        with open(os.path.join(session_dir, MANIFEST_FILENAME), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if manifest is not None:
+        summary["manifest_status"] = manifest.get("status")
+        summary["serial_numbers"].update(camera["serial_number"] for camera in manifest.get("cameras", []))
+    try:
+        names = os.listdir(os.path.join(session_dir, "svo2"))
+    except OSError:
+        names = []
+    for name in names:
+        match = _CAMERA_FILE.match(name)
+        if match:
+            summary["serial_numbers"].add(int(match.group(1)))
+
+    try:
+        track = GNSSTrack.from_session(os.path.join(session_dir, "gnss"))
+    except (OSError, ValueError, RecordFileError):
+        track = None  # No GNSS log, or an unreadable one.
+    if track is not None and len(track):
+        summary["fix_count"] = len(track)
+        summary["start_time"] = float(track.timestamps[0])
+        summary["end_time"] = float(track.timestamps[-1])
+        summary["bbox"] = (float(track.latitude.min()), float(track.longitude.min()),
+                           float(track.latitude.max()), float(track.longitude.max()))
+        tiles = np.stack((np.floor(track.latitude / tile_degrees), np.floor(track.longitude / tile_degrees)),
+                         axis=1).astype(np.int64)
+        summary["tiles"] = [tuple(tile) for tile in np.unique(tiles, axis=0).tolist()]
+    elif manifest is not None:
+        starts = [c["first_timestamp_ns"] for c in manifest.get("cameras", []) if c.get("first_timestamp_ns")]
+        ends = [c["last_timestamp_ns"] for c in manifest.get("cameras", []) if c.get("last_timestamp_ns")]
+        if starts and ends:
+            summary["start_time"] = min(starts) / 1e9
+            summary["end_time"] = max(ends) / 1e9
+    if summary["start_time"] is None:
+        summary["start_time"] = summary["end_time"] = _folder_time(session_dir)
+    return summary
+
+
+class SessionCatalog:
+    def __init__(self, db_path: str, tile_degrees: float = DEFAULT_TILE_DEGREES):
+        """
+        SQLite index of recording sessions, answering time range, bounding box and camera serial
+        queries without opening any session. Kept up to date with scan().
+        :param db_path: Catalog database file, created if missing.
+        :param tile_degrees: Spatial tile size of a new catalog; an existing catalog keeps its own.
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute("INSERT OR IGNORE INTO catalog_info VALUES ('version', ?)", (str(CATALOG_VERSION),))
+            self.connection.execute("INSERT OR IGNORE INTO catalog_info VALUES ('tile_degrees', ?)", (repr(tile_degrees),))
+        info = dict(self.connection.execute("SELECT key, value FROM catalog_info").fetchall())
+        if int(info["version"]) != CATALOG_VERSION:
+            raise ValueError(f"Catalog {db_path} has version {info['version']}, expected {CATALOG_VERSION}")
+        self.tile_degrees = float(info["tile_degrees"])
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def store_session(self, session_dir: str, signature: str, summary: dict) -> None:
+        """
+        Inserts or replaces one session (and its tiles and cameras) in a single transaction.
+        :param summary: As returned by summarize_session().
+        """
+        path = os.path.abspath(session_dir)
+        bbox = summary["bbox"] or (None, None, None, None)
+        with self.connection:
+            self.connection.execute("DELETE FROM sessions WHERE path = ?", (path,))
+            cursor = self.connection.execute(
+                "INSERT INTO sessions (path, name, signature, start_time, end_time, min_lat, min_lon, max_lat, "
+                "max_lon, fix_count, manifest_status, scanned_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, os.path.basename(path), signature, summary["start_time"], summary["end_time"], *bbox,
+                 summary["fix_count"], summary["manifest_status"], time.time()))
+            session_id = cursor.lastrowid
+            self.connection.executemany("INSERT INTO session_tiles VALUES (?, ?, ?)",
+                                        ((tile_lat, tile_lon, session_id) for tile_lat, tile_lon in summary["tiles"]))
+            self.connection.executemany("INSERT INTO session_cameras VALUES (?, ?)",
+                                        ((serial, session_id) for serial in summary["serial_numbers"]))
+
+    def scan(self, results_dir: str) -> dict:
+        """
+        Incrementally indexes every session folder directly under `results_dir`: sessions whose
+        signature is unchanged since the last scan are skipped, and catalogued sessions whose folder
+        is gone are removed.
+        :return: Counts of added, updated, unchanged and removed sessions.
+        """
+        results_dir = os.path.abspath(results_dir)
+        known = dict(self.connection.execute(
+            "SELECT path, signature FROM sessions WHERE path LIKE ? ESCAPE '\\'",
+            (_like_prefix(results_dir + os.sep),)).fetchall())
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+        for name in sorted(os.listdir(results_dir)):
+            session_dir = os.path.join(results_dir, name)
+            if not is_session_directory(session_dir):
+                continue
+            seen.add(session_dir)
+            signature = session_signature(session_dir)
+            if known.get(session_dir) == signature:
+                counts["unchanged"] += 1
+                continue
+            self.store_session(session_dir, signature, summarize_session(session_dir, self.tile_degrees))
+            counts["updated" if session_dir in known else "added"] += 1
+        removed = [(path,) for path in known if path not in seen
+                   and os.path.dirname(path) == results_dir]  # Leave nested folders to their own scan.
+        with self.connection:
+            self.connection.executemany("DELETE FROM sessions WHERE path = ?", removed)
+        counts["removed"] = len(removed)
+        return counts
+
+    def _tile_range(self, min_value: float, max_value: float) -> tuple:
+        return math.floor(min_value / self.tile_degrees), math.floor(max_value / self.tile_degrees)
+
+    def query(self, start: float = None, end: float = None, bbox: tuple = None, serial_number: int = None,
+              limit: int = None) -> list:
+        """
+        Finds sessions matching every given filter, oldest first.
+        :param start: Sessions ending at or after this time (Unix seconds).
+        :param end: Sessions starting at or before this time (Unix seconds).
+        :param bbox: (min_lat, min_lon, max_lat, max_lon); sessions whose track passes through a tile
+                     overlapping it. Tiles are coarse, so a track passing within one tile of the box
+                     may match; sessions without GNSS never match.
+        :param serial_number: Sessions recorded with this camera.
+        :return: List of dicts with the sessions table columns.
+        """
+        conditions, parameters = [], []
+        if start is not None:
+            conditions.append("end_time >= ?")
+            parameters.append(start)
+        if end is not None:
+            conditions.append("start_time <= ?")
+            parameters.append(end)
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            conditions.append("id IN (SELECT session_id FROM session_tiles "
+                              "WHERE tile_lat BETWEEN ? AND ? AND tile_lon BETWEEN ? AND ?)")
+            parameters.extend(self._tile_range(min_lat, max_lat) + self._tile_range(min_lon, max_lon))
+        if serial_number is not None:
+            conditions.append("id IN (SELECT session_id FROM session_cameras WHERE serial_number = ?)")
+            parameters.append(serial_number)
+        sql = "SELECT * FROM sessions"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY start_time"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def get_serial_numbers(self, session_id: int) -> list:
+        return [row[0] for row in self.connection.execute(
+            "SELECT serial_number FROM session_cameras WHERE session_id = ? ORDER BY serial_number", (session_id,))]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def _like_prefix(prefix: str) -> str:
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _parse_time(value: str) -> float:
+    """Parses an ISO date or date-time (local time unless it has an offset) to Unix seconds."""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _format_time(value) -> str:
+    return "-" if value is None else datetime.fromtimestamp(value).isoformat(sep=" ", timespec="seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index recording sessions and query the index.")
+    parser.add_argument("--results-dir", default=os.path.join(os.getcwd(), "results"),
+                        help="Folder containing the recording_* session folders.")
+    parser.add_argument("--catalog", help=f"Catalog database (default: <results-dir>/{CATALOG_FILENAME}).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("scan", help="Add new and changed sessions to the catalog.")
+    query = commands.add_parser("query", help="List catalogued sessions matching every filter.")
+    query.add_argument("--start", type=_parse_time, help="ISO date/time; sessions ending after it.")
+    query.add_argument("--end", type=_parse_time, help="ISO date/time; sessions starting before it.")
+    query.add_argument("--bbox", type=float, nargs=4, metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"),
+                       help="Sessions whose GNSS track passes through this box.")
+    query.add_argument("--serial", type=int, help="Sessions recorded with this camera.")
+    query.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    with SessionCatalog(args.catalog or os.path.join(args.results_dir, CATALOG_FILENAME)) as catalog:
+        if args.command == "scan":
+            start = time.monotonic()
+            counts = catalog.scan(args.results_dir)
+            print(f"✅ Scanned {args.results_dir} in {time.monotonic() - start:.2f} s: {counts['added']} added, "
+                  f"{counts['updated']} updated, {counts['unchanged']} unchanged, {counts['removed']} removed "
+                  f"({len(catalog)} sessions catalogued).")
+            return
+        sessions = catalog.query(args.start, args.end, args.bbox, args.serial, args.limit)
+        for session in sessions:
+            bbox = "no GNSS" if session["min_lat"] is None else (
+                f"lat {session['min_lat']:.5f}..{session['max_lat']:.5f} "
+                f"lon {session['min_lon']:.5f}..{session['max_lon']:.5f}")
+            serials = ",".join(str(serial) for serial in catalog.get_serial_numbers(session["id"])) or "-"
+            print(f"{session['path']}  {_format_time(session['start_time'])} -> {_format_time(session['end_time'])}  "
+                  f"{bbox}  cameras {serials}")
+        print(f"📋 {len(sessions)} session(s) found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "session_manifest.json"
+MANIFEST_VERSION = 1
+
+# Manifest states.
+MANIFEST_RECORDING = "recording"  # Periodic snapshot; the session is still running (or was interrupted).
+MANIFEST_COMPLETE = "complete"    # Written by finalize() after every recorder stopped.
+
+# Files whose bytes are only ever appended; their checksums can be extended as they grow.
+APPEND_ONLY_SUFFIXES = (".svo", ".svo2")
+
+# Bytes at the start of a tailed file re-read at finalize() to detect in-place header updates.
+_HEAD_CHECK_BYTES = 64 * 1024
+
+
+def sha256_file(file_path: str, chunk_bytes: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class TailHasher:
+    def __init__(self, file_path: str):
+        """
+        Incremental SHA-256 of a file written by someone else (e.g. the ZED SDK writing an SVO):
+        each update() hashes only the bytes appended since the previous call.
+        :param file_path: File to follow.
+        """
+        self.file_path = file_path
+        self.bytes_hashed = 0
+        self._sha256 = hashlib.sha256()
+        self._head = b""
+
+    def update(self, chunk_bytes: int = 4 * 1024 * 1024) -> None:
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            return
+        if size <= self.bytes_hashed:
+            return
+        with open(self.file_path, "rb") as f:
+            f.seek(self.bytes_hashed)
+            while self.bytes_hashed < size:
+                chunk = f.read(min(chunk_bytes, size - self.bytes_hashed))
+                if not chunk:
+                    break
+                if len(self._head) < _HEAD_CHECK_BYTES:
+                    self._head += chunk[:_HEAD_CHECK_BYTES - len(self._head)]
+                self._sha256.update(chunk)
+                self.bytes_hashed += len(chunk)
+
+    def finalize(self) -> tuple:
+        """
+        Hashes the remaining bytes. If the writer rewrote the start of the file after it was hashed
+        (or truncated it), falls back to hashing the whole file once.
+        :return: (size, SHA-256 hex digest).
+        """
+        self.update()
+        size = os.path.getsize(self.file_path)
+        with open(self.file_path, "rb") as f:
+            head = f.read(len(self._head))
+        if size != self.bytes_hashed or head != self._head:
+            return size, sha256_file(self.file_path)
+        return self.bytes_hashed, self._sha256.hexdigest()
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+class SessionManifest:
+    def __init__(self, session_dir: str, config: dict, interval: float = 5.0):
+        """
+        Session manifest (session_manifest.json), written while the session records: per-file byte
+        counts and SHA-256 checksums computed as data is written, frame and fix counts, first and
+        last timestamps, device serials and the controller config. Rewritten atomically every
+        `interval` seconds, so an interrupted session keeps an accurate partial manifest.
+        :param session_dir: Session folder; file paths in the manifest are relative to it.
+        :param config: Controller configuration, stored in the manifest.
+        :param interval: Seconds between manifest updates.
+        """
+        self.session_dir = session_dir
+        self.file_path = os.path.join(session_dir, MANIFEST_FILENAME)
+        self.config = config
+        self.interval = interval
+        self.camera_recorders = []
+        self.gnss_recorder = None
+        self.created_at = time.time()
+        self.status = MANIFEST_RECORDING
+        self._tails = {}  # Relative path -> TailHasher.
+        self._final_files = {}  # Relative path -> file entry, once finalized.
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread = None
+
+    def add_camera(self, recorder) -> None:
+        self.camera_recorders.append(recorder)
+
+    def set_gnss(self, gnss_recorder) -> None:
+        self.gnss_recorder = gnss_recorder
+
+    def start(self) -> None:
+        self.write()
+        self.thread = threading.Thread(target=self._run, name="session-manifest", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def _relative(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.session_dir).replace(os.sep, "/")
+
+    def _camera_files(self, recorder) -> list:
+        prefixes = (f"camera_{recorder.serial_number}.", f"camera_{recorder.serial_number}_")
+        try:
+            names = os.listdir(recorder.session_dir)
+        except OSError:
+            return []
+        return sorted(os.path.join(recorder.session_dir, name) for name in names
+                      if name.startswith(prefixes) and not name.endswith(".tmp"))
+
+    def _file_entries(self, final: bool) -> dict:
+        files = dict(self._final_files)
+        for recorder in self.camera_recorders:
+            for file_path in self._camera_files(recorder):
+                relative = self._relative(file_path)
+                if relative in files:
+                    continue
+                if file_path.endswith(APPEND_ONLY_SUFFIXES):
+                    tail = self._tails.setdefault(relative, TailHasher(file_path))
+                    if final:
+                        size, digest = tail.finalize()
+                    else:
+                        tail.update()
+                        size, digest = tail.bytes_hashed, tail.hexdigest()
+                elif final:
+                    # Sidecars and indexes are updated in place while recording; hash them once, at the end.
+                    size, digest = os.path.getsize(file_path), sha256_file(file_path)
+                else:
+                    size, digest = None, None
+                files[relative] = {"bytes": size, "sha256": digest, "complete": final,
+                                   "serial_number": recorder.serial_number}
+        if self.gnss_recorder is not None:
+            for file_path, size, digest in self.gnss_recorder.get_output_checksums():
+                files[self._relative(file_path)] = {"bytes": size, "sha256": digest, "complete": final,
+                                                    "device": "gnss"}
+        if final:
+            self._final_files = files
+        return files
+
+    def _cameras(self) -> list:
+        cameras = []
+        for recorder in self.camera_recorders:
+            # A pooled camera keeps grabbing once detached; count only the frames of this session.
+            metrics = getattr(recorder, "session_metrics", None) or recorder.metrics.snapshot()
+            cameras.append({
+                "serial_number": recorder.serial_number,
+                "recording_enabled": getattr(recorder, "recording_enabled", True),
+                "frames": metrics["frames_grabbed"],
+                "grab_errors": metrics["grab_errors"],
+                "dropped_frames": metrics["dropped_frames"],
+                "first_timestamp_ns": metrics["first_camera_timestamp_ns"],
+                "last_timestamp_ns": metrics["last_camera_timestamp_ns"],
+            })
+        return cameras
+
+    def _gnss(self) -> dict:
+        if self.gnss_recorder is None:
+            return None
+        reader = self.gnss_recorder.gpsd_reader
+        return {
+            "gpsd": f"{reader.host}:{reader.port}",
+            "fixes": self.gnss_recorder.records_written,
+            "first_timestamp": self.gnss_recorder.first_fix_time,
+            "last_timestamp": self.gnss_recorder.last_fix_time,
+        }
+
+    def write(self, final: bool = False) -> None:
+        """
+        Refreshes checksums and counts and atomically rewrites the manifest.
+        """
+        with self._lock:
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "status": MANIFEST_COMPLETE if final else self.status,
+                "created_at": self.created_at,
+                "updated_at": time.time(),
+                "config": self.config,
+                "cameras": self._cameras(),
+                "gnss": self._gnss(),
+                "files": self._file_entries(final),
+            }
+            if final:
+                self.status = MANIFEST_COMPLETE
+            temp_path = self.file_path + ".tmp"
+            with open(temp_path, "w") as f:
+                # Config values may be SDK enums; store them by name.
+                json.dump(manifest, f, indent=2, default=lambda value: getattr(value, "name", str(value)))
+            os.replace(temp_path, self.file_path)
+
+    def finalize(self) -> None:
+        """
+        Stops periodic updates and writes the complete manifest. Call after every recorder stopped.
+        """
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.write(final=True)
+        logger.info(f"📝 Session manifest written to {self.file_path}")
+
+
+def verify_manifest(session_dir: str, quick: bool = False) -> list:
+    """
+    Checks every file listed in a session manifest.
+    :param quick: Only compare sizes, without reading the files.
+    :return: List of problems, empty if the session matches its manifest.
+    """
+    with open(os.path.join(session_dir, MANIFEST_FILENAME), "r") as f:
+        manifest = json.load(f)
+    problems = []
+    if manifest["status"] != MANIFEST_COMPLETE:
+        problems.append(f"manifest is partial (status {manifest['status']!r}): the session was interrupted")
+    for relative, entry in manifest["files"].items():
+        file_path = os.path.join(session_dir, relative)
+        if not os.path.exists(file_path):
+            problems.append(f"{relative}: missing")
+            continue
+        size = os.path.getsize(file_path)
+        if entry["bytes"] is None:
+            continue
+        if size < entry["bytes"] or (entry["complete"] and size != entry["bytes"]):
+            problems.append(f"{relative}: {size} bytes, manifest says {entry['bytes']}")
+            continue
+        if quick or entry["sha256"] is None:
+            continue
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            # A partial manifest checksums the first entry["bytes"] bytes only.
+            remaining = entry["bytes"]
+            while remaining:
+                chunk = f.read(min(1024 * 1024, remaining))
+                if not chunk:
+                    break
+                sha256.update(chunk)
+                remaining -= len(chunk)
+        if sha256.hexdigest() != entry["sha256"]:
+            problems.append(f"{relative}: checksum mismatch")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify a recording session against its manifest.")
+    parser.add_argument("session_dir", help="Session folder containing session_manifest.json.")
+    parser.add_argument("--quick", action="store_true", help="Only compare file sizes.")
+    args = parser.parse_args()
+    problems = verify_manifest(args.session_dir, args.quick)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"✅ {args.session_dir} matches its manifest.")
+
+
+if __name__ == "__main__":
+    main()
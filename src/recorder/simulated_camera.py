@@ -0,0 +1,307 @@
+import enum
+import logging
+import random
+import time
+from .grabbing_recorder import GrabbingCameraRecorder
+from .camera_profiles import resolve_camera_profile
+
+logger = logging.getLogger(__name__)
+
+# Sensor sizes of the ZED resolutions, by sl.RESOLUTION name.
+RESOLUTIONS = {
+    "HD2K": (2208, 1242),
+    "HD1080": (1920, 1080),
+    "HD1200": (1920, 1200),
+    "HD720": (1280, 720),
+    "SVGA": (960, 600),
+    "VGA": (672, 376),
+}
+
+
+class SimulatedErrorCode(enum.Enum):
+    # Member names follow sl.ERROR_CODE so metrics and logs read the same as with real hardware.
+    CORRUPTED_FRAME = -2
+    CAMERA_REBOOTING = -1
+    SUCCESS = 0
+    FAILURE = 1
+    CAMERA_NOT_DETECTED = 4
+    INVALID_RESOLUTION = 12
+
+
+class SimulatedCameraInfo:
+    def __init__(self, serial_number: int):
+        # Mirrors the sl.CameraInformation attributes the recorders use.
+        self.serial_number = serial_number
+        self.camera_model = "SIMULATED"
+
+
+class SimulatedInitParameters:
+    def __init__(self, camera_resolution="HD1200", camera_fps: int = 30):
+        self.camera_resolution = camera_resolution
+        self.camera_fps = camera_fps
+
+
+class SimulatedRecordingParameters:
+    def __init__(self, video_filename: str, compression_mode: str = "H264", bitrate: int = 0):
+        self.video_filename = video_filename
+        self.compression_mode = compression_mode
+        self.bitrate = bitrate  # kbit/s, 0 = the camera's default.
+
+
+class SimulatedTimestamp:
+    def __init__(self, nanoseconds: int):
+        self.nanoseconds = nanoseconds
+
+    def get_nanoseconds(self) -> int:
+        return self.nanoseconds
+
+    def get_microseconds(self) -> int:
+        return self.nanoseconds // 1000
+
+
+class SimulatedCamera:
+    def __init__(self, serial_number: int, open_latency: float = 0.0, grab_latency: float = 0.0,
+                 latency_jitter: float = 0.0, error_rate: float = 0.0, error_code: str = "CORRUPTED_FRAME",
+                 bitrate_mbps: float = 0.0, seed: int = None, disconnected: set = None):
+        """
+        Stand-in for sl.Camera: produces synthetic frames at the configured resolution and fps.
+        :param serial_number: Serial number reported for the camera.
+        :param open_latency: Seconds open() takes.
+        :param grab_latency: Mean extra seconds grab() spends after a frame is due (processing time).
+        :param latency_jitter: Standard deviation of that extra time.
+        :param error_rate: Probability that a grab() fails with error_code.
+        :param error_code: SimulatedErrorCode member name returned by injected failures.
+        :param bitrate_mbps: Dummy SVO payload written per second while recording (0 = write nothing).
+        :param seed: Seed for the latency and error generator.
+        :param disconnected: Serial numbers currently unplugged (see SimulatedCameraBackend.disconnect).
+        """
+        self.serial_number = serial_number
+        self.open_latency = open_latency
+        self.grab_latency = grab_latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_code = SimulatedErrorCode[error_code]
+        self.bitrate_mbps = bitrate_mbps
+        self._random = random.Random(seed if seed is not None else serial_number)
+        self._disconnected = disconnected if disconnected is not None else set()
+        self.width = self.height = 0
+        self.fps = 0
+        self.frame = None
+        self.frames_produced = 0
+        self._period = 0.0
+        self._next_frame_at = 0.0
+        self._timestamp_ns = 0
+        self._is_open = False
+        self._record_file = None
+        self._payload = b""
+        self._preview_pattern = None
+
+    def open(self, init_params) -> SimulatedErrorCode:
+        time.sleep(self.open_latency)
+        if self.serial_number in self._disconnected:
+            return SimulatedErrorCode.CAMERA_NOT_DETECTED
+        resolution = init_params.camera_resolution
+        name = resolution if isinstance(resolution, str) else resolution.name
+        if name not in RESOLUTIONS or not init_params.camera_fps:
+            return SimulatedErrorCode.INVALID_RESOLUTION
+        self.width, self.height = RESOLUTIONS[name]
+        self.fps = init_params.camera_fps
+        self._period = 1.0 / self.fps
+        # One preallocated BGRA image, like the ZED's left view; grab() only stamps the frame counter into it.
+        self.frame = bytearray(self.width * self.height * 4)
+        self._next_frame_at = time.monotonic() + self._period
+        self._is_open = True
+        return SimulatedErrorCode.SUCCESS
+
+    def is_opened(self) -> bool:
+        return self._is_open
+
+    def enable_recording(self, recording_params) -> SimulatedErrorCode:
+        if not self._is_open:
+            return SimulatedErrorCode.CAMERA_NOT_DETECTED
+        self._record_file = open(recording_params.video_filename, "wb")
+        bitrate_mbps = recording_params.bitrate / 1000 if recording_params.bitrate else self.bitrate_mbps
+        bytes_per_frame = int(bitrate_mbps * 1e6 / 8 / self.fps)
+        self._payload = bytes(bytes_per_frame)
+        return SimulatedErrorCode.SUCCESS
+
+    def disable_recording(self) -> None:
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+
+    def grab(self, runtime=None) -> SimulatedErrorCode:
+        if not self._is_open:
+            return SimulatedErrorCode.CAMERA_NOT_DETECTED
+        if self.serial_number in self._disconnected:
+            time.sleep(self._period)  # Like the SDK, grab() on an unplugged camera fails after a wait.
+            return SimulatedErrorCode.CAMERA_NOT_DETECTED
+        now = time.monotonic()
+        if now < self._next_frame_at:
+            time.sleep(self._next_frame_at - now)
+        elif now - self._next_frame_at > self._period:
+            # The consumer fell behind; like the real camera, frames that were never grabbed are lost.
+            self._next_frame_at += (now - self._next_frame_at) // self._period * self._period
+        self._next_frame_at += self._period
+        if self.grab_latency or self.latency_jitter:
+            time.sleep(max(0.0, self._random.gauss(self.grab_latency, self.latency_jitter)))
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_code
+        self._timestamp_ns = time.time_ns()
+        self.frames_produced += 1
+        self.frame[0:8] = self.frames_produced.to_bytes(8, "little")
+        if self._record_file is not None and self._payload:
+            self._record_file.write(self._payload)
+        return SimulatedErrorCode.SUCCESS
+
+    def retrieve_preview(self, image) -> SimulatedErrorCode:
+        """
+        Draws a synthetic preview into `image` (an H x W x 4 uint8 array): a pattern that scrolls
+        with the frame counter, so a viewer can tell the preview is live.
+        """
+        if not self._is_open:
+            return SimulatedErrorCode.CAMERA_NOT_DETECTED
+        shift = self.frames_produced % image.shape[1]
+        image[:, :, 0] = self._preview_pattern[:, shift:shift + image.shape[1]]
+        image[:, :, 1] = self.serial_number % 256
+        image[:, :, 2] = self._preview_pattern[:, :image.shape[1]][::-1]
+        return SimulatedErrorCode.SUCCESS
+
+    def prepare_preview(self, width: int, height: int) -> None:
+        import numpy as np  # Only needed when a preview is shown.
+        ramp = np.linspace(0, 255, width, dtype=np.uint8)
+        self._preview_pattern = np.tile(np.concatenate((ramp, ramp)), (height, 1))
+
+    def get_timestamp(self, time_reference=None) -> SimulatedTimestamp:
+        return SimulatedTimestamp(self._timestamp_ns)
+
+    def close(self) -> None:
+        self.disable_recording()
+        self._is_open = False
+
+
+class SimulatedCameraRecorder(GrabbingCameraRecorder):
+    def __init__(self, camera_info: SimulatedCameraInfo, init_params: SimulatedInitParameters, session_dir: str,
+                 write_frame_index: bool = True, camera_options: dict = None, segment_seconds: float = 0.0,
+                 segment_bytes: int = 0, segment_index=None, svo_compression: str = "H264",
+                 svo_bitrate_kbps: int = 0, recording_enabled: bool = True):
+        """
+        Camera recorder backed by a SimulatedCamera, for hardware-free load testing.
+        :param camera_info: Simulated camera information.
+        :param init_params: Resolution and fps of the simulated camera.
+        :param session_dir: Directory to store the (dummy) SVO file.
+        :param write_frame_index: Write a camera_<serial>.frames timestamp sidecar next to the SVO.
+        :param camera_options: Keyword arguments for SimulatedCamera (latency, errors, bitrate).
+        :param segment_seconds: Roll over to a new SVO segment after this many seconds (0 = single file).
+        :param segment_bytes: Roll over to a new SVO segment at this size (0 = no size limit).
+        :param segment_index: SegmentIndex the segments are recorded in.
+        :param svo_compression: Compression mode name, recorded for parity with the ZED recorder.
+        :param svo_bitrate_kbps: Dummy payload bitrate, overriding the camera's bitrate_mbps when set.
+        :param recording_enabled: False to only open and grab the camera (preview-only).
+        """
+        super().__init__(camera_info.serial_number, init_params.camera_fps, session_dir, write_frame_index,
+                         segment_seconds, segment_bytes, segment_index, recording_enabled)
+        self.camera_info = camera_info
+        self.init_params = init_params
+        self.svo_compression = svo_compression
+        self.svo_bitrate_kbps = svo_bitrate_kbps
+        self.camera = SimulatedCamera(camera_info.serial_number, **(camera_options or {}))
+
+    def open_camera(self) -> bool:
+        status = self.camera.open(self.init_params)
+        if status != SimulatedErrorCode.SUCCESS:
+            logger.error(f"❌ Error opening camera {self.serial_number}: {repr(status)}")
+            return False
+        return True
+
+    def _enable_recording(self, svo_filename: str) -> str:
+        err = self.camera.enable_recording(
+            SimulatedRecordingParameters(svo_filename, self.svo_compression, self.svo_bitrate_kbps))
+        if err != SimulatedErrorCode.SUCCESS:
+            return str(err)
+        return None
+
+    def _disable_recording(self) -> None:
+        self.camera.disable_recording()
+
+    def _grab(self) -> tuple:
+        err = self.camera.grab()
+        if err != SimulatedErrorCode.SUCCESS:
+            return err.name, err.value
+        return None, 0
+
+    def _image_timestamp_ns(self) -> int:
+        return self.camera.get_timestamp().get_nanoseconds()
+
+    def _create_preview_buffer(self, width: int) -> tuple:
+        import numpy as np  # Only needed when a preview is shown.
+        height = max(1, round(width * self.camera.height / self.camera.width))
+        self.camera.prepare_preview(width, height)
+        image = np.zeros((height, width, 4), dtype=np.uint8)
+        image[:, :, 3] = 255
+        return image, image
+
+    def _retrieve_preview(self, buffer) -> bool:
+        return self.camera.retrieve_preview(buffer) == SimulatedErrorCode.SUCCESS
+
+    def _close_camera(self) -> None:
+        self.camera.close()
+
+
+class SimulatedCameraBackend:
+    name = "simulated"
+    SERIAL_BASE = 90000000
+
+    def __init__(self, config: dict):
+        """
+        Creates SimulatedCameraRecorder instances; selected with camera_backend = "simulated".
+        :param config: RecordingController configuration (sim_* keys control the simulation).
+        """
+        self.config = config
+        self.disconnected = set()  # Serial numbers of simulated cameras that are unplugged.
+
+    def list_devices(self) -> list:
+        serials = (self.SERIAL_BASE + i for i in range(self.config["sim_camera_count"]))
+        return [SimulatedCameraInfo(serial) for serial in serials if serial not in self.disconnected]
+
+    def disconnect(self, serial_number: int) -> None:
+        """
+        Simulates a hot-unplug: the camera disappears from list_devices() and its grab() and
+        open() calls fail with CAMERA_NOT_DETECTED until reconnect().
+        """
+        self.disconnected.add(serial_number)
+
+    def reconnect(self, serial_number: int) -> None:
+        self.disconnected.discard(serial_number)
+
+    def estimate_write_bandwidth(self, resolution: str, fps: int, compression: str = "H264",
+                                 bitrate_kbps: int = 0) -> float:
+        """
+        :return: Dummy SVO payload of one simulated camera in bytes per second.
+        """
+        if bitrate_kbps:
+            return bitrate_kbps * 1000 / 8
+        return self.config["sim_bitrate_mbps"] * 1e6 / 8
+
+    def create_recorder(self, device: SimulatedCameraInfo, session_dir: str,
+                        segment_index=None, overrides: dict = None) -> SimulatedCameraRecorder:
+        camera_options = {
+            "open_latency": self.config["sim_open_latency"],
+            "grab_latency": self.config["sim_grab_latency"],
+            "latency_jitter": self.config["sim_latency_jitter"],
+            "error_rate": self.config["sim_error_rate"],
+            "error_code": self.config["sim_error_code"],
+            "bitrate_mbps": self.config["sim_bitrate_mbps"],
+            "disconnected": self.disconnected,
+        }
+        profile = resolve_camera_profile(self.config, device.serial_number, overrides)
+        init_params = SimulatedInitParameters(profile["camera_resolution"], profile["camera_fps"])
+        return SimulatedCameraRecorder(device, init_params, session_dir,
+                                       write_frame_index=self.config["frame_sidecar"],
+                                       camera_options=camera_options,
+                                       segment_seconds=self.config["svo_segment_seconds"],
+                                       segment_bytes=self.config["svo_segment_bytes"],
+                                       segment_index=segment_index,
+                                       svo_compression=profile["svo_compression"],
+                                       svo_bitrate_kbps=profile["svo_bitrate_kbps"],
+                                       recording_enabled=profile["recording_enabled"])
@@ -0,0 +1,379 @@
+import argparse
+import concurrent.futures
+import csv
+import importlib.util
+import json
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+from typing import NamedTuple
+import numpy as np
+from .gnss_track import GNSSTrack
+from .segment_index import load_segment_index, SEGMENT_INDEX_SUFFIX, SEGMENT_CLOSED
+from .svo_reader import create_svo_reader, SVO_NAME, SVO_READERS, VIEWS, VIEW_LEFT, VIEW_DEPTH
+
+logger = logging.getLogger(__name__)
+
+EXPORT_VERSION = 1
+EXPORT_SETTINGS_FILENAME = "export.json"
+CHUNK_MARKER_DIRNAME = ".chunks"
+
+IMAGE_FORMATS = ("png", "jpg", "npy")  # npy keeps the reader's BGRA array.
+DEPTH_FORMATS = ("npy", "png")         # npy: float32 metres; png: 16-bit millimetres, 0 where unknown.
+_PIL_FORMATS = {"png": "PNG", "jpg": "JPEG"}
+
+
+class ExportChunk(NamedTuple):
+    serial_number: int
+    svo_file: str      # SVO file name in the session's svo2 folder.
+    start: int         # First SVO frame position of the chunk.
+    stop: int          # Position after the chunk's last frame.
+    marker_path: str   # Written once every frame of the chunk is on disk.
+
+
+def find_session_svos(svo_dir: str) -> list:
+    """
+    :return: (serial number, SVO file name) of the session's closed SVO files, per camera in
+             recording order (parts, then segments). Files still being recorded are skipped.
+    """
+    files = []
+    for name in os.listdir(svo_dir):
+        match = SVO_NAME.match(name)
+        if match:
+            files.append((int(match.group(2)), int(match.group(3) or 0), int(match.group(4) or 0), name))
+    open_files = set()
+    for serial_number in {serial_number for serial_number, _, _, _ in files}:
+        index_path = os.path.join(svo_dir, f"camera_{serial_number}{SEGMENT_INDEX_SUFFIX}")
+        if os.path.exists(index_path):
+            open_files.update(segment["file"] for segment in load_segment_index(index_path)
+                              if segment["status"] != SEGMENT_CLOSED)
+    for name in sorted(open_files):
+        logger.warning(f"⚠️ Skipping {name}: still being recorded.")
+    return [(serial_number, name) for serial_number, _, _, name in sorted(files) if name not in open_files]
+
+
+def write_view(view: str, array: np.ndarray, file_path: str, file_format: str) -> None:
+    """
+    Writes one view of a frame: an image (BGRA) or depth map (metres) as returned by an SVO reader.
+    """
+    if file_format == "npy":
+        np.save(file_path, array)
+        return
+    from PIL import Image  # Only needed for png / jpg exports.
+    if view == VIEW_DEPTH:
+        millimetres = np.nan_to_num(array * 1000.0, nan=0.0, posinf=0.0, neginf=0.0)
+        image = Image.fromarray(np.clip(millimetres, 0, 65535).astype(np.uint16))
+    else:
+        image = Image.fromarray(np.ascontiguousarray(array[:, :, 2::-1]))  # BGRA -> RGB.
+    image.save(file_path, _PIL_FORMATS[file_format])
+
+
+def _write_json(file_path: str, data: dict) -> None:
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(temp_path, file_path)
+
+
+# State of a worker process: export settings, its SVO reader and the SVO the reader has open.
+_worker = {}
+
+
+def _close_worker_reader() -> None:
+    if _worker.get("svo_path") is not None:
+        _worker["reader"].close()
+        _worker["svo_path"] = None
+
+
+def _init_worker(settings: dict) -> None:
+    _worker.clear()
+    _worker.update(settings=settings, svo_path=None,
+                   reader=create_svo_reader(settings["reader"], settings["reader_options"]))
+    multiprocessing.util.Finalize(None, _close_worker_reader, exitpriority=10)
+
+
+def _export_chunk(chunk: ExportChunk) -> dict:
+    settings = _worker["settings"]
+    reader = _worker["reader"]
+    svo_path = os.path.join(settings["svo_dir"], chunk.svo_file)
+    # Consecutive chunks of the same SVO reuse the open reader (opening can load a depth model).
+    if _worker["svo_path"] != svo_path:
+        _close_worker_reader()
+        reader.open(svo_path, tuple(settings["views"]))
+        _worker["svo_path"] = svo_path
+    frame_dir = os.path.join(settings["output_dir"], os.path.splitext(chunk.svo_file)[0])
+    formats = {view: settings["depth_format"] if view == VIEW_DEPTH else settings["image_format"]
+               for view in settings["views"]}
+    positions, timestamps_ns = [], []
+    for position, timestamp_ns, frame in reader.read_frames(chunk.start, chunk.stop, settings["frame_step"]):
+        for view, array in frame.items():
+            file_path = os.path.join(frame_dir, view, f"{position:06d}.{formats[view]}")
+            write_view(view, array, file_path, formats[view])
+        positions.append(position)
+        timestamps_ns.append(timestamp_ns)
+    marker = {"svo_file": chunk.svo_file, "start": chunk.start, "stop": chunk.stop,
+              "positions": positions, "timestamps_ns": timestamps_ns}
+    _write_json(chunk.marker_path, marker)
+    return marker
+
+
+class SVOExport:
+    def __init__(self, session_dir: str, output_dir: str = None, views: tuple = (VIEW_LEFT,),
+                 image_format: str = "png", depth_format: str = "npy", chunk_frames: int = 300,
+                 frame_step: int = 1, workers: int = None, reader: str = "zed", reader_options: dict = None,
+                 gnss_max_gap: float = 1.0):
+        """
+        Exports a session's SVO files to images / depth maps: every SVO is split into chunks of
+        frames, processed by a pool of worker processes, each with its own SVO reader. A chunk is
+        done once its marker file is written, so an interrupted export resumes at the first
+        unfinished chunk. Once every chunk is done, camera_<serial>.csv indexes list each exported
+        frame with its camera timestamp and GNSS position, interpolated from the session's gnss folder.
+        :param session_dir: Recording session folder (with svo2 and gnss subfolders).
+        :param output_dir: Export folder, <session_dir>/export by default; one subfolder per SVO file.
+        :param views: Views to export (see svo_reader.VIEWS).
+        :param image_format: One of IMAGE_FORMATS (png and jpg need Pillow).
+        :param depth_format: One of DEPTH_FORMATS.
+        :param chunk_frames: Exported frames per chunk.
+        :param frame_step: Export every n-th frame.
+        :param workers: Worker processes, one per CPU by default; 1 exports in this process.
+        :param reader: Key of svo_reader.SVO_READERS.
+        :param reader_options: Keyword arguments of the reader, e.g. {"depth_mode": "NEURAL"}.
+        :param gnss_max_gap: GNSS fixes further apart than this (seconds) flag the frames between them.
+        """
+        for view in views:
+            if view not in VIEWS:
+                raise ValueError(f"Unknown view {view!r}, expected some of {VIEWS}")
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format {image_format!r}, expected one of {IMAGE_FORMATS}")
+        if depth_format not in DEPTH_FORMATS:
+            raise ValueError(f"Unknown depth format {depth_format!r}, expected one of {DEPTH_FORMATS}")
+        if reader not in SVO_READERS:
+            raise ValueError(f"Unknown SVO reader {reader!r}, expected one of {tuple(SVO_READERS)}")
+        if chunk_frames < 1 or frame_step < 1:
+            raise ValueError("chunk_frames and frame_step must be at least 1")
+        formats = {depth_format if view == VIEW_DEPTH else image_format for view in views}
+        if formats & set(_PIL_FORMATS) and importlib.util.find_spec("PIL") is None:
+            raise RuntimeError("png / jpg exports need Pillow (pip install pillow); use the npy format without it")
+        self.session_dir = session_dir
+        self.svo_dir = os.path.join(session_dir, "svo2")
+        self.gnss_dir = os.path.join(session_dir, "gnss")
+        self.output_dir = output_dir or os.path.join(session_dir, "export")
+        self.workers = workers or os.cpu_count() or 1
+        self.gnss_max_gap = gnss_max_gap
+        # Settings that decide the exported files; a resumed export must use the same ones.
+        self.settings = {
+            "version": EXPORT_VERSION,
+            "views": list(views),
+            "image_format": image_format,
+            "depth_format": depth_format,
+            "chunk_frames": chunk_frames,
+            "frame_step": frame_step,
+            "reader": reader,
+            "reader_options": reader_options or {},
+        }
+
+    def _prepare_output(self) -> None:
+        os.makedirs(os.path.join(self.output_dir, CHUNK_MARKER_DIRNAME), exist_ok=True)
+        settings_path = os.path.join(self.output_dir, EXPORT_SETTINGS_FILENAME)
+        if not os.path.exists(settings_path):
+            _write_json(settings_path, self.settings)
+            return
+        with open(settings_path, "r") as f:
+            previous = json.load(f)
+        if previous != self.settings:
+            changed = sorted(key for key in self.settings if previous.get(key) != self.settings[key])
+            raise ValueError(f"{self.output_dir} holds an export with different settings ({', '.join(changed)}); "
+                             f"use another output folder or the same settings to resume it")
+
+    def plan(self) -> list:
+        """
+        Opens every SVO once for its frame count and splits it into chunks.
+        :return: ExportChunk list, per camera in recording order.
+        """
+        reader = create_svo_reader(self.settings["reader"], self.settings["reader_options"])
+        span = self.settings["chunk_frames"] * self.settings["frame_step"]
+        chunks = []
+        for serial_number, svo_file in find_session_svos(self.svo_dir):
+            reader.open(os.path.join(self.svo_dir, svo_file), ())
+            try:
+                frame_count = reader.get_frame_count()
+            finally:
+                reader.close()
+            stem = os.path.splitext(svo_file)[0]
+            for view in self.settings["views"]:
+                os.makedirs(os.path.join(self.output_dir, stem, view), exist_ok=True)
+            for start in range(0, frame_count, span):
+                marker_path = os.path.join(self.output_dir, CHUNK_MARKER_DIRNAME, f"{stem}_{start:08d}.json")
+                chunks.append(ExportChunk(serial_number, svo_file, start, min(start + span, frame_count),
+                                          marker_path))
+        return chunks
+
+    def _export_chunks(self, chunks: list):
+        # Yields (chunk, marker, exception) as chunks complete.
+        settings = {**self.settings, "svo_dir": self.svo_dir, "output_dir": self.output_dir}
+        if self.workers == 1:
+            _init_worker(settings)
+            try:
+                for chunk in chunks:
+                    try:
+                        yield chunk, _export_chunk(chunk), None
+                    except Exception as e:
+                        yield chunk, None, e
+            finally:
+                _close_worker_reader()
+            return
+        # Spawned, not forked: workers must not inherit an SDK / CUDA context opened by plan().
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                    initializer=_init_worker, initargs=(settings,)) as executor:
+            futures = {executor.submit(_export_chunk, chunk): chunk for chunk in chunks}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+
+    def run(self, progress=None) -> dict:
+        """
+        Exports every chunk without a marker, then writes the per-camera indexes if no chunk failed.
+        :param progress: Called with the summary so far after every finished chunk.
+        :return: Chunk counts (total, resumed, exported, failed), frames exported, throughput and
+                 the failed chunks' errors.
+        """
+        self._prepare_output()
+        chunks = self.plan()
+        pending = [chunk for chunk in chunks if not os.path.exists(chunk.marker_path)]
+        summary = {"output_dir": self.output_dir, "chunks": len(chunks), "resumed": len(chunks) - len(pending),
+                   "exported": 0, "failed": 0, "frames": 0, "seconds": 0.0, "frames_per_second": 0.0,
+                   "errors": []}
+        if summary["resumed"]:
+            logger.info(f"⏩ Resuming export: {summary['resumed']}/{len(chunks)} chunks already done.")
+        logger.info(f"📤 Exporting {len(pending)} chunks of {self.settings['chunk_frames']} frames "
+                    f"with {self.workers} worker(s) to {self.output_dir}")
+        started = time.monotonic()
+        for chunk, marker, error in self._export_chunks(pending):
+            if error is not None:
+                summary["failed"] += 1
+                summary["errors"].append(f"{chunk.svo_file} [{chunk.start}:{chunk.stop}]: {error}")
+                logger.error(f"❌ Chunk {chunk.svo_file} [{chunk.start}:{chunk.stop}] failed: {error}")
+            else:
+                summary["exported"] += 1
+                summary["frames"] += len(marker["positions"])
+            summary["seconds"] = time.monotonic() - started
+            summary["frames_per_second"] = summary["frames"] / summary["seconds"]
+            if progress is not None:
+                progress(summary)
+        if summary["failed"]:
+            logger.warning(f"⚠️ {summary['failed']} chunk(s) failed; run the export again to retry them.")
+        else:
+            self.write_indexes(chunks)
+        logger.info(f"✅ Exported {summary['frames']} frames in {summary['seconds']:.1f} s "
+                    f"({summary['frames_per_second']:.0f} fps).")
+        return summary
+
+    def _load_track(self) -> GNSSTrack:
+        try:
+            return GNSSTrack.from_session(self.gnss_dir)
+        except FileNotFoundError:
+            logger.warning(f"⚠️ No GNSS log in {self.gnss_dir}; frames are exported without positions.")
+            return GNSSTrack([], [], [], [])
+
+    def write_indexes(self, chunks: list) -> list:
+        """
+        Writes camera_<serial>.csv in the export folder from the chunk markers: one row per exported
+        frame with its SVO file and position, camera timestamp, view files (relative to the export
+        folder) and interpolated GNSS position and flags (see gnss_track).
+        :return: Paths of the index files.
+        """
+        track = self._load_track()
+        cameras = {}
+        for chunk in chunks:
+            cameras.setdefault(chunk.serial_number, []).append(chunk)
+        views = self.settings["views"]
+        extensions = [self.settings["depth_format"] if view == VIEW_DEPTH else self.settings["image_format"]
+                      for view in views]
+        index_paths = []
+        for serial_number, camera_chunks in cameras.items():
+            files, positions, timestamps_ns = [], [], []
+            for chunk in camera_chunks:
+                with open(chunk.marker_path, "r") as f:
+                    marker = json.load(f)
+                files += [os.path.splitext(chunk.svo_file)[0]] * len(marker["positions"])
+                positions += marker["positions"]
+                timestamps_ns += marker["timestamps_ns"]
+            positions = np.asarray(positions, dtype=np.int64)
+            timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+            gnss = track.interpolate(timestamps_ns / 1e9, self.gnss_max_gap)
+            index_path = os.path.join(self.output_dir, f"camera_{serial_number}.csv")
+            with open(index_path + ".tmp", "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["svo_file", "frame", "timestamp_ns", *views,
+                                 "latitude", "longitude", "altitude", "gnss_flags"])
+                for i, stem in enumerate(files):
+                    frame_name = f"{positions[i]:06d}"
+                    writer.writerow([stem, positions[i], timestamps_ns[i],
+                                     *(f"{stem}/{view}/{frame_name}.{ext}" for view, ext in zip(views, extensions)),
+                                     _format_coordinate(gnss.latitude[i], 9), _format_coordinate(gnss.longitude[i], 9),
+                                     _format_coordinate(gnss.altitude[i], 3), gnss.flags[i]])
+            os.replace(index_path + ".tmp", index_path)
+            index_paths.append(index_path)
+        logger.info(f"🗂️ Frame indexes written: {', '.join(os.path.basename(path) for path in index_paths)}")
+        return index_paths
+
+
+def _format_coordinate(value: float, decimals: int) -> str:
+    return "" if np.isnan(value) else f"{value:.{decimals}f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a session's SVO files to images / depth maps, in "
+                                                 "parallel chunks, with per-camera GNSS-tagged frame indexes. "
+                                                 "An interrupted export resumes when run again.")
+    parser.add_argument("session_dir", help="Recording session folder (with svo2 and gnss subfolders).")
+    parser.add_argument("--output", help="Export folder (default: <session_dir>/export).")
+    parser.add_argument("--views", nargs="+", choices=VIEWS, default=[VIEW_LEFT])
+    parser.add_argument("--image-format", choices=IMAGE_FORMATS, default="png")
+    parser.add_argument("--depth-format", choices=DEPTH_FORMATS, default="npy")
+    parser.add_argument("--chunk-frames", type=int, default=300, help="Exported frames per chunk.")
+    parser.add_argument("--step", type=int, default=1, help="Export every n-th frame.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--reader", choices=tuple(SVO_READERS), default="zed",
+                        help="SVO reader; synthetic renders test frames without the ZED SDK.")
+    parser.add_argument("--depth-mode", default="NEURAL", help="sl.DEPTH_MODE name for depth exports.")
+    parser.add_argument("--gnss-max-gap", type=float, default=1.0,
+                        help="Seconds between GNSS fixes above which positions are flagged.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(args.session_dir, "svo2")):
+        print(f"❌ No svo2 folder in {args.session_dir}.")
+        sys.exit(1)
+    reader_options = {"depth_mode": args.depth_mode} if args.reader == "zed" else {}
+    try:
+        export = SVOExport(args.session_dir, args.output, tuple(args.views), args.image_format, args.depth_format,
+                           args.chunk_frames, args.step, args.workers, args.reader, reader_options,
+                           args.gnss_max_gap)
+        last_print = [0.0]
+
+        def progress(summary: dict) -> None:
+            if time.monotonic() - last_print[0] >= 5.0:
+                last_print[0] = time.monotonic()
+                done = summary["resumed"] + summary["exported"] + summary["failed"]
+                print(f"📤 {done}/{summary['chunks']} chunks, {summary['frames_per_second']:.0f} fps")
+        summary = export.run(progress)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for error in summary["errors"]:
+        print(f"❌ {error}")
+    print(f"{'✅' if not summary['failed'] else '⚠️'} {summary['frames']} frames exported to {summary['output_dir']} "
+          f"in {summary['seconds']:.1f} s ({summary['frames_per_second']:.0f} fps); chunks: {summary['exported']} "
+          f"exported, {summary['resumed']} already done, {summary['failed']} failed"
+          f"{' (run again to retry them)' if summary['failed'] else ''}.")
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
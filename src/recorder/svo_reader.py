@@ -0,0 +1,139 @@
+import importlib
+import os
+import re
+from abc import ABC, abstractmethod
+import numpy as np
+from .frame_index import open_frame_index, FRAME_INDEX_SUFFIX
+from .segment_index import load_segment_index, SEGMENT_INDEX_SUFFIX
+
+# Views an SVO reader can return per frame: left and right images (H x W x 4 uint8, BGRA) and
+# depth (H x W float32, metres, NaN/inf where unknown).
+VIEW_LEFT = "left"
+VIEW_RIGHT = "right"
+VIEW_DEPTH = "depth"
+VIEWS = (VIEW_LEFT, VIEW_RIGHT, VIEW_DEPTH)
+
+# Reader name -> (module, class). Modules are imported on first use, so the synthetic reader
+# never loads the ZED SDK.
+SVO_READERS = {
+    "zed": (".zed_svo_reader", "ZEDSVOReader"),
+    "synthetic": (".svo_reader", "SyntheticSVOReader"),
+}
+
+# camera_<serial>[_part<N>][_seg<NNNN>].svo: the recorder's SVO names (see GrabbingCameraRecorder).
+SVO_NAME = re.compile(r"^(camera_(\d+)(?:_part(\d+))?)(?:_seg(\d+))?\.svo2?$")
+
+
+class ISVOReader(ABC):
+    @abstractmethod
+    def open(self, file_path: str, views: tuple) -> None:
+        """Opens an SVO file for the given VIEWS; raises RuntimeError if it cannot be read."""
+        pass
+
+    @abstractmethod
+    def get_frame_count(self) -> int:
+        """Number of frames in the open SVO file."""
+        pass
+
+    @abstractmethod
+    def read_frames(self, start: int, stop: int, step: int = 1):
+        """
+        Yields (position, camera timestamp in ns, {view: array}) for the frames at positions
+        start, start + step, ... below stop; frames that cannot be decoded are skipped. The arrays
+        may be reused by the next frame.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Closes the SVO file."""
+        pass
+
+
+def create_svo_reader(name: str, options: dict = None) -> ISVOReader:
+    """
+    :param name: Key of SVO_READERS.
+    :param options: Keyword arguments of the reader class.
+    """
+    if name not in SVO_READERS:
+        raise ValueError(f"Unknown SVO reader {name!r}, expected one of {tuple(SVO_READERS)}")
+    module_name, class_name = SVO_READERS[name]
+    module = importlib.import_module(module_name, __package__)
+    return getattr(module, class_name)(**(options or {}))
+
+
+def recorded_frame_timestamps(svo_path: str) -> np.ndarray:
+    """
+    Camera timestamps of the frames an SVO file holds, in order, from the recorder's frame
+    timestamp sidecar (and segment index, for segmented recordings) next to it.
+    """
+    match = SVO_NAME.match(os.path.basename(svo_path))
+    if match is None:
+        raise ValueError(f"{svo_path} is not named like a recorder SVO file (camera_<serial>[...].svo)")
+    svo_dir = os.path.dirname(svo_path)
+    records = open_frame_index(os.path.join(svo_dir, match.group(1) + FRAME_INDEX_SUFFIX))
+    first, last = 0, None
+    segment_path = os.path.join(svo_dir, f"camera_{match.group(2)}{SEGMENT_INDEX_SUFFIX}")
+    if os.path.exists(segment_path):
+        for segment in load_segment_index(segment_path):
+            if segment["file"] == os.path.basename(svo_path):
+                first, last = segment["first_frame"], segment["first_frame"] + segment["frame_count"]
+    ok = (records["grab_status"] == 0) & (records["frame_index"] >= first)
+    if last is not None:
+        ok &= records["frame_index"] < last
+    return np.asarray(records["camera_timestamp_ns"][ok])
+
+
+class SyntheticSVOReader(ISVOReader):
+    def __init__(self, width: int = 672, height: int = 376):
+        """
+        Stand-in for the ZED SVO reader on machines without the SDK, e.g. for the SVOs of the
+        simulated camera backend: frame count and timestamps come from the recorder's frame
+        sidecar, and every view is rendered from the frame position, so exports are reproducible.
+        :param width: Width of the rendered views.
+        :param height: Height of the rendered views.
+        """
+        self.width = width
+        self.height = height
+        self.views = ()
+        self.timestamps_ns = None
+        self._serial_number = 0
+        self._rows = np.arange(height, dtype=np.int64)[:, None]
+        self._columns = np.arange(width, dtype=np.int64)[None, :]
+        self._images = {view: np.empty((height, width, 4), dtype=np.uint8) for view in (VIEW_LEFT, VIEW_RIGHT)}
+        self._depth = np.empty((height, width), dtype=np.float32)
+
+    def open(self, file_path: str, views: tuple) -> None:
+        if not os.path.exists(file_path):
+            raise RuntimeError(f"SVO file not found: {file_path}")
+        self.timestamps_ns = recorded_frame_timestamps(file_path)
+        self._serial_number = int(SVO_NAME.match(os.path.basename(file_path)).group(2))
+        self.views = views
+
+    def get_frame_count(self) -> int:
+        return len(self.timestamps_ns)
+
+    def _render_image(self, view: str, position: int) -> np.ndarray:
+        # Diagonal stripes that move with the position, like a scene passing by; the right view is shifted.
+        image = self._images[view]
+        shift = 0 if view == VIEW_LEFT else 16
+        image[:, :, 0] = (self._rows + self._columns + position * 4 + shift) & 0xFF
+        image[:, :, 1] = (self._rows * 3 - self._columns + position) & 0xFF
+        image[:, :, 2] = self._serial_number & 0xFF
+        image[:, :, 3] = 255
+        return image
+
+    def _render_depth(self, position: int) -> np.ndarray:
+        np.multiply(self._rows + self._columns, 0.01, out=self._depth, casting="unsafe")
+        self._depth += 1.0 + (position % 100) * 0.05
+        self._depth[: self.height // 8] = np.inf  # Sky.
+        return self._depth
+
+    def read_frames(self, start: int, stop: int, step: int = 1):
+        for position in range(start, min(stop, len(self.timestamps_ns)), step):
+            frame = {view: self._render_depth(position) if view == VIEW_DEPTH
+                     else self._render_image(view, position) for view in self.views}
+            yield position, int(self.timestamps_ns[position]), frame
+
+    def close(self) -> None:
+        self.timestamps_ns = None
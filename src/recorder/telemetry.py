@@ -0,0 +1,174 @@
+import os
+import shutil
+import threading
+import time
+from .device_startup import STATUS_OK
+from .gnss_fix import SL_GNSS_MODE_NAMES, SL_GNSS_STATUS_NAMES
+from .session_manifest import APPEND_ONLY_SUFFIXES
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def read_process_stats() -> dict:
+    """
+    :return: CPU seconds used by this process (all threads) and its resident set size in bytes
+             (None where /proc is not available).
+    """
+    rss = None
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            rss = int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    return {"cpu_seconds": time.process_time(), "rss_bytes": rss}
+
+
+def _directory_bytes(*directories) -> int:
+    total = 0
+    for directory in directories:
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file():
+                        total += entry.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+class TelemetryCollector:
+    def __init__(self, controller, interval: float = 1.0):
+        """
+        Builds a health snapshot of a RecordingController every `interval` seconds on its own
+        thread: per-camera achieved fps, grab errors, dropped-frame estimates, SVO bytes and write
+        rate, GNSS fix rate and mode/status, free disk space and session size, process CPU and RSS.
+        Recorder counters are plain attributes read without locks and file sizes come from stat(),
+        so the recorder threads do no extra work. Readers (GUI, metrics endpoint) take `latest`, a
+        dict that is replaced as a whole and never modified.
+        :param controller: RecordingController whose devices are reported.
+        :param interval: Seconds between snapshots.
+        """
+        self.controller = controller
+        self.interval = interval
+        self.latest = None  # Last snapshot dict; never modified after publication.
+        self._previous = None  # (monotonic time, counter values) of the previous snapshot, for rates.
+        self._stop = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.collect()
+            if self._stop.wait(self.interval):
+                break
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.collect(final=True)
+
+    def _svo_bytes(self) -> dict:
+        """:return: Serial number -> total size of its SVO files (all segments)."""
+        sizes = {}
+        try:
+            with os.scandir(self.controller.session_manager.get_svo2_directory()) as it:
+                for entry in it:
+                    if entry.name.startswith("camera_") and entry.name.endswith(APPEND_ONLY_SUFFIXES):
+                        serial = entry.name[len("camera_"):].split("_")[0].split(".")[0]
+                        sizes[serial] = sizes.get(serial, 0) + entry.stat().st_size
+        except OSError:
+            pass
+        return sizes
+
+    def _rate(self, key, value: float, now: float):
+        """:return: Change of `value` per second since the previous snapshot, None on the first one."""
+        if self._previous is None or key not in self._previous[1]:
+            return None
+        previous_time, previous_values = self._previous
+        elapsed = now - previous_time
+        return (value - previous_values[key]) / elapsed if elapsed > 0 else None
+
+    def collect(self, final: bool = False) -> dict:
+        """
+        Builds and publishes one snapshot.
+        :param final: Last snapshot of the session, taken after the recorders stopped.
+        """
+        now = time.monotonic()
+        values = {}
+        svo_bytes = self._svo_bytes()
+
+        cameras = []
+        for recorder in list(self.controller.camera_recorders):
+            metrics = recorder.metrics
+            frames = metrics.frames_grabbed
+            written = svo_bytes.get(str(recorder.serial_number), 0)
+            values[("frames", recorder.serial_number)] = frames
+            values[("svo_bytes", recorder.serial_number)] = written
+            last_frame_at = metrics.last_frame_at
+            grab_errors = dict(metrics.grab_errors)
+            cameras.append({
+                "serial_number": recorder.serial_number,
+                "recording_enabled": recorder.recording_enabled,
+                "camera_fps": metrics.camera_fps,
+                "fps": self._rate(("frames", recorder.serial_number), frames, now),
+                "frames": frames,
+                "grab_errors": sum(grab_errors.values()),
+                "grab_errors_by_code": grab_errors,
+                "dropped_frames": metrics.dropped_frames,
+                "svo_bytes": written,
+                "write_bps": self._rate(("svo_bytes", recorder.serial_number), written, now),
+                "frame_age": None if last_frame_at is None else (time.monotonic_ns() - last_frame_at) / 1e9,
+                "segment": recorder.segment,
+                "grab_latency": metrics.grab_latency.snapshot(),
+            })
+
+        gnss = None
+        gnss_recorder = self.controller.gnss_recorder
+        if gnss_recorder is not None:
+            reader = gnss_recorder.gpsd_reader
+            fix = reader.last_fix
+            values["fixes"] = reader.fixes_received
+            gnss = {
+                "state": reader.state,
+                "fixes_received": reader.fixes_received,
+                "fixes_written": gnss_recorder.records_written,
+                "fix_rate": self._rate("fixes", reader.fixes_received, now),
+                "fix_age": None if reader.last_fix_at is None else now - reader.last_fix_at,
+                "mode": None if fix is None else SL_GNSS_MODE_NAMES[fix.mode],
+                "status": None if fix is None else SL_GNSS_STATUS_NAMES[fix.status],
+                "queue_dropped": reader.fix_queue.dropped,
+                "outages": reader.outages,
+            }
+
+        session_manager = self.controller.session_manager
+        disk = {"free_bytes": None, "seconds_left": None,
+                "session_bytes": _directory_bytes(session_manager.get_session_directory(),
+                                                  session_manager.get_svo2_directory(),
+                                                  session_manager.get_gnss_directory())}
+        try:
+            disk["free_bytes"] = shutil.disk_usage(self.controller.session_manager.get_session_directory()).free
+        except OSError:
+            pass
+        if self.controller.disk_monitor is not None:
+            disk["seconds_left"] = self.controller.disk_monitor.seconds_left
+
+        snapshot = {
+            "time": time.time(),
+            "monotonic": now,
+            "recording": not final,
+            "session_dir": self.controller.session_manager.get_session_directory(),
+            "devices": [{"kind": s.kind, "name": s.name, "status": s.status}
+                        for s in self.controller.startup_report],
+            "devices_ok": sum(1 for s in self.controller.startup_report if s.status == STATUS_OK),
+            "cameras": cameras,
+            "gnss": gnss,
+            "disk": disk,
+            "process": read_process_stats(),
+        }
+        self._previous = (now, values)
+        self.latest = snapshot
+        return snapshot
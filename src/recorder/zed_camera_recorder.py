@@ -1,66 +1,140 @@
-import os
-import time
-import threading
+import logging
 import pyzed.sl as sl
-from .icamera_recorder import ICameraRecorder
+from .grabbing_recorder import GrabbingCameraRecorder
+from .disk_admission import estimate_svo_bandwidth
+from .camera_profiles import resolve_camera_profile
 
-class ZEDCameraRecorder(ICameraRecorder):
-    def __init__(self, camera_info: sl.CameraInformation, init_params: sl.InitParameters, session_dir: str):
+logger = logging.getLogger(__name__)
+
+
+class ZEDCameraRecorder(GrabbingCameraRecorder):
+    def __init__(self, camera_info: sl.CameraInformation, init_params: sl.InitParameters, session_dir: str,
+                 write_frame_index: bool = True, segment_seconds: float = 0.0, segment_bytes: int = 0,
+                 segment_index=None, svo_compression: str = "H264", svo_bitrate_kbps: int = 0,
+                 recording_enabled: bool = True):
         """
         Initializes the ZED camera recorder.
         :param camera_info: The camera's information (serial number, etc.)
         :param init_params: Initialization parameters for the camera.
         :param session_dir: Directory to store the SVO file (should be the svo2 folder).
+        :param write_frame_index: Write a camera_<serial>.frames timestamp sidecar next to the SVO.
+        :param segment_seconds: Roll over to a new SVO segment after this many seconds (0 = single file).
+        :param segment_bytes: Roll over to a new SVO segment at this size (0 = no size limit).
+        :param segment_index: SegmentIndex the segments are recorded in.
+        :param svo_compression: sl.SVO_COMPRESSION_MODE name used for the SVO.
+        :param svo_bitrate_kbps: Encoder bitrate in kbit/s, 0 lets the SDK choose.
+        :param recording_enabled: False to only open and grab the camera (preview-only).
         """
+        super().__init__(camera_info.serial_number, init_params.camera_fps, session_dir, write_frame_index,
+                         segment_seconds, segment_bytes, segment_index, recording_enabled)
         self.camera_info = camera_info
         self.init_params = init_params
-        self.session_dir = session_dir
+        self.svo_compression = svo_compression
+        self.svo_bitrate_kbps = svo_bitrate_kbps
         self.camera = sl.Camera()
-        self.thread = None
-        self._stop = False
+        self.runtime = sl.RuntimeParameters()
+        self._preview_resolution = None
 
     def open_camera(self) -> bool:
         # Set camera parameters based on the serial number and open it.
         self.init_params.set_from_serial_number(self.camera_info.serial_number)
         status = self.camera.open(self.init_params)
         if status != sl.ERROR_CODE.SUCCESS:
-            print(f"❌ Error opening camera {self.camera_info.serial_number}: {repr(status)}")
+            logger.error(f"❌ Error opening camera {self.camera_info.serial_number}: {repr(status)}")
             return False
         return True
 
-    def start_recording(self) -> bool:
-        # Define a unique SVO file name and enable recording.
-        svo_filename = os.path.join(self.session_dir, f"camera_{self.camera_info.serial_number}.svo")
-        recording_params = sl.RecordingParameters(svo_filename)
+    def _enable_recording(self, svo_filename: str) -> str:
+        recording_params = sl.RecordingParameters(
+            svo_filename,
+            compression_mode=getattr(sl.SVO_COMPRESSION_MODE, self.svo_compression),
+            bitrate=self.svo_bitrate_kbps
+        )
         err = self.camera.enable_recording(recording_params)
         if err != sl.ERROR_CODE.SUCCESS:
-            print(f"❌ Error starting recording on camera {self.camera_info.serial_number}: {err}")
-            self.camera.close()
-            return False
-        print(f"✅ Camera {self.camera_info.serial_number} is recording to {svo_filename}")
-        return True
+            return str(err)
+        return None
+
+    def _disable_recording(self) -> None:
+        self.camera.disable_recording()
 
-    def _grab_run(self):
-        # Continuously grab frames until signaled to stop.
-        runtime = sl.RuntimeParameters()
-        while not self._stop:
-            err = self.camera.grab(runtime)
-            if err != sl.ERROR_CODE.SUCCESS:
-                print(f"⚠️ Camera {self.camera_info.serial_number} grab error: {err}")
-            time.sleep(0.001)  # Short sleep to avoid CPU overload.
+    def _grab(self) -> tuple:
+        err = self.camera.grab(self.runtime)
+        if err != sl.ERROR_CODE.SUCCESS:
+            return err.name, err.value
+        return None, 0
+
+    def _image_timestamp_ns(self) -> int:
+        return self.camera.get_timestamp(sl.TIME_REFERENCE.IMAGE).get_nanoseconds()
+
+    def _create_preview_buffer(self, width: int) -> tuple:
+        camera_size = self.camera.get_camera_information().camera_configuration.resolution
+        height = max(1, round(width * camera_size.height / camera_size.width))
+        self._preview_resolution = sl.Resolution(width, height)
+        mat = sl.Mat(width, height, sl.MAT_TYPE.U8_C4, sl.MEM.CPU)
+        # retrieve_image() into a Mat of the requested size reuses its memory, so this view stays valid.
+        return mat, mat.get_data(sl.MEM.CPU, deep_copy=False)
+
+    def _retrieve_preview(self, buffer: sl.Mat) -> bool:
+        # The SDK downscales while copying out the left image; only the thumbnail reaches the CPU.
+        return self.camera.retrieve_image(buffer, sl.VIEW.LEFT, sl.MEM.CPU,
+                                          self._preview_resolution) == sl.ERROR_CODE.SUCCESS
+
+    def _close_camera(self) -> None:
         self.camera.close()
-        print(f"🛑 Camera {self.camera_info.serial_number} stopped.")
 
-    def start_grabbing(self) -> None:
-        # Start the grabbing thread for this camera.
-        self.thread = threading.Thread(target=self._grab_run)
-        self.thread.start()
 
-    def stop(self) -> None:
-        # Signal the thread to stop.
-        self._stop = True
+class ZEDCameraBackend:
+    name = "zed"
+
+    def __init__(self, config: dict):
+        """
+        Creates ZEDCameraRecorder instances for the ZED cameras connected to this machine.
+        :param config: RecordingController configuration.
+        """
+        self.config = config
+
+    def list_devices(self) -> list:
+        """
+        :return: sl.CameraInformation of every connected ZED camera.
+        """
+        return sl.Camera.get_device_list()
+
+    def create_init_params(self, profile: dict) -> sl.InitParameters:
+        """
+        :param profile: Camera profile (see camera_profiles.resolve_camera_profile).
+        """
+        init_params = sl.InitParameters()
+        resolution = profile["camera_resolution"]
+        # Resolutions may be given as sl.RESOLUTION members or by name, e.g. "HD1200".
+        if isinstance(resolution, str):
+            resolution = getattr(sl.RESOLUTION, resolution)
+        init_params.camera_resolution = resolution
+        init_params.camera_fps = profile["camera_fps"]
+        # Optionally enable real-time SVO mode if needed:
+        # init_params.svo_real_time_mode = True
+        return init_params
+
+    def estimate_write_bandwidth(self, resolution: str, fps: int, compression: str = "H264",
+                                 bitrate_kbps: int = 0) -> float:
+        """
+        :return: Estimated SVO write bandwidth of one camera in bytes per second.
+        """
+        size = sl.get_resolution(getattr(sl.RESOLUTION, resolution))
+        return estimate_svo_bandwidth(size.width, size.height, fps, compression, bitrate_kbps)
 
-    def join(self) -> None:
-        # Wait for the thread to finish.
-        if self.thread is not None:
-            self.thread.join()
+    def create_recorder(self, device: sl.CameraInformation, session_dir: str,
+                        segment_index=None, overrides: dict = None) -> ZEDCameraRecorder:
+        profile = resolve_camera_profile(self.config, device.serial_number, overrides)
+        return ZEDCameraRecorder(
+            device,
+            self.create_init_params(profile),  # Each camera gets its own parameters object.
+            session_dir,
+            write_frame_index=self.config["frame_sidecar"],
+            segment_seconds=self.config["svo_segment_seconds"],
+            segment_bytes=self.config["svo_segment_bytes"],
+            segment_index=segment_index,
+            svo_compression=profile["svo_compression"],
+            svo_bitrate_kbps=profile["svo_bitrate_kbps"],
+            recording_enabled=profile["recording_enabled"]
+        )
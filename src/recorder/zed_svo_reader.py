@@ -0,0 +1,61 @@
+import pyzed.sl as sl
+from .svo_reader import ISVOReader, VIEW_LEFT, VIEW_RIGHT, VIEW_DEPTH
+
+_IMAGE_VIEWS = {VIEW_LEFT: sl.VIEW.LEFT, VIEW_RIGHT: sl.VIEW.RIGHT}
+
+
+class ZEDSVOReader(ISVOReader):
+    def __init__(self, depth_mode: str = "NEURAL"):
+        """
+        Reads SVO files with the ZED SDK.
+        :param depth_mode: Name of the sl.DEPTH_MODE member used when depth is exported; without
+                           depth the SVO is opened with DEPTH_MODE.NONE, which only decodes images.
+        """
+        self.depth_mode = depth_mode
+        self.camera = sl.Camera()
+        self.runtime = sl.RuntimeParameters()
+        self.views = ()
+        self._mats = {}
+        self._is_open = False
+
+    def open(self, file_path: str, views: tuple) -> None:
+        init_params = sl.InitParameters()
+        init_params.set_from_svo_file(file_path)
+        init_params.svo_real_time_mode = False  # Decode every frame, as fast as possible.
+        init_params.coordinate_units = sl.UNIT.METER
+        init_params.depth_mode = getattr(sl.DEPTH_MODE, self.depth_mode) if VIEW_DEPTH in views \
+            else sl.DEPTH_MODE.NONE
+        status = self.camera.open(init_params)
+        if status != sl.ERROR_CODE.SUCCESS:
+            raise RuntimeError(f"Cannot open {file_path}: {repr(status)}")
+        self._is_open = True
+        self.views = views
+        # Mats are allocated by the first retrieve and reused for every frame.
+        self._mats = {view: sl.Mat() for view in views}
+
+    def get_frame_count(self) -> int:
+        return self.camera.get_svo_number_of_frames()
+
+    def read_frames(self, start: int, stop: int, step: int = 1):
+        self.camera.set_svo_position(start)
+        for position in range(start, min(stop, self.get_frame_count()), step):
+            if step > 1 and position != start:
+                self.camera.set_svo_position(position)
+            err = self.camera.grab(self.runtime)
+            if err == sl.ERROR_CODE.END_OF_SVOFILE_REACHED:
+                return
+            if err != sl.ERROR_CODE.SUCCESS:
+                continue  # Corrupted frame.
+            frame = {}
+            for view, mat in self._mats.items():
+                if view == VIEW_DEPTH:
+                    self.camera.retrieve_measure(mat, sl.MEASURE.DEPTH, sl.MEM.CPU)
+                else:
+                    self.camera.retrieve_image(mat, _IMAGE_VIEWS[view], sl.MEM.CPU)
+                frame[view] = mat.get_data(sl.MEM.CPU, deep_copy=False)
+            yield position, self.camera.get_timestamp(sl.TIME_REFERENCE.IMAGE).get_nanoseconds(), frame
+
+    def close(self) -> None:
+        if self._is_open:
+            self.camera.close()
+            self._is_open = False
@@ -0,0 +1,19 @@
+from recorder.disk_admission import check_disk_admission, ADMISSION_DOWNGRADE
+
+
+def _admit(tmp_path, resolution, fits):
+    # Only the settings in `fits` need less bandwidth than any disk sustains.
+    return check_disk_admission(str(tmp_path), 2, resolution, 30,
+                                lambda resolution, fps: 1.0 if (resolution, fps) in fits else 1e15,
+                                policy=ADMISSION_DOWNGRADE, min_free_minutes=0, probe_bytes=4096)
+
+
+def test_zed_x_downgrade_ends_at_svga(tmp_path):
+    result = _admit(tmp_path, "HD1080", {("SVGA", 15), ("VGA", 30), ("HD720", 30)})
+    assert (result.admitted, result.resolution, result.fps) == (True, "SVGA", 15)
+    assert not _admit(tmp_path, "HD1200", {("VGA", 30), ("HD720", 30)}).admitted
+
+
+def test_zed_2_downgrade_keeps_its_resolutions(tmp_path):
+    result = _admit(tmp_path, "HD2K", {("SVGA", 30), ("HD720", 15)})
+    assert (result.admitted, result.resolution, result.fps) == (True, "HD720", 15)
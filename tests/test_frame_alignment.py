@@ -0,0 +1,26 @@
+import numpy as np
+from recorder.frame_alignment import CameraFrames, FrameSets, open_frame_sets
+
+
+def _camera(serial_number: int, timestamps_ns) -> CameraFrames:
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    return CameraFrames(serial_number, timestamps_ns, np.arange(len(timestamps_ns), dtype=np.int64),
+                        np.zeros(len(timestamps_ns), dtype=np.int16))
+
+
+def test_save_with_a_camera_without_frames(tmp_path):
+    reference = _camera(1, np.arange(10) * 33_333_333)
+    other = _camera(2, np.arange(10) * 33_333_333 + 1_000_000)
+    empty = _camera(3, [])
+    frame_sets = FrameSets([reference, other, empty])
+
+    path = str(tmp_path / "frame_sets.bin")
+    frame_sets.save(path)
+    records = open_frame_sets(path)
+
+    assert len(records) == 10
+    assert (records["frame_3"] == -1).all()
+    assert (records["part_3"] == -1).all()
+    assert (records["frame_2"] == np.arange(10)).all()
+    assert (records["cameras_matched"] == 2).all()
+    assert frame_sets.report()["cameras"][2]["unmatched"] == 0
@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+from recorder.gnss_fix import parse_gpsd_time
+from recorder.gpsd_replay_server import format_gpsd_time
+
+EPOCH_US = int(datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc).timestamp() * 1000000)
+
+
+def test_parse_gpsd_time_with_trailing_z():
+    assert parse_gpsd_time("2024-05-01T12:00:00.000Z") == EPOCH_US
+    assert parse_gpsd_time("2024-05-01T12:00:00.25Z") == EPOCH_US + 250000
+    assert parse_gpsd_time(format_gpsd_time(EPOCH_US / 1e6 + 1.5)) == EPOCH_US + 1500000
+
+
+def test_parse_gpsd_time_from_epoch_seconds():
+    assert parse_gpsd_time(EPOCH_US / 1e6) == EPOCH_US